@@ -0,0 +1,26 @@
+from time import time
+
+from nashresolve import KuhnPokerTreeFactory, LeducPokerTreeFactory
+
+BENCHMARKS = (KuhnPokerTreeFactory, 100), (LeducPokerTreeFactory, 3)
+
+
+def create_deep_copying_factory_type(factory_type):
+    class DeepCopyingTreeFactory(factory_type):
+        def _take_snapshot(self, game):
+            return game
+
+    return DeepCopyingTreeFactory
+
+
+for factory_type, repeat_count in BENCHMARKS:
+    for expansion, expanding_factory_type in (
+            ('Deep copies', create_deep_copying_factory_type(factory_type)),
+            ('Snapshots', factory_type),
+    ):
+        start_time = time()
+
+        for i in range(repeat_count):
+            expanding_factory_type().build()
+
+        print(f'{factory_type.__name__} ({expansion}): {(time() - start_time) / repeat_count} s/build')
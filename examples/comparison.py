@@ -0,0 +1,28 @@
+from time import time
+
+from nashresolve import KuhnPokerTreeFactory
+from nashresolve.solvers import CFRPSolver, CFRSolver, DCFRSolver
+
+TARGET = 1e-3
+INTERVAL = 10
+MAX_ITER_COUNT = 100000
+
+print('Constructing tree...')
+
+game = KuhnPokerTreeFactory().build()
+
+for solver_type in CFRSolver, CFRPSolver, DCFRSolver:
+    solver = solver_type(game)
+    start_time = time()
+    exploitability = float('inf')
+
+    while exploitability > TARGET and solver.iteration_count < MAX_ITER_COUNT:
+        for i in range(INTERVAL):
+            solver.step()
+
+        exploitability = solver.get_exploitability()
+
+    print(
+        f'{solver_type.__name__}: {solver.iteration_count} iterations',
+        f'to reach an exploitability of {exploitability} ({time() - start_time} s)',
+    )
@@ -0,0 +1,35 @@
+from os import cpu_count
+from time import time
+
+from nashresolve import KuhnPokerTreeFactory
+from nashresolve.solvers import CFRSolver, ParallelCFRSolver
+
+CHANCE_DEPTH = 2
+ITER_COUNT = 100
+
+print('Constructing tree...')
+
+game = KuhnPokerTreeFactory().build()
+solver = CFRSolver(game)
+start_time = time()
+
+for i in range(ITER_COUNT):
+    solver.step()
+
+serial_time = time() - start_time
+
+print(f'Serial: {ITER_COUNT / serial_time} iterations/s')
+
+for worker_count in range(1, cpu_count() + 1):
+    with ParallelCFRSolver(game, worker_count, CHANCE_DEPTH) as solver:
+        start_time = time()
+
+        for i in range(ITER_COUNT):
+            solver.step()
+
+        elapsed_time = time() - start_time
+
+    print(
+        f'{worker_count} worker(s): {ITER_COUNT / elapsed_time} iterations/s',
+        f'({serial_time / elapsed_time}x serial)',
+    )
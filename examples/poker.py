@@ -1,37 +1,40 @@
-import pickle
-from os import path
-from time import time
-
-from nashresolve.contrib.poker import KuhnTreeFactory
-from nashresolve.solvers import DCFRSolver
+from nashresolve import Checkpointer, KuhnPokerTreeFactory
+from nashresolve.solvers import DCFRSolver, SolveRunner
 from utils import interact_tree_game
 
-FILE_NAME = 'kuhn-dcfr.nrs'
+CHECKPOINT_PATH = 'kuhn-dcfr'
 ITER_COUNT = 100
+TARGET_EXPLOITABILITY = 1e-3
+CHECKPOINT_INTERVAL = 10
 
 print('Starting...')
 
-if path.exists(FILE_NAME):
+checkpointer = Checkpointer(CHECKPOINT_PATH)
+
+if checkpointer.exists():
     print('Loading existing solver...')
 
-    with open(FILE_NAME, 'rb') as file:
-        solver = pickle.load(file)
+    solver = checkpointer.load_solver()
 else:
     print('Constructing tree...')
 
-    solver = DCFRSolver(KuhnTreeFactory().build())
+    solver = DCFRSolver(KuhnPokerTreeFactory().build())
 
 print('Solving...')
 
-start_time = time()
-
-for i in range(ITER_COUNT):
-    print(f'Iteration {i}:', ' '.join(map(str, solver.step())))
+runner = SolveRunner(
+    solver,
+    max_iteration_count=solver.iteration_count + ITER_COUNT,
+    target_exploitability=TARGET_EXPLOITABILITY,
+    exploitability_interval=10,
+    checkpointer=checkpointer,
+    checkpoint_interval=CHECKPOINT_INTERVAL,
+)
 
-print(f'Took: {time() - start_time} s')
-print('EV:', ' '.join(map(str, solver.ev())))
+runner.run()
 
-with open(FILE_NAME, 'wb') as file:
-    pickle.dump(solver, file)
+print(f'Took: {runner.elapsed_time} s ({runner.stop_reason})')
+print('Exploitability:', runner.exploitability)
+print('EV:', ' '.join(map(str, solver.get_expected_values(solver.game.root))))
 
 interact_tree_game(solver.game, solver)
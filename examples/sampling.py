@@ -0,0 +1,26 @@
+from time import time
+
+from nashresolve import KuhnPokerTreeFactory
+from nashresolve.solvers import ESMCCFRSolver, OSMCCFRSolver
+
+BATCH_SIZE = 100
+ITER_COUNT = 100
+
+print('Constructing tree...')
+
+game = KuhnPokerTreeFactory().build()
+
+for solver_type in ESMCCFRSolver, OSMCCFRSolver:
+    solver = solver_type(game, BATCH_SIZE, 0)
+    start_time = time()
+
+    for i in range(ITER_COUNT):
+        solver.step()
+
+    elapsed_time = time() - start_time
+
+    print(
+        f'{solver_type.__name__}: {ITER_COUNT / elapsed_time} iterations/s',
+        f'({BATCH_SIZE * ITER_COUNT / elapsed_time} trajectories/s),',
+        f'exploitability {solver.get_exploitability()}',
+    )
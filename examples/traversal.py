@@ -0,0 +1,99 @@
+from itertools import chain
+from time import time
+
+import numpy as np
+
+from nashresolve import KuhnPokerTreeFactory, Node, TicTacToeTreeFactory
+from nashresolve.solvers import CFRSolver
+
+BENCHMARKS = (KuhnPokerTreeFactory, 100), (TicTacToeTreeFactory, 2)
+
+
+def create_recursive_factory_type(factory_type):
+    class RecursiveTreeFactory(factory_type):
+        def _create_node(self, game):
+            node = super()._create_node(game)
+
+            if not isinstance(node, Node):
+                self._resolve(node)
+
+            return node
+
+    return RecursiveTreeFactory
+
+
+class RecursiveCFRSolver(CFRSolver):
+    def get_expected_values(self, node):
+        if node.is_terminal_node():
+            return node.payoffs
+        else:
+            expected_values = np.zeros(self.game.player_count)
+
+            for probability, child in zip(self.get_probabilities(node), node.children):
+                expected_values += probability * self.get_expected_values(child)
+
+            return expected_values
+
+    def _traverse(self, node, nature_contribution, player_contributions):
+        if node.is_terminal_node():
+            return node.payoffs
+        elif node.is_chance_node():
+            counterfactuals = np.zeros(self.game.player_count)
+
+            for child, probability in zip(node.children, node.chances):
+                counterfactuals += probability * self._traverse(
+                    child, nature_contribution * probability, player_contributions,
+                )
+
+            return counterfactuals
+        else:
+            index = self._get_index(node)
+            strategy = self.data.get_strategy(index)
+            counterfactuals = []
+
+            for child, probability in zip(node.children, strategy):
+                updated_contributions = player_contributions.copy()
+                updated_contributions[node.player_index] *= probability
+                counterfactuals.append(self._traverse(child, nature_contribution, updated_contributions))
+
+            counterfactuals = np.array(counterfactuals)
+            player_contribution = player_contributions[node.player_index]
+            other_contribution = nature_contribution * np.delete(player_contributions, node.player_index).prod()
+
+            self.data.update(index, player_contribution, other_contribution * counterfactuals[:, node.player_index])
+
+            return counterfactuals.T @ strategy
+
+
+def get_recursive_descendants(node):
+    yield node
+    yield from chain.from_iterable(map(get_recursive_descendants, node.children))
+
+
+def measure(name, function, repeat_count, node_count):
+    start_time = time()
+
+    for i in range(repeat_count):
+        function()
+
+    print(f'{name}: {(time() - start_time) / repeat_count / node_count * 1e6:.3f} us/node')
+
+
+for factory_type, repeat_count in BENCHMARKS:
+    game = factory_type().build()
+    path_count = sum(1 for _ in game.root.descendants)
+
+    print(f'{factory_type.__name__} ({path_count} nodes along every path)')
+
+    for traversal, build_type, descendants, solver_type in (
+            ('Recursive', create_recursive_factory_type(factory_type), get_recursive_descendants, RecursiveCFRSolver),
+            ('Iterative', factory_type, Node.descendants.fget, CFRSolver),
+    ):
+        solver = solver_type(game)
+
+        measure(f'  {traversal} building', lambda: build_type().build(), repeat_count, len(tuple(game.nodes)))
+        measure(f'  {traversal} enumeration', lambda: sum(1 for _ in descendants(game.root)), repeat_count, path_count)
+        measure(f'  {traversal} CFR traversal', solver.step, repeat_count, path_count)
+        measure(
+            f'  {traversal} expected values', lambda: solver.get_expected_values(game.root), repeat_count, path_count,
+        )
@@ -8,25 +8,25 @@ from nashresolve.trees import ChanceNode, PlayerNode, TerminalNode
 def interact_tree_game(game: TreeGame, solver: Optional[TreeSolver] = None) -> None:
     node = game.root
 
-    while node.children:
+    while node.action_count:
         print(f'Current: {node}\nChildren:')
 
         probabilities: Sequence[Optional[float]]
 
         if solver is not None and isinstance(node, PlayerNode):
-            probabilities = solver.query(node.info_set)
+            probabilities = solver.get_probabilities(node)
         elif isinstance(node, ChanceNode):
-            probabilities = node.probabilities
+            probabilities = node.chances
         else:
-            probabilities = [None] * len(node.children)
+            probabilities = [None] * node.action_count
 
-        for i, (child, probability) in enumerate(zip(node.children, probabilities)):
+        for i, (action, probability) in enumerate(zip(node.actions, probabilities)):
             if probability is None:
-                print(f'Child {i}: {child}')
+                print(f'Child {i}: {action.label}')
             else:
-                print(f'Child {i}: {child} ({probability})')
+                print(f'Child {i}: {action.label} ({probability})')
 
-        node = node.children[int(input('Choice: '))]
+        node = node.actions[int(input('Choice: '))].child
 
     print(f'Current: {node}')
     print('Payoffs:', ' '.join(map(str, cast(TerminalNode, node).payoffs)))
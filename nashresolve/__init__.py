@@ -1,13 +1,22 @@
+from nashresolve.checkpoints import Checkpointer
+from nashresolve.factories.abstractions import ActionAbstraction
 from nashresolve.factories.game import Factory, TreeFactory
-from nashresolve.factories.poker import KuhnPokerTreeFactory, PokerTreeFactory
+from nashresolve.factories.poker import KuhnPokerTreeFactory, LeducPokerTreeFactory, PokerTreeFactory
 from nashresolve.factories.rockpaperscissors import RockPaperScissorsTreeFactory
 from nashresolve.factories.sequential import SequentialTreeFactory
 from nashresolve.factories.tictactoe import TicTacToeTreeFactory
-from nashresolve.games import Game, TreeGame
-from nashresolve.trees import Action, ChanceAction, ChanceNode, Node, PlayerNode, TerminalNode
+from nashresolve.games import Game, InfoSetTable, LazyTreeGame, TreeGame
+from nashresolve.layouts import FlatTree
+from nashresolve.policies import Policy
+from nashresolve.resolving import BlueprintEvaluator, SubgameResolver
+from nashresolve.trees import (
+    Action, ActionCache, ChanceAction, ChanceNode, LazyChanceNode, LazyPlayerNode, Node, PlayerNode, TerminalNode,
+)
 
 __all__ = (
-    'Factory', 'TreeFactory', 'KuhnPokerTreeFactory', 'PokerTreeFactory', 'RockPaperScissorsTreeFactory',
-    'SequentialTreeFactory', 'TicTacToeTreeFactory', 'Game', 'TreeGame', 'Action', 'ChanceAction', 'ChanceNode', 'Node',
-    'PlayerNode', 'TerminalNode'
+    'Checkpointer', 'ActionAbstraction', 'Factory', 'TreeFactory', 'KuhnPokerTreeFactory', 'LeducPokerTreeFactory',
+    'PokerTreeFactory', 'RockPaperScissorsTreeFactory', 'SequentialTreeFactory', 'TicTacToeTreeFactory', 'Game',
+    'InfoSetTable', 'LazyTreeGame', 'TreeGame', 'FlatTree', 'Policy', 'BlueprintEvaluator', 'SubgameResolver', 'Action',
+    'ActionCache', 'ChanceAction', 'ChanceNode', 'LazyChanceNode', 'LazyPlayerNode', 'Node', 'PlayerNode',
+    'TerminalNode'
 )
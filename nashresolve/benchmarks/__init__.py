@@ -0,0 +1,8 @@
+from nashresolve.benchmarks.runs import (
+    COMPARED_METRICS, FACTORY_TYPES, SOLVER_TYPES, benchmark_build, benchmark_solver, compare, get_environment, run,
+)
+
+__all__ = (
+    'COMPARED_METRICS', 'FACTORY_TYPES', 'SOLVER_TYPES', 'benchmark_build', 'benchmark_solver', 'compare',
+    'get_environment', 'run',
+)
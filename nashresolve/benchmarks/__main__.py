@@ -0,0 +1,69 @@
+import json
+import sys
+from argparse import ArgumentParser
+from importlib import import_module
+
+import numpy as np
+
+from nashresolve.benchmarks.runs import FACTORY_TYPES, SOLVER_TYPES, compare, run
+
+
+def get_factory_type(name):
+    module_name, _, attribute_name = name.partition(':')
+
+    return getattr(import_module(module_name), attribute_name)
+
+
+def main():
+    parser = ArgumentParser(prog='python -m nashresolve.benchmarks', description='Benchmark tree building and solving.')
+    parser.add_argument('--game', action='append', dest='game_names', help=f'one of {", ".join(FACTORY_TYPES)}')
+    parser.add_argument('--solver', action='append', dest='solver_names', help=f'one of {", ".join(SOLVER_TYPES)}')
+    parser.add_argument(
+        '--factory', action='append', default=[], metavar='NAME=MODULE:FACTORY',
+        help='an additional factory to benchmark, such as a larger poker tree factory',
+    )
+    parser.add_argument('--time-budget', type=float, default=1, help='seconds of solving per game and solver')
+    parser.add_argument('--max-iteration-count', type=int, default=1000)
+    parser.add_argument(
+        '--dtype', choices=('float64', 'float32'), default='float64', help='the dtype of the payoffs and the chances',
+    )
+    parser.add_argument('--output', help='the JSON file to write the results to, instead of the standard output')
+    parser.add_argument('--baseline', help='a JSON file of earlier results to compare with')
+    args = parser.parse_args()
+
+    factory_types = dict(
+        (name, get_factory_type(factory_name))
+        for name, _, factory_name in (factory.partition('=') for factory in args.factory)
+    )
+    game_names = args.game_names
+
+    if game_names is None and factory_types:
+        game_names = tuple(factory_types)
+
+    results = run(
+        game_names, args.solver_names, args.time_budget, args.max_iteration_count, factory_types, np.dtype(args.dtype),
+    )
+
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        for comparison in compare(baseline, results):
+            print(
+                comparison['game'],
+                comparison.get('solver', '-'),
+                comparison['metric'],
+                f'{comparison["ratio"]:.3f}x',
+                file=sys.stderr,
+            )
+
+
+if __name__ == '__main__':
+    main()
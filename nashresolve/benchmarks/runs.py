@@ -0,0 +1,216 @@
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+from os import path
+from time import perf_counter
+
+import numpy as np
+
+from nashresolve.factories.poker import KuhnPokerTreeFactory, LeducPokerTreeFactory
+from nashresolve.factories.rockpaperscissors import RockPaperScissorsTreeFactory
+from nashresolve.factories.tictactoe import TicTacToeTreeFactory
+from nashresolve.layouts import FlatTree
+from nashresolve.solvers import (
+    CFRPSolver, CFRSolver, DCFRSolver, ESMCCFRSolver, OSMCCFRSolver, ParallelCFRSolver, VectorizedCFRSolver,
+)
+
+FACTORY_TYPES = {
+    'kuhn': KuhnPokerTreeFactory,
+    'kuhn-suit-isomorphic': partial(KuhnPokerTreeFactory, True),
+    'leduc': LeducPokerTreeFactory,
+    'leduc-suit-isomorphic': partial(LeducPokerTreeFactory, suit_isomorphism=True),
+    'rock-paper-scissors': RockPaperScissorsTreeFactory,
+    'rock-paper-scissors-4': partial(RockPaperScissorsTreeFactory, 4),
+    'tic-tac-toe': TicTacToeTreeFactory,
+}
+SOLVER_TYPES = {
+    'cfr': CFRSolver,
+    'cfr-float32': partial(CFRSolver, dtype=np.float32),
+    'cfr-float32-mixed': partial(CFRSolver, dtype=np.float32, accumulator_dtype=np.float64),
+    'cfr+': CFRPSolver,
+    'dcfr': DCFRSolver,
+    'vectorized-cfr': VectorizedCFRSolver,
+    'vectorized-cfr-float32': partial(VectorizedCFRSolver, dtype=np.float32),
+    'parallel-cfr': ParallelCFRSolver,
+    'es-mccfr': partial(ESMCCFRSolver, seed=0),
+    'os-mccfr': partial(OSMCCFRSolver, seed=0),
+}
+COMPARED_METRICS = {
+    'build_time': False,
+    'peak_memory': False,
+    'store_nbytes': False,
+    'construction_time': False,
+    'iterations_per_second': True,
+}
+
+
+def get_environment():
+    try:
+        commit = subprocess.run(
+            ('git', 'rev-parse', 'HEAD'), cwd=path.dirname(__file__), capture_output=True, check=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'time': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+    }
+
+
+def benchmark_build(game_name, factory_type, dtype=float):
+    """Build the game with the dtype, timing the build and then measuring its peak traced memory in a second build."""
+    start_time = perf_counter()
+    game = factory_type().build(dtype)
+    build_time = perf_counter() - start_time
+
+    tracemalloc.start()
+
+    try:
+        factory_type().build(dtype)
+
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    tree = FlatTree.from_game(game)
+
+    return game, {
+        'game': game_name,
+        'dtype': np.dtype(dtype).name,
+        'build_time': build_time,
+        'peak_memory': peak_memory,
+        'node_count': tree.node_count,
+        'edge_count': tree.edge_count,
+        'info_set_count': tree.info_set_count,
+        'flat_tree_nbytes': tree.nbytes,
+    }
+
+
+def benchmark_solver(game, game_name, solver_name, solver_type, time_budget, max_iteration_count):
+    """Solve the game for the time budget, recording the exploitability after 1, 2, 4, ... and the last iterations.
+
+    The time spent on exploitabilities is excluded from the solving time. The peak traced memory is measured
+    separately over the construction and the first iteration of another solver. The bytes of the arrays of the regret
+    store, if any, are recorded after the solving.
+    """
+    tracemalloc.start()
+
+    try:
+        _close(_step(solver_type(game)))
+
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    start_time = perf_counter()
+    solver = solver_type(game)
+    construction_time = perf_counter() - start_time
+    solve_time = 0
+    exploitabilities = []
+
+    try:
+        while solver.iteration_count < max_iteration_count and solve_time < time_budget:
+            start_time = perf_counter()
+            solver.step()
+            solve_time += perf_counter() - start_time
+
+            if not solver.iteration_count & (solver.iteration_count - 1):
+                exploitabilities.append(_get_exploitability(solver, solve_time))
+
+        if not exploitabilities or exploitabilities[-1]['iteration_count'] != solver.iteration_count:
+            exploitabilities.append(_get_exploitability(solver, solve_time))
+    finally:
+        _close(solver)
+
+    data = getattr(solver, 'data', None)
+
+    return {
+        'game': game_name,
+        'solver': solver_name,
+        'construction_time': construction_time,
+        'peak_memory': peak_memory,
+        'store_nbytes': None if data is None else sum(array.nbytes for array in data.arrays.values()),
+        'iteration_count': solver.iteration_count,
+        'solve_time': solve_time,
+        'iterations_per_second': solver.iteration_count / solve_time if solve_time else None,
+        'exploitabilities': exploitabilities,
+    }
+
+
+def run(game_names=None, solver_names=None, time_budget=1, max_iteration_count=1000, factory_types=None, dtype=float):
+    """Benchmark the building of the games with the dtype and the solvers on each game, returning JSON-serializable
+    results.
+    """
+    factory_types = {**FACTORY_TYPES, **({} if factory_types is None else factory_types)}
+    game_names = tuple(factory_types) if game_names is None else game_names
+    solver_names = tuple(SOLVER_TYPES) if solver_names is None else solver_names
+    builds = []
+    solves = []
+
+    for game_name in game_names:
+        game, build = benchmark_build(game_name, factory_types[game_name], dtype)
+        builds.append(build)
+
+        for solver_name in solver_names:
+            solves.append(
+                benchmark_solver(
+                    game, game_name, solver_name, SOLVER_TYPES[solver_name], time_budget, max_iteration_count,
+                ),
+            )
+
+    return {'environment': get_environment(), 'builds': builds, 'solves': solves}
+
+
+def compare(baseline, results):
+    """Return the ratios of the compared metrics of the results to those of the baseline, above 1 if worse."""
+    comparisons = []
+
+    for kind, key_names in ('builds', ('game',)), ('solves', ('game', 'solver')):
+        baseline_records = {tuple(map(record.get, key_names)): record for record in baseline[kind]}
+
+        for record in results[kind]:
+            key = tuple(map(record.get, key_names))
+
+            if key not in baseline_records:
+                continue
+
+            for metric, higher_is_better in COMPARED_METRICS.items():
+                baseline_value = baseline_records[key].get(metric)
+                value = record.get(metric)
+
+                if baseline_value and value:
+                    comparisons.append({
+                        **dict(zip(key_names, key)),
+                        'metric': metric,
+                        'baseline': baseline_value,
+                        'value': value,
+                        'ratio': baseline_value / value if higher_is_better else value / baseline_value,
+                    })
+
+    return comparisons
+
+
+def _step(solver):
+    solver.step()
+
+    return solver
+
+
+def _close(solver):
+    if hasattr(solver, 'close'):
+        solver.close()
+
+
+def _get_exploitability(solver, solve_time):
+    return {
+        'iteration_count': solver.iteration_count,
+        'solve_time': solve_time,
+        'exploitability': solver.get_exploitability(),
+    }
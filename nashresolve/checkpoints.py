@@ -0,0 +1,224 @@
+import json
+import os
+import struct
+from importlib import import_module
+
+import numpy as np
+
+from nashresolve.layouts import FlatTree
+
+MAGIC = b'NASHRSLV'
+VERSION = 1
+ALIGNMENT = 64
+
+_PREFIX = struct.Struct('<8sII')
+
+
+def dump(path, arrays, metadata=None):
+    """Write the arrays and the JSON-serializable metadata to a checkpoint file.
+
+    The file starts with a magic number, the format version and the length of a JSON header describing the metadata
+    and the dtype, shape and offset of each array, followed by the raw contents of the arrays, each aligned to
+    ALIGNMENT bytes so that they can be memory-mapped. The file is written to a temporary file first and then renamed,
+    so an existing checkpoint is never left half-written.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    descriptions = {}
+    offset = 0
+
+    for name, array in arrays.items():
+        if array.dtype.hasobject:
+            raise ValueError(f'The array {name} is not of a fixed-size dtype')
+
+        descriptions[name] = {'dtype': array.dtype.str, 'shape': array.shape, 'offset': offset}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({'metadata': {} if metadata is None else metadata, 'arrays': descriptions}).encode()
+    temporary_path = f'{path}.tmp'
+
+    with open(temporary_path, 'wb') as file:
+        file.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        file.write(header)
+
+        start = _align(file.tell())
+
+        for name, array in arrays.items():
+            file.write(bytes(start + descriptions[name]['offset'] - file.tell()))
+            file.write(array.data)
+
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temporary_path, path)
+
+
+def load(path, mmap_mode='r'):
+    """Read the metadata and the arrays of a checkpoint file.
+
+    The arrays are memory-mapped with the given mode ('r', 'r+' or 'c'), so they are only read from the disk when
+    accessed, or fully read into memory if the mode is None.
+    """
+    metadata, descriptions, start = _read_header(path)
+    arrays = {}
+
+    for name, description in descriptions.items():
+        dtype = np.dtype(description['dtype'])
+        shape = tuple(description['shape'])
+        offset = start + description['offset']
+
+        if mmap_mode is None or not dtype.itemsize * np.prod(shape, dtype=np.int64):
+            with open(path, 'rb') as file:
+                file.seek(offset)
+                arrays[name] = np.fromfile(file, dtype, int(np.prod(shape, dtype=np.int64))).reshape(shape)
+        else:
+            arrays[name] = np.memmap(path, dtype, mmap_mode, offset, shape)
+
+    return metadata, arrays
+
+
+def load_metadata(path):
+    """Read the metadata of a checkpoint file without touching its arrays."""
+    return _read_header(path)[0]
+
+
+def _read_header(path):
+    with open(path, 'rb') as file:
+        magic, version, header_length = _PREFIX.unpack(file.read(_PREFIX.size))
+
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a checkpoint file')
+        elif version > VERSION:
+            raise ValueError(f'The checkpoint version {version} is not supported')
+
+        header = json.loads(file.read(header_length))
+
+    return header['metadata'], header['arrays'], _align(_PREFIX.size + header_length)
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class Checkpointer:
+    """Checkpointer is the class for incremental checkpoints of counterfactual regret minimization solvers.
+
+    A checkpoint is a directory of three checkpoint files: the flattened tree, which is only rewritten when the digest
+    of its arrays differs from the saved one, the info set layout of the solver, which is only rewritten when info sets
+    are registered, and the regrets and strategies of the solver, which are rewritten on every save. Solvers are
+    restored from memory maps of the files, so that opening a checkpoint does not read the whole state.
+    """
+
+    TREE_FILE_NAME = 'tree.nrc'
+    LAYOUT_FILE_NAME = 'layout.nrc'
+    STATE_FILE_NAME = 'state.nrc'
+
+    LAYOUT_ARRAY_NAMES = 'info_sets', 'player_indices', 'offsets', 'action_counts', 'segments'
+
+    def __init__(self, path):
+        self.__path = path
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def tree_path(self):
+        return os.path.join(self.path, self.TREE_FILE_NAME)
+
+    @property
+    def layout_path(self):
+        return os.path.join(self.path, self.LAYOUT_FILE_NAME)
+
+    @property
+    def state_path(self):
+        return os.path.join(self.path, self.STATE_FILE_NAME)
+
+    def exists(self):
+        return all(map(os.path.exists, (self.tree_path, self.layout_path, self.state_path)))
+
+    def save(self, solver):
+        self.write(self.capture(solver))
+
+    def capture(self, solver):
+        """Return a copy of the state of the solver to be written later, so that the solver can keep solving.
+
+        Only the arrays of the solver are copied. The game must not be modified in the meantime.
+        """
+        solver_type = type(solver)
+
+        return {
+            'game': solver.game,
+            'tree': getattr(solver, 'tree', None),
+            'arrays': {name: np.array(array) for name, array in solver.data.arrays.items()},
+            'metadata': {
+                'solver': f'{solver_type.__module__}.{solver_type.__qualname__}',
+                'parameters': {
+                    name: value for name, value in vars(solver).items()
+                    if not name.startswith('_') and isinstance(value, (bool, int, float, str))
+                },
+                'dtype': solver.data.dtype.str,
+                'accumulator_dtype': solver.data.accumulator_dtype.str,
+                'iteration_count': solver.iteration_count,
+                'info_set_count': solver.data.info_set_count,
+            },
+        }
+
+    def write(self, state):
+        """Write a state returned by capture to the checkpoint."""
+        os.makedirs(self.path, exist_ok=True)
+
+        tree = FlatTree.from_game(state['game']) if state['tree'] is None else state['tree']
+        tree_metadata = self._get_tree_metadata(tree)
+
+        if not os.path.exists(self.tree_path) or load_metadata(self.tree_path) != tree_metadata:
+            dump(self.tree_path, tree.arrays, tree_metadata)
+
+        arrays = state['arrays']
+        info_set_count = state['metadata']['info_set_count']
+
+        if not os.path.exists(self.layout_path) or load_metadata(self.layout_path)['info_set_count'] != info_set_count:
+            dump(
+                self.layout_path,
+                {name: arrays[name] for name in self.LAYOUT_ARRAY_NAMES},
+                {'info_set_count': info_set_count},
+            )
+
+        dump(
+            self.state_path,
+            {name: array for name, array in arrays.items() if name not in self.LAYOUT_ARRAY_NAMES},
+            state['metadata'],
+        )
+
+    def load_tree(self, mmap_mode='r'):
+        return FlatTree(**load(self.tree_path, mmap_mode)[1])
+
+    def load_solver(self, game=None, mmap_mode='c'):
+        """Restore the saved solver, building the game from the saved tree if it is not given.
+
+        The solver is created with the dtypes of the saved store. The default copy-on-write mode lets the restored
+        solver keep solving without modifying the checkpoint.
+        """
+        metadata, arrays = load(self.state_path, mmap_mode)
+        layout_metadata, layout_arrays = load(self.layout_path, mmap_mode)
+
+        if metadata['info_set_count'] != layout_metadata['info_set_count']:
+            raise ValueError('The state and the layout of the checkpoint do not match')
+        elif game is not None and load_metadata(self.tree_path) != self._get_tree_metadata(FlatTree.from_game(game)):
+            raise ValueError('The game does not match the tree of the checkpoint')
+
+        module_name, _, name = metadata['solver'].rpartition('.')
+        solver_type = getattr(import_module(module_name), name)
+        solver = solver_type(
+            self.load_tree(None).to_game() if game is None else game,
+            dtype=np.dtype(metadata['dtype']),
+            accumulator_dtype=np.dtype(metadata['accumulator_dtype']),
+            **metadata['parameters'],
+        )
+
+        solver.restore({**arrays, **layout_arrays}, metadata['iteration_count'], True)
+
+        return solver
+
+    @staticmethod
+    def _get_tree_metadata(tree):
+        return {'node_count': tree.node_count, 'info_set_count': tree.info_set_count, 'digest': tree.digest}
@@ -0,0 +1,71 @@
+from bisect import bisect_right
+from collections.abc import Mapping
+
+
+class ActionAbstraction:
+    """ActionAbstraction is the class for bet/raise abstractions of poker tree factories.
+
+    The bet/raise amounts of a street are fractions of the pot after calling, added to the largest bet. The fractions
+    are given for all streets or per street, keyed by the number of board cards, in which case those of the largest
+    key not above the number of board cards are used. The amounts are clipped to the legal range, and those of at least
+    the all-in threshold times the all-in amount are replaced by an all-in, which is always included if all_in is set.
+    At most max_raise_count bets/raises are made per street.
+    """
+
+    def __init__(self, bet_fractions=(1,), max_raise_count=None, all_in_threshold=None, all_in=True):
+        if not isinstance(bet_fractions, Mapping):
+            bet_fractions = {0: bet_fractions}
+
+        if 0 not in bet_fractions:
+            raise ValueError('The pot fractions before the board must be given')
+
+        self.__bet_fractions = {street: tuple(fractions) for street, fractions in sorted(bet_fractions.items())}
+        self.__max_raise_count = max_raise_count
+        self.__all_in_threshold = all_in_threshold
+        self.__all_in = all_in
+
+    @property
+    def bet_fractions(self):
+        return self.__bet_fractions
+
+    @property
+    def max_raise_count(self):
+        return self.__max_raise_count
+
+    @property
+    def all_in_threshold(self):
+        return self.__all_in_threshold
+
+    @property
+    def all_in(self):
+        return self.__all_in
+
+    def get_bet_fractions(self, board_card_count):
+        streets = tuple(self.bet_fractions)
+
+        return self.bet_fractions[streets[bisect_right(streets, board_card_count) - 1]]
+
+    def can_bet_raise(self, raise_count):
+        return self.max_raise_count is None or raise_count < self.max_raise_count
+
+    def get_bet_raise_amounts(self, player):
+        """Return the sorted bet/raise amounts of the player, who must be able to bet/raise."""
+        game = player.game
+        max_bet = max(other.bet for other in game.players)
+        pot = game.pot + sum(other.bet for other in game.players) + player.check_call_amount
+        min_amount = player.bet_raise_min_amount
+        max_amount = player.bet_raise_max_amount
+        amounts = set()
+
+        for fraction in self.get_bet_fractions(len(game.board)):
+            amount = min(max(round(max_bet + fraction * pot), min_amount), max_amount)
+
+            if self.all_in_threshold is not None and amount >= self.all_in_threshold * max_amount:
+                amount = max_amount
+
+            amounts.add(amount)
+
+        if self.all_in:
+            amounts.add(max_amount)
+
+        return sorted(amounts)
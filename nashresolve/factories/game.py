@@ -1,7 +1,14 @@
+import hashlib
+import pickle
+import random
 from abc import ABC, abstractmethod
+from copy import deepcopy
+from functools import partial
 
-from nashresolve.games import TreeGame
-from nashresolve.trees import ChanceNode, PlayerNode, TerminalNode
+from nashresolve.games import InfoSetTable, LazyTreeGame, TreeGame
+from nashresolve.trees import (
+    Action, ActionCache, ChanceAction, ChanceNode, LazyChanceNode, LazyPlayerNode, PlayerNode, TerminalNode,
+)
 
 
 class Factory(ABC):
@@ -10,20 +17,304 @@ class Factory(ABC):
 
 
 class TreeFactory(Factory, ABC):
-    def build(self):
-        return TreeGame(self._create_node(self._create_game()))
+    """TreeFactory is the abstract base class for factories of tree games.
 
-    def _create_node(self, game):
+    Child states are expanded from a snapshot of their parent state, pickled once per node and unpickled once per
+    action, which is several times faster than deep copying the parent state for every action. Factories that declare
+    state keys through _get_state_key share the subtrees of equal states reached by different action histories within
+    a build, turning the tree into a directed acyclic graph. Info set keys are interned into dense integer ids, whose
+    readable keys are kept in the info set table of the game. The nodes created while building are pending until they
+    are resolved with an explicit stack, so the depth of the trees is not limited by the recursion limit. The payoffs
+    and the chances of the nodes are stored with the dtype given to the build, such as np.float32 for large trees.
+
+    Each node may carry a hashable context of what its state does not record, such as facts about the action history
+    that led to it, given to _create_node and read through _context while the node is expanded. The nodes created
+    while a node is expanded inherit its context unless they are given theirs.
+    """
+
+    __nodes = None
+    __info_set_table = None
+    __max_depth = None
+    __evaluator = None
+    __cache = None
+    __dtype = float
+    __context = None
+
+    def build(self, dtype=float):
+        build_state = self.__start_build(dtype=dtype)
+
+        try:
+            root = self._resolve(self._create_node(self._create_game()))
+
+            return TreeGame(root, info_set_table=self.__info_set_table)
+        finally:
+            self.__finish_build(build_state)
+
+    def build_subgame(self, states, max_depth=None, evaluator=None, dtype=float):
+        """Build the subgame of the states weighted by their probabilities, such as the states of a public state
+        weighted by the ranges of the players.
+
+        The subgame is rooted at a chance node over the states. If the maximum depth is given, the nodes that many
+        actions below the states are replaced by terminal nodes whose payoffs are estimated from their states by the
+        evaluator.
+        """
+        states = tuple(states)
+
+        if not states:
+            raise ValueError('No state is given')
+        elif max_depth is not None and evaluator is None:
+            raise ValueError('Depth-limited subgames need an evaluator')
+
+        build_state = self.__start_build(max_depth, evaluator, dtype)
+
+        try:
+            actions = tuple(
+                ChanceAction(probability, self._resolve(self._create_node(state)), f'State {i}')
+                for i, (probability, state) in enumerate(states)
+            )
+
+            return TreeGame(ChanceNode(actions, dtype), self._get_player_count(states[0][1]), self.__info_set_table)
+        finally:
+            self.__finish_build(build_state)
+
+    def estimate_size(self, sample_count=1000, seed=None):
+        """Estimate the numbers of nodes, edges and info sets of the game without building it.
+
+        Random paths are sampled from the root, following each action with the same probability, and each node on a
+        path is weighted by the product of the action counts above it (Knuth's estimator). This estimates the counts of
+        the tree without shared subtrees without bias, so the counts are upper bounds of those of the built tree, which
+        keeps shared subtrees once. Each player node is also weighted by the inverse of the size of its info set, as
+        given by _get_info_set_size, which only counts the histories that differ in hidden information. The info set
+        count is thus an upper bound too if different action sequences lead to the same info set, such as the betting
+        sequences that leave the same pot in poker or the move orders that lead to the same board in tic-tac-toe.
+        """
+        random_state = random.Random(seed)
+        counts = dict.fromkeys(
+            (
+                'node_count', 'terminal_node_count', 'chance_node_count', 'player_node_count', 'edge_count',
+                'info_set_count',
+            ),
+            0,
+        )
+        build_state = self.__start_build()
+
+        try:
+            for i in range(sample_count):
+                node = self._create_node(self._create_game())
+                weight = 1
+
+                while True:
+                    game = node.game
+                    self.__context = node.context
+                    actor = self._get_actor(game)
+                    counts['node_count'] += weight
+
+                    if actor is None:
+                        counts['terminal_node_count'] += weight
+
+                        break
+                    elif actor.is_nature():
+                        counts['chance_node_count'] += weight
+                        actions = tuple(self._create_chance_actions(actor))
+                    elif actor.is_player():
+                        counts['player_node_count'] += weight
+                        counts['info_set_count'] += weight / self._get_info_set_size(actor)
+                        actions = tuple(self._create_actions(actor))
+                    else:
+                        raise ValueError('Unknown player type')
+
+                    counts['edge_count'] += weight * len(actions)
+                    weight *= len(actions)
+                    node = random_state.choice(actions).child
+        finally:
+            self.__finish_build(build_state)
+
+        return {name: count / sample_count for name, count in counts.items()}
+
+    def build_lazily(self, capacity=65536, dtype=float):
+        """Build the game with nodes whose actions are only created when accessed.
+
+        The actions of at most capacity nodes are kept in a least recently used cache, so games larger than the memory
+        can be traversed. Subtrees are not shared.
+        """
+        game = self._create_game()
+        self.__cache = ActionCache(capacity)
+        self.__dtype = dtype
+
+        try:
+            return LazyTreeGame(self._create_node(game), self._get_player_count(game))
+        finally:
+            del self.__cache
+            del self.__dtype
+
+    def get_state_key(self, game):
+        """Return a hashable key of the state, equal for states with equal subgames, or None if there is none.
+
+        The key is the state key declared by _get_state_key if any and otherwise the digest of the pickled state, so
+        equal states reached by different action histories may have different keys.
+        """
+        state_key = self._get_state_key(game)
+
+        if state_key is None:
+            snapshot = self._take_snapshot(game)
+
+            if isinstance(snapshot, bytes):
+                state_key = hashlib.blake2b(snapshot).digest()
+
+        return state_key
+
+    @property
+    def _context(self):
+        """Return the context of the node being expanded, which is None by default."""
+        return self.__context
+
+    def __start_build(self, max_depth=None, evaluator=None, dtype=float):
+        build_state = (
+            self.__nodes, self.__info_set_table, self.__max_depth, self.__evaluator, self.__dtype, self.__context,
+        )
+        self.__nodes = {}
+        self.__info_set_table = InfoSetTable()
+        self.__max_depth = max_depth
+        self.__evaluator = evaluator
+        self.__dtype = dtype
+        self.__context = None
+
+        return build_state
+
+    def __finish_build(self, build_state):
+        (
+            self.__nodes, self.__info_set_table, self.__max_depth, self.__evaluator, self.__dtype, self.__context,
+        ) = build_state
+
+    def _create_node(self, game, context=None):
+        if context is None:
+            context = self.__context
+
+        if self.__cache is not None:
+            return self._create_lazy_node(game, context)
+
+        state_key = self._get_state_key(game)
+
+        if state_key is None:
+            return _PendingNode(game, context)
+        elif (state_key, context) not in self.__nodes:
+            self.__nodes[state_key, context] = _PendingNode(game, context)
+
+        return self.__nodes[state_key, context]
+
+    def _resolve(self, root):
+        """Create the nodes of the pending root and its descendants with an explicit stack, and return its node.
+
+        Each pending node is expanded into pending actions when it is first reached, and its node is created once the
+        nodes of all its children are, so that trees of any depth are built without recursion. The depth of a pending
+        node is that of the first parent it is reached from, plus one.
+        """
+        pending_nodes = [root]
+
+        if root.depth is None:
+            root.depth = 0
+
+        while pending_nodes:
+            pending_node = pending_nodes[-1]
+
+            if pending_node.node is not None:
+                pending_nodes.pop()
+            elif pending_node.actions is None:
+                self.__context = pending_node.context
+                actor = self._get_actor(pending_node.game)
+
+                if actor is not None and self.__max_depth is not None and pending_node.depth >= self.__max_depth:
+                    pending_node.node = TerminalNode(self.__evaluator(pending_node.game), self.__dtype)
+                elif actor is None:
+                    pending_node.node = TerminalNode(self._get_payoffs(pending_node.game), self.__dtype)
+                elif actor.is_nature():
+                    pending_node.actions = tuple(self._create_chance_actions(actor))
+                elif actor.is_player():
+                    pending_node.player_index = actor.index
+                    pending_node.info_set = self.__info_set_table.intern(self._get_info_set(actor))
+                    pending_node.actions = tuple(self._create_actions(actor))
+                else:
+                    raise ValueError('Unknown player type')
+
+                pending_node.game = None
+
+                for action in reversed(pending_node.actions or ()):
+                    if action.child.depth is None:
+                        action.child.depth = pending_node.depth + 1
+
+                    if action.child.node is None:
+                        pending_nodes.append(action.child)
+            else:
+                actions = tuple(
+                    ChanceAction(action.chance, action.child.node, action.label)
+                    if isinstance(action, ChanceAction) else Action(action.child.node, action.label)
+                    for action in pending_node.actions
+                )
+
+                if pending_node.player_index is None:
+                    pending_node.node = ChanceNode(actions, self.__dtype)
+                else:
+                    pending_node.node = PlayerNode(pending_node.player_index, pending_node.info_set, actions)
+
+                pending_node.actions = None
+                pending_nodes.pop()
+
+        return root.node
+
+    def _create_lazy_node(self, game, context=None):
         actor = self._get_actor(game)
 
         if actor is None:
-            return TerminalNode(self._get_payoffs(game))
-        elif actor.is_nature():
-            return ChanceNode(self._create_chance_actions(actor))
-        elif actor.is_player():
-            return PlayerNode(actor.index, self._get_info_set(actor), self._create_actions(actor))
-        else:
-            raise ValueError('Unknown player type')
+            return TerminalNode(self._get_payoffs(game), self.__dtype)
+
+        expand = partial(self._expand, self.__cache, self.__dtype, self._take_snapshot(game), context)
+        previous_context = self.__context
+        self.__context = context
+
+        try:
+            if actor.is_nature():
+                return LazyChanceNode(expand, self.__cache, self.__dtype)
+            elif actor.is_player():
+                return LazyPlayerNode(actor.index, self._get_info_set(actor), expand, self.__cache)
+            else:
+                raise ValueError('Unknown player type')
+        finally:
+            self.__context = previous_context
+
+    def _expand(self, cache, dtype, snapshot, context=None):
+        self.__cache = cache
+        self.__dtype = dtype
+        self.__context = context
+
+        try:
+            actor = self._get_actor(self._load_snapshot(snapshot))
+
+            if actor.is_nature():
+                return tuple(self._create_chance_actions(actor))
+            else:
+                return tuple(self._create_actions(actor))
+        finally:
+            del self.__cache
+            del self.__dtype
+            del self.__context
+
+    def _take_snapshot(self, game):
+        try:
+            return pickle.dumps(game, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return game
+
+    def _load_snapshot(self, snapshot):
+        return pickle.loads(snapshot) if isinstance(snapshot, bytes) else deepcopy(snapshot)
+
+    def _get_player_count(self, game):
+        return len(game.players)
+
+    def _get_state_key(self, game):
+        return None
+
+    def _get_info_set_size(self, player):
+        return 1
 
     @abstractmethod
     def _create_game(self):
@@ -48,3 +339,16 @@ class TreeFactory(Factory, ABC):
     @abstractmethod
     def _get_info_set(self, player):
         ...
+
+
+class _PendingNode:
+    __slots__ = 'game', 'context', 'depth', 'player_index', 'info_set', 'actions', 'node'
+
+    def __init__(self, game, context=None):
+        self.game = game
+        self.context = context
+        self.depth = None
+        self.player_index = None
+        self.info_set = None
+        self.actions = None
+        self.node = None
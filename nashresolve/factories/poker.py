@@ -1,35 +1,109 @@
 from abc import ABC
-from copy import deepcopy
 from functools import partial
-from itertools import combinations
+from itertools import combinations, permutations
+from math import factorial
 
-from pokerface import KuhnPoker, PokerPlayer
+from pokerface import (
+    BettingStage, BoardDealingStage, Card, Deck, Evaluator, FixedLimit, HoleDealingStage, KuhnPoker, LowIndexedHand,
+    PokerGame, PokerPlayer, Rank, ShowdownStage, Stakes, Suit, Variant,
+)
 
 from nashresolve.factories.sequential import SequentialTreeFactory
 from nashresolve.trees import Action, ChanceAction
 
 
 class PokerTreeFactory(SequentialTreeFactory, ABC):
+    """PokerTreeFactory is the abstract base class for factories of poker tree games.
+
+    With suit isomorphism, deals that only differ by a permutation of suits fixing the cards dealt so far are merged
+    into one branch with their summed chance, and the suits of info sets are renamed canonically so that isomorphic
+    info sets share their strategies. The strategies of the original states are then looked up with get_info_set.
+
+    With an action abstraction, the bet/raise amounts are chosen by the abstraction instead of being the minimum and
+    the maximum amounts. If it caps the bets/raises per street, the number of bets/raises made in the street is kept in
+    the contexts of the nodes and in the info sets. The bets/raises of the streets of the states given to build_subgame
+    are counted from zero.
+    """
+
+    def __init__(self, suit_isomorphism=False, action_abstraction=None):
+        self.__suit_isomorphism = suit_isomorphism
+        self.__suit_permutations = None
+        self.__action_abstraction = action_abstraction
+
+    @property
+    def suit_isomorphism(self):
+        return self.__suit_isomorphism
+
+    @property
+    def action_abstraction(self):
+        return self.__action_abstraction
+
+    @property
+    def suit_permutations(self):
+        if self.__suit_permutations is None:
+            cards = tuple(map(str, self._create_game().deck))
+            suits = sorted(set(card[-1] for card in cards))
+            suit_permutations = (dict(zip(suits, permutation)) for permutation in permutations(suits))
+
+            self.__suit_permutations = tuple(
+                suit_permutation for suit_permutation in suit_permutations
+                if set(self._permute(cards, suit_permutation)) == set(cards)
+            )
+
+        return self.__suit_permutations
+
     @classmethod
     def _get_player_info_set(cls, player, other):
         return other.bet, other.stack, tuple(map(repr if player is other else str, other.hole))
 
-    def _create_node(self, game):
+    @classmethod
+    def _permute(cls, cards, suit_permutation):
+        return tuple(card[:-1] + suit_permutation.get(card[-1], card[-1]) for card in cards)
+
+    @classmethod
+    def get_hole_deal(cls, label):
+        """Return the index of the player and the cards of the hole deal of the label, or None for other labels."""
+        words = label.split()
+
+        if len(words) == 3 and words[0] == 'Deal' and words[1].isdigit():
+            return int(words[1]), words[2]
+        else:
+            return None
+
+    def get_info_set(self, game):
+        return self._get_info_set(game.actor)
+
+    def _create_node(self, game, context=None):
         while game.stage is not None and game.stage.is_showdown_stage():
             game.parse('s')
 
-        return super()._create_node(game)
+        return super()._create_node(game, context)
 
     def _create_actions(self, player):
-        game = player.game
+        snapshot = self._take_snapshot(player.game)
 
         if player.can_fold():
-            yield Action(self._create_node(deepcopy(game).parse('f')), 'Fold')
+            yield Action(self._create_node(self._load_snapshot(snapshot).parse('f')), 'Fold')
         if player.can_check_call():
-            yield Action(self._create_node(deepcopy(game).parse(f'cc')), f'Check/call {player.check_call_amount}')
-        if player.can_bet_raise():
+            yield Action(
+                self._create_node(self._load_snapshot(snapshot).parse('cc')), f'Check/call {player.check_call_amount}',
+            )
+        if player.can_bet_raise() and self.action_abstraction is None:
             for amount in {player.bet_raise_min_amount, player.bet_raise_max_amount}:
-                yield Action(self._create_node(deepcopy(game).parse(f'br {amount}')), f'Bet/raise {amount}')
+                yield Action(
+                    self._create_node(self._load_snapshot(snapshot).parse(f'br {amount}')), f'Bet/raise {amount}',
+                )
+        elif player.can_bet_raise() and self.action_abstraction.can_bet_raise(self._get_raise_count(player.game)):
+            context = None
+
+            if self.action_abstraction.max_raise_count is not None:
+                context = len(player.game.board), self._get_raise_count(player.game) + 1
+
+            for amount in self.action_abstraction.get_bet_raise_amounts(player):
+                yield Action(
+                    self._create_node(self._load_snapshot(snapshot).parse(f'br {amount}'), context),
+                    f'Bet/raise {amount}',
+                )
         if player.can_discard_draw():
             raise ValueError('Discard-draw is not yet supported')
         if player.can_showdown():
@@ -37,45 +111,194 @@ class PokerTreeFactory(SequentialTreeFactory, ABC):
 
     def _create_chance_actions(self, nature):
         game = nature.game
-        population = sorted(game.deck)
+        snapshot = self._take_snapshot(game)
 
         if nature.can_deal_hole():
-            samples = tuple(combinations(population, nature.deal_hole_count))
-
-            for sample in samples:
+            for sample, chance in self._get_samples(game, nature.deal_hole_count):
                 sample_str = ''.join(map(str, sample))
                 yield ChanceAction(
-                    1 / len(samples),
-                    self._create_node(deepcopy(game).parse(f'dh {sample_str}')),
-                    f'Deal {nature.deal_hole_player} {sample_str}',
+                    chance,
+                    self._create_node(self._load_snapshot(snapshot).parse(f'dh {sample_str}')),
+                    f'Deal {nature.deal_hole_player.index} {sample_str}',
                 )
         elif nature.can_deal_board():
-            samples = tuple(combinations(population, nature.deal_board_count))
-
-            for sample in samples:
+            for sample, chance in self._get_samples(game, nature.deal_board_count):
                 sample_str = ''.join(map(str, sample))
                 yield ChanceAction(
-                    1 / len(samples),
-                    self._create_node(deepcopy(game).parse(f'db {sample_str}')),
+                    chance,
+                    self._create_node(self._load_snapshot(snapshot).parse(f'db {sample_str}')),
                     f'Deal board {sample_str}',
                 )
         else:
             raise ValueError('No action available')
 
+    def _get_samples(self, game, count):
+        samples = tuple(combinations(sorted(game.deck), count))
+
+        if not self.suit_isomorphism:
+            return tuple((sample, 1 / len(samples)) for sample in samples)
+
+        card_groups = (tuple(map(str, game.board)),)
+        card_groups += tuple(tuple(sorted(map(repr, player.hole))) for player in game.players)
+        suit_permutations = tuple(
+            suit_permutation for suit_permutation in self.suit_permutations
+            if all(self._permute(cards, suit_permutation) == cards for cards in card_groups)
+        )
+        counts = {}
+
+        for sample in samples:
+            key = min(
+                tuple(sorted(self._permute(map(str, sample), suit_permutation)))
+                for suit_permutation in suit_permutations
+            )
+
+            if key not in counts:
+                counts[key] = [sample, 0]
+
+            counts[key][1] += 1
+
+        return tuple((sample, count / len(samples)) for sample, count in counts.values())
+
     def _get_payoffs(self, game):
         yield from map(PokerPlayer.payoff.fget, game.players)
 
     def _get_info_set(self, player):
         game = player.game
+        board = tuple(map(str, game.board))
+        player_info_sets = tuple(map(partial(self._get_player_info_set, player), game.players))
+
+        if self.suit_isomorphism:
+            board, player_info_sets = min(
+                (
+                    self._permute(board, suit_permutation),
+                    tuple(
+                        (bet, stack, tuple(sorted(self._permute(hole, suit_permutation))))
+                        for bet, stack, hole in player_info_sets
+                    ),
+                )
+                for suit_permutation in self.suit_permutations
+            )
+
+        if self.action_abstraction is not None and self.action_abstraction.max_raise_count is not None:
+            return str((game.actor.index, game.pot, board, player_info_sets, self._get_raise_count(game)))
+        else:
+            return str((game.actor.index, game.pot, board, player_info_sets))
+
+    def _get_info_set_size(self, player):
+        game = player.game
+        others = tuple(other for other in game.players if other is not player)
+        card_count = len(game.deck) + sum(len(other.hole) for other in others)
+        size = 1
+
+        for other in others:
+            size *= factorial(card_count) // factorial(len(other.hole)) // factorial(card_count - len(other.hole))
+            card_count -= len(other.hole)
+
+        return size
 
-        return str((
-            game.actor.index,
-            game.pot,
-            tuple(map(str, game.board)),
-            tuple(map(partial(self._get_player_info_set, player), game.players)),
-        ))
+    def _get_raise_count(self, game):
+        board_card_count, raise_count = (0, 0) if self._context is None else self._context
+
+        return raise_count if board_card_count == len(game.board) else 0
 
 
 class KuhnPokerTreeFactory(PokerTreeFactory):
     def _create_game(self):
         return KuhnPoker()
+
+
+class LeducPokerTreeFactory(PokerTreeFactory):
+    """LeducPokerTreeFactory is the class for factories of Leduc-style poker tree games.
+
+    Each player antes and is dealt one hole card from a deck of the given ranks and suits. The game has round_count
+    betting rounds, each but the first preceded by the deal of a board card, and the players who did not fold show
+    down their hands: more board cards paired by the hole card win, and ties are broken by the rank of the hole card.
+    The bets are those of the stakes under the limit, the small bet before the board and the big bet after it in fixed
+    limit games. The default arguments give Leduc hold'em, up to the cap on bets/raises of fixed-limit games.
+    """
+
+    def __init__(
+            self,
+            ranks='JQK',
+            suits='hs',
+            round_count=2,
+            stakes=Stakes(1, (), 2, 4),
+            starting_stacks=(13, 13),
+            limit_type=FixedLimit,
+            suit_isomorphism=False,
+            action_abstraction=None,
+    ):
+        if round_count < 1:
+            raise ValueError('There must be at least one betting round')
+        elif len(ranks) * len(suits) < len(starting_stacks) + round_count - 1:
+            raise ValueError('The deck has too few cards')
+
+        super().__init__(suit_isomorphism, action_abstraction)
+
+        self.__ranks = ranks
+        self.__suits = suits
+        self.__round_count = round_count
+        self.__stakes = stakes
+        self.__starting_stacks = tuple(starting_stacks)
+        self.__limit_type = limit_type
+
+    @property
+    def ranks(self):
+        return self.__ranks
+
+    @property
+    def suits(self):
+        return self.__suits
+
+    @property
+    def round_count(self):
+        return self.__round_count
+
+    @property
+    def stakes(self):
+        return self.__stakes
+
+    @property
+    def starting_stacks(self):
+        return self.__starting_stacks
+
+    @property
+    def limit_type(self):
+        return self.__limit_type
+
+    def _create_game(self):
+        variant_type = partial(_LeducPokerVariant, ranks=self.ranks, suits=self.suits, round_count=self.round_count)
+
+        return PokerGame(self.limit_type, variant_type, self.stakes, self.starting_stacks)
+
+
+class _LeducPokerVariant(Variant):
+    def __init__(self, game, ranks, suits, round_count):
+        super().__init__(game)
+
+        self.__ranks = ranks
+        self.__suits = suits
+        self.__round_count = round_count
+
+    def create_stages(self):
+        stages = [HoleDealingStage(False, 1, self.game), BettingStage(False, self.game)]
+
+        for i in range(self.__round_count - 1):
+            stages += BoardDealingStage(1, self.game), BettingStage(True, self.game)
+
+        return (*stages, ShowdownStage(self.game))
+
+    def create_evaluators(self):
+        return _LeducPokerEvaluator(),
+
+    def create_deck(self):
+        return Deck(Card(Rank(rank), Suit(suit)) for rank in self.__ranks for suit in self.__suits)
+
+
+class _LeducPokerEvaluator(Evaluator):
+    @classmethod
+    def evaluate_hand(cls, hole, board):
+        rank_index = max(card.rank.index for card in hole)
+        pair_count = sum(card.rank.index == rank_index for card in board)
+
+        return LowIndexedHand(len(Rank) * pair_count + rank_index)
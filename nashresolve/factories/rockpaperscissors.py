@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 from auxiliary import next_or_none
 from krieg.rockpaperscissors import RockPaperScissorsGame, RockPaperScissorsHand, RockPaperScissorsPlayer
 
@@ -19,8 +17,10 @@ class RockPaperScissorsTreeFactory(TreeFactory):
         return RockPaperScissorsGame(self.player_count)
 
     def _create_actions(self, player):
+        snapshot = self._take_snapshot(player.game)
+
         for hand in RockPaperScissorsHand:
-            yield Action(self._create_node(deepcopy(player.game).throw(hand)), f'Throw {hand.value}')
+            yield Action(self._create_node(self._load_snapshot(snapshot).throw(hand)), f'Throw {hand.value}')
 
     def _create_chance_actions(self, nature):
         raise ValueError('The nature has no action in rock paper scissor games')
@@ -39,3 +39,6 @@ class RockPaperScissorsTreeFactory(TreeFactory):
 
     def _get_info_set(self, player):
         return player.index
+
+    def _get_info_set_size(self, player):
+        return 3 ** player.index
@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 from krieg.tictactoe import TicTacToeGame
 
 from nashresolve.factories.sequential import SequentialTreeFactory
@@ -7,22 +5,17 @@ from nashresolve.trees import Action
 
 
 class TicTacToeTreeFactory(SequentialTreeFactory):
-    _cache = {}
-
-    def _create_node(self, game):
-        state = str(game.board)
-
-        if state not in self._cache:
-            self._cache[state] = super()._create_node(game)
-
-        return self._cache[state]
+    def _get_state_key(self, game):
+        return str(game.board)
 
     def _create_game(self):
         return TicTacToeGame()
 
     def _create_actions(self, player):
+        snapshot = self._take_snapshot(player.game)
+
         for r, c in player.game.empty_cell_locations:
-            yield Action(self._create_node(deepcopy(player.game).mark((r, c))), f'Mark {r}, {c}')
+            yield Action(self._create_node(self._load_snapshot(snapshot).mark((r, c))), f'Mark {r}, {c}')
 
     def _create_chance_actions(self, nature):
         raise ValueError('The nature has no action in tic tac toe games')
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections import deque
 
 from nashresolve.trees import Node, PlayerNode
 
@@ -15,16 +16,210 @@ class Game(ABC):
     def is_zero_sum(self): ...
 
 
+class InfoSetTable:
+    """InfoSetTable is the class for bidirectional tables between dense integer info set ids and readable keys."""
+
+    def __init__(self, keys=()):
+        self.__keys = []
+        self.__ids = {}
+
+        for key in keys:
+            self.intern(key)
+
+    @property
+    def keys(self):
+        return tuple(self.__keys)
+
+    def intern(self, key):
+        if key not in self.__ids:
+            self.__ids[key] = len(self.__keys)
+            self.__keys.append(key)
+
+        return self.__ids[key]
+
+    def get_id(self, key):
+        try:
+            return self.__ids[key]
+        except KeyError:
+            raise ValueError(f'Unknown info set key {key!r}') from None
+
+    def get_key(self, info_set_id):
+        return self.__keys[info_set_id]
+
+    def __contains__(self, key):
+        return key in self.__ids
+
+    def __len__(self):
+        return len(self.__keys)
+
+
 class TreeGame(Game):
-    def __init__(self, root):
+    """TreeGame is the class for games of complete trees of nodes.
+
+    The nodes are indexed by type and by info set once, when they are first enumerated, and their depths and parents
+    are indexed once, when they are first queried, so that repeated queries do not traverse the tree again. The depth
+    of a node shared by several histories is that of its shortest history.
+    """
+
+    def __init__(self, root, player_count=None, info_set_table=None):
         self.__root = root
+        self.__info_set_table = info_set_table
+        self.__nodes = None
+        self.__terminal_nodes = None
+        self.__chance_nodes = None
+        self.__player_nodes = None
+        self.__info_set_nodes = None
+        self.__depths = None
+        self.__parents = None
+        self.__zero_sum = None
+
+        if player_count is None:
+            player_count = max(map(PlayerNode.player_index.fget, self.player_nodes), default=-1) + 1
 
-        super().__init__(max(map(PlayerNode.player_index.fget, self.player_nodes), default=-1) + 1)
+        super().__init__(player_count)
 
     @property
     def root(self):
         return self.__root
 
+    @property
+    def info_set_table(self):
+        return self.__info_set_table
+
+    @property
+    def nodes(self):
+        self._index_nodes()
+
+        return iter(self.__nodes)
+
+    @property
+    def terminal_nodes(self):
+        self._index_nodes()
+
+        return iter(self.__terminal_nodes)
+
+    @property
+    def chance_nodes(self):
+        self._index_nodes()
+
+        return iter(self.__chance_nodes)
+
+    @property
+    def player_nodes(self):
+        self._index_nodes()
+
+        return iter(self.__player_nodes)
+
+    @property
+    def info_sets(self):
+        return map(PlayerNode.info_set.fget, self.player_nodes)
+
+    @property
+    def node_count(self):
+        self._index_nodes()
+
+        return len(self.__nodes)
+
+    @property
+    def info_set_count(self):
+        self._index_nodes()
+
+        return len(self.__info_set_nodes)
+
+    def get_info_set_key(self, info_set):
+        return info_set if self.info_set_table is None else self.info_set_table.get_key(info_set)
+
+    def get_info_set_nodes(self, info_set):
+        self._index_nodes()
+
+        try:
+            return self.__info_set_nodes[info_set]
+        except KeyError:
+            raise ValueError(f'Unknown info set {info_set!r}') from None
+
+    def get_depth(self, node):
+        self._index_structure()
+
+        try:
+            return self.__depths[id(node)]
+        except KeyError:
+            raise ValueError('The node is not in the game') from None
+
+    def get_parents(self, node):
+        self._index_structure()
+
+        try:
+            return self.__parents[id(node)]
+        except KeyError:
+            raise ValueError('The node is not in the game') from None
+
+    def is_zero_sum(self):
+        if self.__zero_sum is None:
+            self.__zero_sum = not any(node.payoffs.sum() for node in self.terminal_nodes)
+
+        return self.__zero_sum
+
+    def _index_nodes(self):
+        if self.__nodes is not None:
+            return
+
+        nodes = []
+        pending_nodes = [self.root]
+        node_ids = set()
+
+        while pending_nodes:
+            node = pending_nodes.pop()
+
+            if id(node) not in node_ids:
+                node_ids.add(id(node))
+                nodes.append(node)
+                pending_nodes.extend(reversed(tuple(node.children)))
+
+        info_set_nodes = {}
+
+        for node in filter(Node.is_player_node, nodes):
+            info_set_nodes.setdefault(node.info_set, []).append(node)
+
+        self.__terminal_nodes = tuple(filter(Node.is_terminal_node, nodes))
+        self.__chance_nodes = tuple(filter(Node.is_chance_node, nodes))
+        self.__player_nodes = tuple(filter(Node.is_player_node, nodes))
+        self.__info_set_nodes = {info_set: tuple(nodes) for info_set, nodes in info_set_nodes.items()}
+        self.__nodes = tuple(nodes)
+
+    def _index_structure(self):
+        if self.__depths is not None:
+            return
+
+        depths = {id(self.root): 0}
+        parents = {id(self.root): []}
+        nodes = deque((self.root,))
+
+        while nodes:
+            node = nodes.popleft()
+
+            for child in node.children:
+                if id(child) not in depths:
+                    depths[id(child)] = depths[id(node)] + 1
+                    parents[id(child)] = [node]
+                    nodes.append(child)
+                elif all(parent is not node for parent in parents[id(child)]):
+                    parents[id(child)].append(node)
+
+        self.__parents = {node_id: tuple(nodes) for node_id, nodes in parents.items()}
+        self.__depths = depths
+
+
+class LazyTreeGame(TreeGame):
+    """LazyTreeGame is the class for tree games whose nodes are expanded on demand.
+
+    The nodes form a tree without shared subtrees, so they are iterated by path without remembering the visited nodes.
+    Info sets are not interned and the nodes are not indexed, as the tree is never complete, so the nodes are traversed
+    again on every enumeration.
+    """
+
+    def __init__(self, root, player_count):
+        super().__init__(root, player_count)
+
     @property
     def nodes(self):
         return self.root.descendants
@@ -42,12 +237,18 @@ class TreeGame(Game):
         return filter(Node.is_player_node, self.nodes)
 
     @property
-    def info_sets(self):
-        return map(PlayerNode.info_set.fget, self.player_nodes)
+    def node_count(self):
+        return sum(1 for _ in self.nodes)
+
+    @property
+    def info_set_count(self):
+        return len(set(self.info_sets))
 
     def is_zero_sum(self):
-        for node in self.terminal_nodes:
-            if node.payoffs.sum():
-                return False
+        return not any(node.payoffs.sum() for node in self.terminal_nodes)
+
+    def _index_nodes(self):
+        raise ValueError('The nodes of lazy tree games are not indexed')
 
-        return True
+    def _index_structure(self):
+        raise ValueError('The nodes of lazy tree games are not indexed')
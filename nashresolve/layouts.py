@@ -0,0 +1,434 @@
+from ast import literal_eval
+import hashlib
+from sys import getsizeof
+
+import numpy as np
+
+from nashresolve.games import InfoSetTable, TreeGame
+from nashresolve.trees import Action, ChanceAction, ChanceNode, Node, PlayerNode, TerminalNode
+
+
+class FlatTree:
+    """FlatTree is the class for array-backed layouts of tree games.
+
+    Nodes are stored in topological order, grouped by their depth (the longest path from the root), and their actions
+    are stored as contiguous ranges of edges. Nodes shared by several parents are only stored once. The chances and the
+    payoffs keep the dtypes of those of the nodes, such as np.float32 for trees built with it. The representations of
+    the readable keys of the info set table of the game, if any, are kept in info_set_keys, indexed by the info set ids
+    of the nodes, so that the table can be rebuilt from the literals.
+    """
+
+    TERMINAL = 0
+    CHANCE = 1
+    PLAYER = 2
+
+    def __init__(
+            self,
+            types,
+            depths,
+            offsets,
+            children,
+            chances,
+            labels,
+            payoffs,
+            player_indices,
+            info_set_ids,
+            info_sets,
+            info_set_keys=None,
+    ):
+        self.__types = types
+        self.__depths = depths
+        self.__offsets = offsets
+        self.__children = children
+        self.__chances = chances
+        self.__labels = labels
+        self.__payoffs = payoffs
+        self.__player_indices = player_indices
+        self.__info_set_ids = info_set_ids
+        self.__info_sets = info_sets
+        self.__info_set_keys = info_set_keys
+
+        self.__incoming_edges = None
+        self.__incoming_offsets = None
+        self.__digest = None
+
+    @classmethod
+    def from_game(cls, game):
+        nodes = [game.root]
+        indices = {id(game.root): 0}
+
+        for node in nodes:
+            for child in node.children:
+                if id(child) not in indices:
+                    indices[id(child)] = len(nodes)
+                    nodes.append(child)
+
+        in_degrees = [0] * len(nodes)
+
+        for node in nodes:
+            for child in node.children:
+                in_degrees[indices[id(child)]] += 1
+
+        order = []
+        depths = []
+        depth = 0
+        level = [0]
+
+        while level:
+            order.extend(level)
+            depths.extend([depth] * len(level))
+            depth += 1
+            next_level = []
+
+            for i in level:
+                for child in nodes[i].children:
+                    j = indices[id(child)]
+                    in_degrees[j] -= 1
+
+                    if not in_degrees[j]:
+                        next_level.append(j)
+
+            level = next_level
+
+        nodes = [nodes[i] for i in order]
+        indices = {id(node): i for i, node in enumerate(nodes)}
+        info_set_indices = {}
+        types = np.empty(len(nodes), np.int8)
+        offsets = np.zeros(len(nodes) + 1, np.int64)
+        player_indices = np.full(len(nodes), -1, np.int32)
+        info_set_ids = np.full(len(nodes), -1, np.int64)
+        children = []
+        chances = []
+        labels = []
+        payoffs = []
+        chance_dtypes = set()
+        payoff_dtypes = set()
+
+        for i, node in enumerate(nodes):
+            offsets[i + 1] = offsets[i] + node.action_count
+
+            for action in node.actions:
+                children.append(indices[id(action.child)])
+                chances.append(action.chance if isinstance(action, ChanceAction) else 0)
+                labels.append(action.label)
+
+            if node.is_terminal_node():
+                types[i] = cls.TERMINAL
+                payoffs.append(node.payoffs)
+                payoff_dtypes.add(node.payoffs.dtype)
+            elif node.is_chance_node():
+                types[i] = cls.CHANCE
+                chance_dtypes.add(node.chances.dtype)
+            elif node.is_player_node():
+                types[i] = cls.PLAYER
+                player_indices[i] = node.player_index
+                info_set_ids[i] = info_set_indices.setdefault(node.info_set, len(info_set_indices))
+            else:
+                raise ValueError('Unknown node type')
+
+        return cls(
+            types,
+            np.array(depths, np.int32),
+            offsets,
+            np.array(children, np.int64),
+            np.array(chances, np.result_type(*chance_dtypes) if chance_dtypes else float),
+            np.array(labels),
+            np.array(payoffs, np.result_type(*payoff_dtypes) if payoff_dtypes else float).reshape(
+                len(payoffs), game.player_count,
+            ),
+            player_indices,
+            info_set_ids,
+            np.array(tuple(info_set_indices)),
+            None if game.info_set_table is None else np.array(tuple(map(repr, game.info_set_table.keys)), str),
+        )
+
+    @property
+    def types(self):
+        return self.__types
+
+    @property
+    def depths(self):
+        return self.__depths
+
+    @property
+    def offsets(self):
+        return self.__offsets
+
+    @property
+    def children(self):
+        return self.__children
+
+    @property
+    def chances(self):
+        return self.__chances
+
+    @property
+    def labels(self):
+        return self.__labels
+
+    @property
+    def payoffs(self):
+        return self.__payoffs
+
+    @property
+    def player_indices(self):
+        return self.__player_indices
+
+    @property
+    def info_set_ids(self):
+        return self.__info_set_ids
+
+    @property
+    def info_sets(self):
+        return self.__info_sets
+
+    @property
+    def info_set_keys(self):
+        return self.__info_set_keys
+
+    @property
+    def node_count(self):
+        return self.types.size
+
+    @property
+    def edge_count(self):
+        return self.children.size
+
+    @property
+    def player_count(self):
+        return self.payoffs.shape[1]
+
+    @property
+    def info_set_count(self):
+        return self.info_sets.size
+
+    @property
+    def depth(self):
+        return int(self.depths[-1]) + 1
+
+    @property
+    def level_offsets(self):
+        return np.searchsorted(self.depths, np.arange(self.depth + 1))
+
+    @property
+    def action_counts(self):
+        return np.diff(self.offsets)
+
+    @property
+    def parents(self):
+        return np.repeat(np.arange(self.node_count), self.action_counts)
+
+    @property
+    def action_indices(self):
+        return np.arange(self.edge_count) - np.repeat(self.offsets[:-1], self.action_counts)
+
+    @property
+    def actors(self):
+        parents = self.parents
+
+        return np.where(self.types[parents] == self.PLAYER, self.player_indices[parents], -1)
+
+    @property
+    def info_set_node_indices(self):
+        player_node_indices = self.player_node_indices
+
+        return player_node_indices[np.unique(self.info_set_ids[player_node_indices], return_index=True)[1]]
+
+    @property
+    def info_set_action_counts(self):
+        return self.action_counts[self.info_set_node_indices]
+
+    @property
+    def info_set_offsets(self):
+        return np.concatenate(((0,), np.cumsum(self.info_set_action_counts)))
+
+    @property
+    def slots(self):
+        parents = self.parents
+        player_edges = self.types[parents] == self.PLAYER
+        slots = np.full(self.edge_count, -1, np.int64)
+        slots[player_edges] = (
+            self.info_set_offsets[self.info_set_ids[parents[player_edges]]] + self.action_indices[player_edges]
+        )
+
+        return slots
+
+    @property
+    def terminal_node_indices(self):
+        return np.flatnonzero(self.types == self.TERMINAL)
+
+    @property
+    def chance_node_indices(self):
+        return np.flatnonzero(self.types == self.CHANCE)
+
+    @property
+    def player_node_indices(self):
+        return np.flatnonzero(self.types == self.PLAYER)
+
+    @property
+    def arrays(self):
+        arrays = {
+            'types': self.types,
+            'depths': self.depths,
+            'offsets': self.offsets,
+            'children': self.children,
+            'chances': self.chances,
+            'labels': self.labels,
+            'payoffs': self.payoffs,
+            'player_indices': self.player_indices,
+            'info_set_ids': self.info_set_ids,
+            'info_sets': self.info_sets,
+        }
+
+        if self.info_set_keys is not None:
+            arrays['info_set_keys'] = self.info_set_keys
+
+        return arrays
+
+    @property
+    def digest(self):
+        """Return the hexadecimal digest of the arrays, which is computed once when first needed."""
+        if self.__digest is None:
+            digest = hashlib.blake2b()
+
+            for name, array in self.arrays.items():
+                array = np.ascontiguousarray(array)
+
+                digest.update(f'{name}:{array.dtype.str}:{array.shape}'.encode())
+                digest.update(array.data)
+
+            self.__digest = digest.hexdigest()
+
+        return self.__digest
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def get_reaches(self, probabilities, actors=None):
+        """Return the reach probabilities contributed by and excluding each player, summed over the paths to each node.
+
+        :param probabilities: The probabilities of the edges, optionally with leading batch axes.
+        :param actors: The acting player of each edge (-1 for nature), computed if not given.
+        :return: The own and other reach probabilities with shape (..., node_count, player_count) and the dtype of the
+            probabilities.
+        """
+        if actors is None:
+            actors = self.actors
+
+        if self.__incoming_edges is None:
+            self.__incoming_edges = np.argsort(self.children, kind='stable')
+            self.__incoming_offsets = np.searchsorted(
+                self.children[self.__incoming_edges], np.arange(self.node_count + 1),
+            )
+
+        parents = self.parents
+        level_offsets = self.level_offsets
+        is_actor = actors[:, None] == np.arange(self.player_count)
+        own_factors = np.where(is_actor, probabilities[..., None], 1)
+        other_factors = np.where(is_actor, 1, probabilities[..., None])
+        own_reaches = np.ones(probabilities.shape[:-1] + (self.node_count, self.player_count), probabilities.dtype)
+        other_reaches = np.ones(probabilities.shape[:-1] + (self.node_count, self.player_count), probabilities.dtype)
+
+        for start, stop in zip(level_offsets[1:-1], level_offsets[2:]):
+            edges = self.__incoming_edges[self.__incoming_offsets[start]:self.__incoming_offsets[stop]]
+            segments = self.__incoming_offsets[start:stop] - self.__incoming_offsets[start]
+            edge_parents = parents[edges]
+
+            own_reaches[..., start:stop, :] = np.add.reduceat(
+                own_reaches[..., edge_parents, :] * own_factors[..., edges, :], segments, -2,
+            )
+            other_reaches[..., start:stop, :] = np.add.reduceat(
+                other_reaches[..., edge_parents, :] * other_factors[..., edges, :], segments, -2,
+            )
+
+        return own_reaches, other_reaches
+
+    def get_values(self, probabilities, payoffs=None):
+        """Return the expected payoffs of each node when each edge is followed with the given probability.
+
+        :param probabilities: The probabilities of the edges, optionally with leading batch axes.
+        :param payoffs: The payoffs of the terminal nodes, broadcast against the batch axes, if not those of the tree.
+        :return: The expected payoffs with shape (..., node_count, player_count) and the dtype of the probabilities.
+        """
+        level_offsets = self.level_offsets
+        action_counts = self.action_counts
+        values = np.zeros(probabilities.shape[:-1] + (self.node_count, self.player_count), probabilities.dtype)
+        values[..., self.types == self.TERMINAL, :] = self.payoffs if payoffs is None else payoffs
+
+        for start, stop in zip(level_offsets[-2::-1], level_offsets[:0:-1]):
+            nodes = start + np.flatnonzero(action_counts[start:stop])
+
+            if nodes.size:
+                edges = slice(self.offsets[start], self.offsets[stop])
+                contributions = probabilities[..., edges, None] * values[..., self.children[edges], :]
+                values[..., nodes, :] = np.add.reduceat(contributions, self.offsets[nodes] - self.offsets[start], -2)
+
+        return values
+
+    def to_game(self):
+        labels = self.labels.tolist()
+        info_sets = self.info_sets.tolist()
+        terminal_rows = np.cumsum(self.types == self.TERMINAL) - 1
+        nodes = [None] * self.node_count
+
+        for i in reversed(range(self.node_count)):
+            edges = range(self.offsets[i], self.offsets[i + 1])
+
+            if self.types[i] == self.TERMINAL:
+                nodes[i] = TerminalNode(self.payoffs[terminal_rows[i]], self.payoffs.dtype)
+            elif self.types[i] == self.CHANCE:
+                nodes[i] = ChanceNode(
+                    (ChanceAction(float(self.chances[e]), nodes[self.children[e]], labels[e]) for e in edges),
+                    self.chances.dtype,
+                )
+            elif self.types[i] == self.PLAYER:
+                nodes[i] = PlayerNode(
+                    int(self.player_indices[i]),
+                    info_sets[self.info_set_ids[i]],
+                    (Action(nodes[self.children[e]], labels[e]) for e in edges),
+                )
+            else:
+                raise ValueError('Unknown node type')
+
+        if self.info_set_keys is None:
+            return TreeGame(nodes[0])
+        else:
+            return TreeGame(nodes[0], info_set_table=InfoSetTable(map(literal_eval, self.info_set_keys.tolist())))
+
+
+def get_object_nbytes(game):
+    """Return the approximate number of bytes used by the node objects of a tree game."""
+    seen = set()
+    nbytes = 0
+    nodes = [game.root]
+
+    def measure(obj):
+        nonlocal nbytes
+
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            nbytes += getsizeof(obj)
+
+    for node in nodes:
+        if id(node) in seen:
+            continue
+
+        measure(node)
+        measure(node.__dict__)
+        measure(node.actions)
+
+        for value in node.__dict__.values():
+            measure(value)
+
+        for action in node.actions:
+            measure(action)
+            measure(action.__dict__)
+
+            for value in action.__dict__.values():
+                if not isinstance(value, Node):
+                    measure(value)
+
+            nodes.append(action.child)
+
+    return nbytes
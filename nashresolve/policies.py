@@ -0,0 +1,90 @@
+import numpy as np
+
+from nashresolve.checkpoints import dump, load
+
+
+class Policy:
+    """Policy is the class for frozen, read-only strategies of tree games.
+
+    The readable keys of the info sets are mapped by a hash index to the rows of a normalized probability matrix, padded
+    with zeros to the largest action count, so that strategies can be queried without the game tree or the solver.
+    """
+
+    def __init__(self, info_sets, action_counts, probabilities):
+        self.__info_sets = info_sets
+        self.__action_counts = action_counts
+        self.__probabilities = probabilities
+        self.__indices = dict(zip(info_sets.tolist(), range(len(info_sets))))
+
+    @classmethod
+    def from_solver(cls, solver):
+        strategies = {}
+
+        for node in solver.game.player_nodes:
+            key = solver.game.get_info_set_key(node.info_set)
+
+            if key not in strategies:
+                strategies[key] = np.asarray(solver.get_probabilities(node), float)
+
+        action_counts = np.fromiter(map(len, strategies.values()), np.int64, len(strategies))
+        probabilities = np.zeros((len(strategies), action_counts.max(initial=0)))
+
+        for i, strategy in enumerate(strategies.values()):
+            total = strategy.sum()
+            probabilities[i, :strategy.size] = strategy / total if total > 0 else 1 / strategy.size
+
+        return cls(np.array(tuple(strategies)), action_counts, probabilities)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Load the policy exported to the path, memory-mapping the probabilities with the given mode."""
+        arrays = load(path, mmap_mode)[1]
+
+        return cls(arrays['info_sets'], arrays['action_counts'], arrays['probabilities'])
+
+    @property
+    def info_sets(self):
+        return self.__info_sets
+
+    @property
+    def action_counts(self):
+        return self.__action_counts
+
+    @property
+    def probabilities(self):
+        return self.__probabilities
+
+    @property
+    def info_set_count(self):
+        return len(self.info_sets)
+
+    def dump(self, path):
+        dump(
+            path,
+            {'info_sets': self.info_sets, 'action_counts': self.action_counts, 'probabilities': self.probabilities},
+            {'info_set_count': self.info_set_count},
+        )
+
+    def get_index(self, info_set):
+        try:
+            return self.__indices[info_set]
+        except KeyError:
+            raise ValueError(f'Unknown info set {info_set!r}') from None
+
+    def get_indices(self, info_sets):
+        return np.fromiter(map(self.get_index, info_sets), np.int64)
+
+    def get_probabilities(self, info_set):
+        index = self.get_index(info_set)
+
+        return self.probabilities[index, :self.action_counts[index]]
+
+    def get_batch_probabilities(self, info_sets):
+        """Return the zero-padded rows of the probability matrix of the info sets."""
+        return self.probabilities[self.get_indices(info_sets)]
+
+    def __contains__(self, info_set):
+        return info_set in self.__indices
+
+    def __len__(self):
+        return self.info_set_count
@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from time import perf_counter
+
+import numpy as np
+
+from nashresolve.layouts import FlatTree
+from nashresolve.solvers.cfr import CFRSolver
+
+
+class BlueprintEvaluator:
+    """BlueprintEvaluator is the class for leaf evaluators estimating the payoffs of states by a blueprint policy.
+
+    The game below each state is built to its real terminals and its expected payoffs are computed in one bottom-up
+    pass, following the blueprint policy at the info sets it knows and uniform strategies elsewhere. The payoffs of at
+    most capacity states are memoized by the state keys of the factory, evicting those of the least recently evaluated
+    state first, so the leaves shared by the subgames of successive resolves are only evaluated once.
+    """
+
+    def __init__(self, factory, blueprint, capacity=65536):
+        self.__factory = factory
+        self.__blueprint = blueprint
+        self.__capacity = capacity
+        self.__payoffs = OrderedDict()
+
+    @property
+    def factory(self):
+        return self.__factory
+
+    @property
+    def blueprint(self):
+        return self.__blueprint
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @property
+    def size(self):
+        return len(self.__payoffs)
+
+    def __call__(self, state):
+        state_key = self.factory.get_state_key(state)
+
+        if state_key is None:
+            return self._evaluate(state)
+        elif state_key in self.__payoffs:
+            self.__payoffs.move_to_end(state_key)
+        else:
+            self.__payoffs[state_key] = self._evaluate(state)
+
+            if len(self.__payoffs) > self.capacity:
+                self.__payoffs.popitem(False)
+
+        return self.__payoffs[state_key]
+
+    def clear(self):
+        self.__payoffs.clear()
+
+    def _evaluate(self, state):
+        game = self.factory.build_subgame(((1, state),))
+        tree = FlatTree.from_game(game)
+        strategies = []
+
+        for info_set, action_count in zip(tree.info_sets.tolist(), tree.info_set_action_counts.tolist()):
+            key = game.get_info_set_key(info_set)
+
+            if key in self.blueprint and self.blueprint.action_counts[self.blueprint.get_index(key)] == action_count:
+                strategies.append(self.blueprint.get_probabilities(key))
+            else:
+                strategies.append(np.full(action_count, 1 / action_count))
+
+        probabilities = tree.chances.astype(float)
+        player_edges = np.flatnonzero(tree.slots >= 0)
+        probabilities[player_edges] = np.concatenate([np.zeros(0)] + strategies)[tree.slots[player_edges]]
+
+        return tree.get_values(probabilities)[0]
+
+
+class SubgameResolver:
+    """SubgameResolver is the class for real-time re-solvers of depth-limited subgames.
+
+    The subgame of the states consistent with a public state reached in play, weighted by the ranges of the players, is
+    built by the factory down to the maximum depth, below which the payoffs are estimated by the evaluator (by default,
+    a BlueprintEvaluator of the blueprint policy). The subgame is then solved until the time budget, which also counts
+    the building, or the maximum iteration count is exhausted, whichever comes first.
+    """
+
+    def __init__(self, factory, max_depth, evaluator=None, blueprint=None, solver_type=CFRSolver):
+        if evaluator is None:
+            if blueprint is None:
+                raise ValueError('Either an evaluator or a blueprint policy must be given')
+
+            evaluator = BlueprintEvaluator(factory, blueprint)
+
+        self.__factory = factory
+        self.__max_depth = max_depth
+        self.__evaluator = evaluator
+        self.__solver_type = solver_type
+
+    @property
+    def factory(self):
+        return self.__factory
+
+    @property
+    def max_depth(self):
+        return self.__max_depth
+
+    @property
+    def evaluator(self):
+        return self.__evaluator
+
+    @property
+    def solver_type(self):
+        return self.__solver_type
+
+    def build(self, states):
+        return self.factory.build_subgame(states, self.max_depth, self.evaluator)
+
+    def resolve(self, states, time_budget=None, max_iteration_count=1000):
+        """Build and solve the subgame of the states, returning the solver after at least one iteration.
+
+        :param states: The pairs of the probabilities and the states of the subgame.
+        :param time_budget: The seconds the building and the solving may take, if limited.
+        :param max_iteration_count: The maximum number of iterations.
+        :return: The solver of the subgame.
+        """
+        start_time = perf_counter()
+        solver = self.solver_type(self.build(states))
+
+        while True:
+            solver.step()
+
+            if solver.iteration_count >= max_iteration_count:
+                break
+            elif time_budget is not None and perf_counter() - start_time >= time_budget:
+                break
+
+        return solver
@@ -1,5 +1,17 @@
 from nashresolve.solvers.bases import Solver, TreeSolver
-from nashresolve.solvers.cfr import CFRSolver
+from nashresolve.solvers.batched import BatchedCFRSolver
+from nashresolve.solvers.cfr import CFRPSolver, CFRSolver, DCFRSolver
+from nashresolve.solvers.instruments import Instrument, JSONLinesWriter, LogWriter
+from nashresolve.solvers.mccfr import ESMCCFRSolver, MCCFRSolver, OSMCCFRSolver
+from nashresolve.solvers.parallel import ParallelCFRSolver
+from nashresolve.solvers.public import PublicTreeCFRSolver
+from nashresolve.solvers.responses import BestResponse
+from nashresolve.solvers.runners import SolveRunner
+from nashresolve.solvers.stores import RegretStore
+from nashresolve.solvers.vectorized import VectorizedCFRSolver
 
-__all__ = 'Solver', 'TreeSolver', 'CFRSolver'
-# __all__ = 'Solver', 'TreeSolver', 'CFRPSolver', 'CFRSolver', 'DCFRSolver'
+__all__ = (
+    'Solver', 'TreeSolver', 'BatchedCFRSolver', 'CFRPSolver', 'CFRSolver', 'DCFRSolver', 'Instrument',
+    'JSONLinesWriter', 'LogWriter', 'ESMCCFRSolver', 'MCCFRSolver', 'OSMCCFRSolver', 'ParallelCFRSolver',
+    'PublicTreeCFRSolver', 'BestResponse', 'SolveRunner', 'RegretStore', 'VectorizedCFRSolver',
+)
@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from nashresolve.layouts import FlatTree
+from nashresolve.policies import Policy
+from nashresolve.solvers.responses import BestResponse
+
 
 class Solver(ABC):
     def __init__(self, game):
@@ -14,4 +20,48 @@ class Solver(ABC):
 
 
 class TreeSolver(Solver, ABC):
-    ...
+    _tree = None
+
+    @property
+    def tree(self):
+        """Return the flattened tree of the game, which is compiled once when first needed."""
+        if self._tree is None:
+            self._tree = FlatTree.from_game(self.game)
+
+        return self._tree
+
+    def get_best_response(self):
+        return BestResponse(self, self.tree)
+
+    def get_policy(self):
+        return Policy.from_solver(self)
+
+    def get_exploitability(self):
+        return self.get_best_response().exploitability
+
+    def get_expected_values(self, node):
+        frames = []
+
+        while True:
+            while not node.is_terminal_node():
+                children = zip(self.get_probabilities(node), node.children)
+                probability, node = next(children)
+
+                frames.append([children, probability, np.zeros(self.game.player_count)])
+
+            values = node.payoffs
+
+            while frames:
+                frame = frames[-1]
+                frame[2] += frame[1] * values
+
+                try:
+                    frame[1], node = next(frame[0])
+                except StopIteration:
+                    frames.pop()
+
+                    values = frame[2]
+                else:
+                    break
+            else:
+                return values
@@ -0,0 +1,179 @@
+import numpy as np
+
+from nashresolve.layouts import FlatTree
+from nashresolve.policies import Policy
+
+
+class BatchedCFRSolver:
+    """BatchedCFRSolver is the class for vanilla counterfactual regret minimization solvers of batches of tree games.
+
+    The games must have identical topologies but may differ in their payoffs and chances. Their flattened trees share
+    the layout of the first game, and the chances, payoffs, regrets and strategies of the games are stacked along a
+    leading batch axis, so that each iteration updates all the games with the same whole-array operations as
+    VectorizedCFRSolver. The results match those of a CFRSolver per game.
+    """
+
+    TOPOLOGY_ARRAY_NAMES = 'types', 'offsets', 'children', 'player_indices', 'info_set_ids'
+
+    def __init__(self, games):
+        games = tuple(games)
+
+        if not games:
+            raise ValueError('No game is given')
+
+        trees = tuple(map(FlatTree.from_game, games))
+        self._games = games
+        self._tree = tree = trees[0]
+
+        for other_tree in trees[1:]:
+            if other_tree.player_count != tree.player_count or not all(
+                    np.array_equal(getattr(tree, name), getattr(other_tree, name))
+                    for name in self.TOPOLOGY_ARRAY_NAMES
+            ):
+                raise ValueError('The games do not have identical topologies')
+
+        self._iteration_count = 0
+        self._chances = np.stack([other_tree.chances for other_tree in trees]).astype(float, copy=False)
+        self._payoffs = np.stack([other_tree.payoffs for other_tree in trees])
+
+        self._action_counts = action_counts = tree.info_set_action_counts
+        self._offsets = tree.info_set_offsets
+        self._segments = np.repeat(np.arange(tree.info_set_count), action_counts)
+        self._parents = tree.parents
+        self._actors = tree.actors
+        self._player_edges = player_edges = np.flatnonzero(self._actors >= 0)
+        self._slots = tree.slots[player_edges]
+        self._player_node_indices = tree.player_node_indices
+
+        shape = len(games), self.slot_count
+        self._regrets = np.zeros(shape)
+        self._strategy_sums = np.zeros(shape)
+        self._counterfactuals = np.zeros(shape)
+        self._strategies = np.tile(self.default_strategies, (len(games), 1))
+        self._weights = np.zeros((len(games), tree.info_set_count))
+        self._weight_sums = np.zeros((len(games), tree.info_set_count))
+
+    @property
+    def games(self):
+        return self._games
+
+    @property
+    def tree(self):
+        return self._tree
+
+    @property
+    def batch_size(self):
+        return len(self.games)
+
+    @property
+    def iteration_count(self):
+        return self._iteration_count
+
+    @property
+    def slot_count(self):
+        return self._segments.size
+
+    @property
+    def regrets(self):
+        return self._regrets
+
+    @property
+    def strategy_sums(self):
+        return self._strategy_sums
+
+    @property
+    def weight_sums(self):
+        return self._weight_sums
+
+    @property
+    def strategies(self):
+        return self._strategies
+
+    @property
+    def default_strategies(self):
+        return 1 / self._action_counts[self._segments]
+
+    @property
+    def average_strategies(self):
+        """Return the average strategies of the games with shape (batch_size, slot_count)."""
+        weight_sums = self.weight_sums[:, self._segments]
+
+        return np.where(
+            weight_sums > 0, self.strategy_sums / np.where(weight_sums > 0, weight_sums, 1), self.default_strategies,
+        )
+
+    def get_policies(self):
+        """Return the average strategy of each game as a policy keyed by the readable keys of its info sets."""
+        average_strategies = self.average_strategies
+        action_indices = np.arange(self.slot_count) - self._offsets[self._segments]
+        info_sets = self.tree.info_sets.tolist()
+        policies = []
+
+        for game, strategies in zip(self.games, average_strategies):
+            probabilities = np.zeros((self.tree.info_set_count, self._action_counts.max(initial=0)))
+            probabilities[self._segments, action_indices] = strategies
+
+            policies.append(
+                Policy(np.array(tuple(map(game.get_info_set_key, info_sets))), self._action_counts, probabilities),
+            )
+
+        return policies
+
+    def step(self):
+        """Iterate on all the games, returning the expected payoffs of their roots with shape (batch_size, players)."""
+        self._iteration_count += 1
+
+        values = self._iterate()
+
+        self._collect()
+
+        return values
+
+    def _iterate(self):
+        tree = self._tree
+        probabilities = self._chances.copy()
+        probabilities[:, self._player_edges] = self._strategies[:, self._slots]
+
+        own_reaches, other_reaches = tree.get_reaches(probabilities, self._actors)
+        values = tree.get_values(probabilities, self._payoffs)
+
+        # Batched regret and strategy sum updates
+
+        player_edges = self._player_edges
+        actors = self._actors[player_edges]
+        parents = self._parents[player_edges]
+        player_node_indices = self._player_node_indices
+
+        self._counterfactuals[:] = self._bincount(
+            self._slots,
+            other_reaches[:, parents, actors] * values[:, tree.children[player_edges], actors],
+            self.slot_count,
+        )
+        self._weights[:] = self._bincount(
+            tree.info_set_ids[player_node_indices],
+            own_reaches[:, player_node_indices, tree.player_indices[player_node_indices]],
+            tree.info_set_count,
+        )
+
+        return values[:, 0]
+
+    def _collect(self):
+        segments = self._segments
+        strategies = self._strategies
+        counterfactuals = self._counterfactuals
+        expected_counterfactuals = self._bincount(segments, counterfactuals * strategies, self.tree.info_set_count)
+
+        self._strategy_sums += self._weights[:, segments] * strategies
+        self._weight_sums += self._weights
+        self._regrets += counterfactuals - expected_counterfactuals[:, segments]
+
+        pos_regrets = self._regrets.clip(0)
+        sums = self._bincount(segments, pos_regrets, self.tree.info_set_count)[:, segments]
+
+        self._strategies[:] = np.where(sums > 0, pos_regrets / np.where(sums > 0, sums, 1), self.default_strategies)
+
+    def _bincount(self, indices, weights, length):
+        """Sum the weights of each batch by the indices, returning the sums with shape (batch_size, length)."""
+        batch_indices = indices + length * np.arange(self.batch_size)[:, None]
+
+        return np.bincount(batch_indices.ravel(), weights.ravel(), self.batch_size * length).reshape(-1, length)
@@ -1,60 +1,49 @@
+import tracemalloc
+from time import perf_counter
+
 import numpy as np
 
 from nashresolve.solvers.bases import TreeSolver
+from nashresolve.solvers.stores import RegretStore
 
 
 class CFRSolver(TreeSolver):
-    """CFRSolver is the class for vanilla counterfactual regret minimization solvers."""
-
-    class Datum:
-        def __init__(self, player_index, action_count):
-            self.player_index = player_index
-            self.action_count = action_count
-
-            self.weight = 0
-            self.counterfactuals = np.zeros(action_count)
-
-            self.strategy_sum = np.zeros(action_count)
-            self.weight_sum = 0
-            self.regrets = np.zeros(action_count)
+    """CFRSolver is the class for vanilla counterfactual regret minimization solvers.
 
-        @property
-        def strategy(self):
-            pos_regrets = self.regrets.clip(0)
+    The info sets of games with an info set table are registered up front in the order of their ids, so that the ids
+    index the regret store directly. Each step traverses the tree and then collects the regrets and strategy sums. If
+    instruments are added, the metrics of each step are recorded by them; otherwise, no metric is computed.
 
-            return pos_regrets / pos_regrets.sum() if pos_regrets.any() else self.default_strategy
+    With regret-based pruning, the subtrees under the actions of zero probability whose regrets are below the pruning
+    threshold are skipped, except in every pruning_interval-th iteration, in which the whole tree is traversed so that
+    the regrets of the pruned actions are still updated. The counterfactual values of pruned actions are taken to be
+    those of their info sets, so that their regrets are kept as is.
 
-        @property
-        def average_strategy(self):
-            return self.strategy_sum / self.weight_sum if self.weight_sum else self.default_strategy
+    The regrets and the strategies are stored with the given dtype and the strategy sums with the accumulator dtype,
+    which defaults to the dtype, as in RegretStore.
+    """
 
-        @property
-        def default_strategy(self):
-            return np.full(self.action_count, 1 / self.action_count)
-
-        def update(self, nature_contribution, player_contributions, counterfactuals):
-            player_contribution = player_contributions[self.player_index]
-            other_contribution = nature_contribution * np.hstack(
-                (player_contributions[:self.player_index], player_contributions[self.player_index + 1:])
-            ).prod()
-
-            self.weight += player_contribution
-            self.counterfactuals += other_contribution * counterfactuals
+    def __init__(self, game, dtype=float, accumulator_dtype=None):
+        super().__init__(game)
 
-        def collect(self):
-            self.strategy_sum += self.weight * self.strategy
-            self.weight_sum += self.weight
-            self.regrets += self.counterfactuals - np.full(self.action_count, self.counterfactuals @ self.strategy)
+        self._iteration_count = 0
+        self._data = RegretStore(dtype, accumulator_dtype)
+        self._instruments = []
+        self._traversed_node_count = 0
+        self._pruning_threshold = None
+        self._pruning_interval = None
+        self._indexed = game.info_set_table is not None
 
-        def clear(self):
-            self.weight = 0
-            self.counterfactuals.fill(0)
+        if self._indexed:
+            info_set_count = len(game.info_set_table)
+            player_indices = np.zeros(info_set_count, np.int32)
+            action_counts = np.zeros(info_set_count, np.int64)
 
-    def __init__(self, game):
-        super().__init__(game)
+            for node in game.player_nodes:
+                player_indices[node.info_set] = node.player_index
+                action_counts[node.info_set] = node.action_count
 
-        self._iteration_count = 0
-        self._data = {}
+            self.data.extend(range(info_set_count), player_indices, action_counts)
 
     @property
     def iteration_count(self):
@@ -64,104 +53,302 @@ class CFRSolver(TreeSolver):
     def data(self):
         return self._data
 
-    def get_datum(self, node):
-        if node.info_set in self.data:
-            return self.data[node.info_set]
-        else:
-            self.data[node.info_set] = self.Datum(node.player_index, node.action_count)
+    @property
+    def instruments(self):
+        return tuple(self._instruments)
 
-            return self.data[node.info_set]
+    @property
+    def pruning_threshold(self):
+        return self._pruning_threshold
 
-    def get_probabilities(self, node):
-        if node.is_terminal_node():
-            return np.empty(0)
-        elif node.is_chance_node():
-            return node.chances
-        elif node.is_player_node():
-            return self.get_datum(node).average_strategy
-        else:
-            raise ValueError('Unknown node type')
+    @property
+    def pruning_interval(self):
+        return self._pruning_interval
 
-    def get_expected_values(self, node):
-        if node.is_terminal_node():
-            return node.payoffs
-        else:
-            probabilities = self.get_probabilities(node)
-            expected_values = np.zeros(probabilities.size)
+    def set_pruning(self, threshold=None, interval=10):
+        """Prune the actions whose regrets are below the threshold, except in every interval-th iteration.
+
+        Pruning is disabled if no threshold is given.
+        """
+        if threshold is not None and threshold > 0:
+            raise ValueError('The pruning threshold must not be positive')
+        elif interval < 1:
+            raise ValueError('The pruning interval must be positive')
+
+        self._pruning_threshold = threshold
+        self._pruning_interval = interval
+
+    def warm_start(self, solver, scale=1):
+        """Start from the regrets and the strategy sums of the solver of a similar game, multiplied by the scale.
+
+        The info sets are matched by their readable keys. Those missing from the other game or with other action counts
+        are left as is.
+        """
+        source_indices = {}
+
+        for node in solver.game.player_nodes:
+            key = solver.game.get_info_set_key(node.info_set)
+
+            if key not in source_indices:
+                source_indices[key] = solver._get_index(node)
+
+        indices = {}
 
-            for probability, counterfactuals in zip(probabilities, map(self.get_expected_values, node.children)):
-                expected_values += probability * counterfactuals
+        for node in self.game.player_nodes:
+            key = self.game.get_info_set_key(node.info_set)
+            index = self._get_index(node)
 
-            return expected_values
+            if key in source_indices and index not in indices:
+                source_index = source_indices[key]
+
+                if solver.data.action_counts[source_index] == self.data.action_counts[index]:
+                    indices[index] = source_index
+
+        self.data.warm_start(
+            solver.data,
+            np.fromiter(indices.keys(), np.int64, len(indices)),
+            np.fromiter(indices.values(), np.int64, len(indices)),
+            scale,
+        )
+
+    def add_instrument(self, instrument):
+        self._instruments.append(instrument)
+
+    def remove_instrument(self, instrument):
+        self._instruments.remove(instrument)
+
+    def get_probabilities(self, node):
+        return self.data.get_probabilities(node)
 
     def step(self):
         self._iteration_count += 1
-        counterfactuals = self._traverse(self.game.root, 1, np.ones(self.game.player_count))
 
-        for datum in self.data.values():
-            datum.collect()
-            datum.clear()
+        if self._instruments:
+            return self._step_with_instruments()
 
-        return counterfactuals
+        values = self._iterate()
 
-    def _traverse(self, node, nature_contribution, player_contributions):
-        if node.is_terminal_node():
-            return node.payoffs
-        elif node.is_chance_node():
-            counterfactuals = np.zeros(node.probabilities.size)
-
-            for child, probability in zip(node.children, node.probabilities):
-                counterfactuals += probability * self._traverse(
-                    child, nature_contribution * probability, player_contributions,
-                )
-
-            return counterfactuals
-        elif node.is_player_node():
-            return self._solve(node, nature_contribution, player_contributions)
+        self._collect()
+
+        return values
+
+    def restore(self, arrays, iteration_count, share=False):
+        """Continue from the store arrays and the iteration count of a checkpoint.
+
+        The arrays are used as is if no info set is registered yet, or if sharing is requested and the info sets are
+        registered with the saved layout, so that memory maps are only paged in when accessed. They are otherwise copied
+        into the registered info sets.
+        """
+        if not self.data.info_set_count or share and self.data.has_layout(arrays):
+            self.data.restore(arrays)
         else:
-            raise ValueError('Unknown node type')
+            self.data.load(arrays)
+
+        self._iteration_count = iteration_count
+
+    def _iterate(self):
+        return self._traverse(self.game.root, 1, np.ones(self.game.player_count))
+
+    def _iterate_with_node_count(self):
+        return self._iterate(), self._traversed_node_count
+
+    def _step_with_instruments(self):
+        tracing = any(instrument.trace_allocations for instrument in self._instruments)
+        started_tracing = tracing and not tracemalloc.is_tracing()
+
+        if started_tracing:
+            tracemalloc.start()
+        if tracing:
+            memory = tracemalloc.get_traced_memory()[0]
+
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+
+        try:
+            start_time = perf_counter()
+            values, node_count = self._iterate_with_node_count()
+            traversal_time = perf_counter() - start_time
+            touched_slots = np.bincount(self.data.segments, self.data.counterfactuals != 0, self.data.info_set_count)
+            info_set_count = int(np.count_nonzero((self.data.weights != 0) | (touched_slots > 0)))
+
+            start_time = perf_counter()
+            self._collect()
+            collect_time = perf_counter() - start_time
+
+            if tracing:
+                current_memory, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        regrets = self.data.regrets
+        strategies = self.data.strategies
+        entropies = np.bincount(
+            self.data.segments, -strategies * np.log(np.where(strategies > 0, strategies, 1)), self.data.info_set_count,
+        )
+        metrics = {
+            'iteration_count': self.iteration_count,
+            'traversal_time': traversal_time,
+            'collect_time': collect_time,
+            'node_count': node_count,
+            'info_set_count': info_set_count,
+            'allocated_memory': current_memory - memory if tracing else None,
+            'peak_memory': peak_memory - memory if tracing else None,
+            'positive_regret_sum': float(regrets.clip(0).sum()),
+            'negative_regret_sum': float(regrets.clip(None, 0).sum()),
+            'max_regret': float(regrets.max(initial=0)),
+            'mean_strategy_entropy': float(entropies.mean()) if entropies.size else 0,
+            'weight_sum': float(self.data.weight_sums.sum()),
+        }
+
+        for instrument in self._instruments:
+            instrument.record(metrics)
+
+        return values
+
+    def _get_index(self, node):
+        return node.info_set if self._indexed else self.data.get_index(node)
+
+    def _collect(self):
+        self.data.collect()
+        self.data.clear()
+        self.data.match_regrets()
+
+    def _traverse(self, node, nature_contribution, player_contributions):
+        """Return the counterfactual values of the node, traversing its subtree with an explicit stack of frames.
+
+        The number of visited nodes is kept in _traversed_node_count.
+        """
+        frames = []
+        node_count = 0
+        pruning_threshold = self._pruning_threshold
+
+        if pruning_threshold is not None and not self.iteration_count % self._pruning_interval:
+            pruning_threshold = None
+
+        while True:
+            node_count += 1
+
+            if node.is_terminal_node():
+                values = node.payoffs
+            else:
+                if node.is_chance_node():
+                    values = np.zeros(self.game.player_count)
+                    frame = _Frame(node, None, node.chances, nature_contribution, player_contributions, values)
+                elif node.is_player_node():
+                    index = self._get_index(node)
+                    frame = _Frame(
+                        node, index, self.data.get_strategy(index), nature_contribution, player_contributions, [],
+                    )
+
+                    if pruning_threshold is not None:
+                        self._prune(frame, pruning_threshold)
+                else:
+                    raise ValueError('Unknown node type')
+
+                frames.append(frame)
+
+                values = None
+
+            while values is not None and frames:
+                frame = frames[-1]
+
+                if frame.index is None:
+                    frame.values += frame.probabilities[frame.child_index] * values
+                else:
+                    frame.values.append(values)
+
+                frame.child_index += 1
+
+                if frame.child_index < len(frame.children):
+                    values = None
+                else:
+                    frames.pop()
+
+                    values = frame.values if frame.index is None else self._solve(frame)
 
-    def _solve(self, node, nature_contribution, player_contributions):
-        datum = self.get_datum(node)
+            if values is not None:
+                self._traversed_node_count = node_count
 
-        counterfactuals = []
+                return values
 
-        for i, (child, probability) in enumerate(zip(node.children, datum.strategy)):
-            updated_contributions = player_contributions.copy()
-            updated_contributions[node.player_index] *= probability
-            counterfactuals.append(self._traverse(child, nature_contribution, updated_contributions))
+            frame = frames[-1]
+            node = frame.children[frame.child_index]
+            probability = frame.probabilities[frame.child_index]
+            nature_contribution = frame.nature_contribution
 
-        counterfactuals = np.array(counterfactuals)
+            if frame.index is None:
+                nature_contribution *= probability
+                player_contributions = frame.player_contributions
+            else:
+                player_contributions = frame.player_contributions.copy()
+                player_contributions[frame.node.player_index] *= probability
 
-        datum.update(nature_contribution, player_contributions, counterfactuals[:, node.player_index])
+    def _prune(self, frame, pruning_threshold):
+        strategy = frame.probabilities
 
-        return counterfactuals.T @ datum.strategy
+        if strategy.all():
+            return
+
+        pruned = (strategy == 0) & (self.data.regrets[self.data.get_slots(frame.index)] < pruning_threshold)
+
+        if pruned.any():
+            frame.kept_action_indices = np.flatnonzero(~pruned)
+            frame.children = tuple(map(frame.children.__getitem__, frame.kept_action_indices))
+            frame.probabilities = strategy[frame.kept_action_indices]
+            frame.strategy = strategy
+
+    def _solve(self, frame):
+        if frame.kept_action_indices is not None:
+            return self._solve_pruned(frame)
+
+        counterfactuals = np.array(frame.values)
+        player_index = frame.node.player_index
+        player_contribution = frame.player_contributions[player_index]
+        other_contribution = frame.nature_contribution * np.delete(frame.player_contributions, player_index).prod()
+
+        self.data.update(frame.index, player_contribution, other_contribution * counterfactuals[:, player_index])
+
+        return counterfactuals.T @ frame.probabilities
+
+    def _solve_pruned(self, frame):
+        kept_counterfactuals = np.array(frame.values)
+        player_index = frame.node.player_index
+        values = kept_counterfactuals.T @ frame.probabilities
+        counterfactuals = np.full(frame.strategy.size, values[player_index])
+        counterfactuals[frame.kept_action_indices] = kept_counterfactuals[:, player_index]
+        player_contribution = frame.player_contributions[player_index]
+        other_contribution = frame.nature_contribution * np.delete(frame.player_contributions, player_index).prod()
+
+        self.data.update(frame.index, player_contribution, other_contribution * counterfactuals)
+
+        return values
 
 
-'''
 class CFRPSolver(CFRSolver):
-    """CFRPSolver is the class for CFR+ solvers."""
+    """CFRPSolver is the class for CFR+ solvers.
+
+    As the regrets are floored at zero, no action would ever be below a pruning threshold, so pruning is not supported.
+    """
 
-    class _Data(CFRSolver._Data['CFRPSolver']):
-        @property
-        def strategy(self):
-            return self.regrets / sum(self.regrets) if any(self.regrets) else self.default_strategy
+    def set_pruning(self, threshold=None, interval=10):
+        if threshold is not None:
+            raise ValueError(f'{type(self).__name__} does not support pruning')
 
-        def collect(self):
-            super().collect()
+        super().set_pruning(threshold, interval)
+
+    def _collect(self):
+        self.data.collect()
+        self.data.discount(1, 0, self.iteration_count / (self.iteration_count + 1))
+        self.data.clear()
+        self.data.match_regrets()
 
-            multiplier = self.solver._iter_count / (self.solver._iter_count + 1)
 
-            self.strategy_sum *= multiplier
-            self.weight_sum *= multiplier
-            self.regrets = Vector(max(0.0, regret) for regret in self.regrets)
-'''
-'''
 class DCFRSolver(CFRSolver):
     """DCFRSolver is the class for Discounted CFR solvers."""
 
-    def __init__(self, game, alpha=3 / 2, beta=0, gamma=2):
-        super().__init__(game)
+    def __init__(self, game, alpha=3 / 2, beta=0, gamma=2, dtype=float, accumulator_dtype=None):
+        super().__init__(game, dtype, accumulator_dtype)
 
         self.alpha = alpha
         self.beta = beta
@@ -169,24 +356,37 @@ class DCFRSolver(CFRSolver):
 
     @property
     def alpha_multiplier(self):
-        return self._iter_count ** self.alpha / (self._iter_count ** self.alpha + 1)
+        return self.iteration_count ** self.alpha / (self.iteration_count ** self.alpha + 1)
 
     @property
     def beta_multiplier(self):
-        return self._iter_count ** self.beta / (self._iter_count ** self.beta + 1)
+        return self.iteration_count ** self.beta / (self.iteration_count ** self.beta + 1)
 
     @property
     def gamma_multiplier(self):
-        return (self._iter_count / (self._iter_count + 1)) ** self.gamma
-
-    def regret_multiplier(self, regret):
-        return self.alpha_multiplier if regret > 0 else self.beta_multiplier
-
-    class _Data(CFRSolver._Data['DCFRSolver']):
-        def collect(self):
-            super().collect()
-
-            self.strategy_sum *= self.solver.gamma_multiplier
-            self.weight_sum *= self.solver.gamma_multiplier
-            self.regrets = Vector(self.solver.regret_multiplier(regret) * regret for regret in self.regrets)
-'''
+        return (self.iteration_count / (self.iteration_count + 1)) ** self.gamma
+
+    def _collect(self):
+        self.data.collect()
+        self.data.discount(self.alpha_multiplier, self.beta_multiplier, self.gamma_multiplier)
+        self.data.clear()
+        self.data.match_regrets()
+
+
+class _Frame:
+    __slots__ = (
+        'node', 'index', 'probabilities', 'nature_contribution', 'player_contributions', 'values', 'children',
+        'child_index', 'kept_action_indices', 'strategy',
+    )
+
+    def __init__(self, node, index, probabilities, nature_contribution, player_contributions, values):
+        self.node = node
+        self.index = index
+        self.probabilities = probabilities
+        self.nature_contribution = nature_contribution
+        self.player_contributions = player_contributions
+        self.values = values
+        self.children = tuple(node.children)
+        self.child_index = 0
+        self.kept_action_indices = None
+        self.strategy = probabilities
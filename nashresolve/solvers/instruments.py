@@ -0,0 +1,72 @@
+import json
+import logging
+from collections import deque
+
+
+class Instrument:
+    """Instrument is the class for collectors of per-iteration metrics of counterfactual regret minimization solvers.
+
+    Each recorded iteration is kept in the records, of which only the last max_record_count are kept if given, and is
+    passed to the callbacks, such as JSONLinesWriter or LogWriter instances. Allocations are only traced if
+    trace_allocations is set, as tracing slows the solver down considerably.
+    """
+
+    def __init__(self, callbacks=(), trace_allocations=False, max_record_count=None):
+        self.__callbacks = list(callbacks)
+        self.__trace_allocations = trace_allocations
+        self.__records = deque(maxlen=max_record_count)
+
+    @property
+    def callbacks(self):
+        return tuple(self.__callbacks)
+
+    @property
+    def trace_allocations(self):
+        return self.__trace_allocations
+
+    @property
+    def records(self):
+        return tuple(self.__records)
+
+    def add_callback(self, callback):
+        self.__callbacks.append(callback)
+
+    def record(self, metrics):
+        self.__records.append(metrics)
+
+        for callback in self.__callbacks:
+            callback(metrics)
+
+
+class JSONLinesWriter:
+    """JSONLinesWriter is the class for instrument callbacks writing each iteration as a JSON line to a file."""
+
+    def __init__(self, file):
+        self.__file = file
+
+    @property
+    def file(self):
+        return self.__file
+
+    def __call__(self, metrics):
+        self.file.write(json.dumps(metrics) + '\n')
+        self.file.flush()
+
+
+class LogWriter:
+    """LogWriter is the class for instrument callbacks logging each iteration."""
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.__logger = logging.getLogger(__name__) if logger is None else logger
+        self.__level = level
+
+    @property
+    def logger(self):
+        return self.__logger
+
+    @property
+    def level(self):
+        return self.__level
+
+    def __call__(self, metrics):
+        self.logger.log(self.level, 'Iteration %d: %s', metrics['iteration_count'], json.dumps(metrics))
@@ -0,0 +1,195 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from nashresolve.solvers.cfr import CFRSolver
+
+
+class MCCFRSolver(CFRSolver, ABC):
+    """MCCFRSolver is the abstract base class for Monte Carlo counterfactual regret minimization solvers.
+
+    Each step samples a batch of trajectories for every player with a seedable random number generator and collects
+    the sampled regrets and strategy weights once for the whole batch. Pruning is not supported, as sampling already
+    skips most of the tree. The dtypes of the store are given as in CFRSolver.
+    """
+
+    UNIFORM_BUFFER_SIZE = 4096
+
+    def __init__(self, game, batch_size=1, seed=None, dtype=float, accumulator_dtype=None):
+        super().__init__(game, dtype, accumulator_dtype)
+
+        self.batch_size = batch_size
+
+        self._random = np.random.default_rng(seed)
+        self._uniforms = np.empty(0)
+        self._uniform_index = 0
+
+    def set_pruning(self, threshold=None, interval=10):
+        if threshold is not None:
+            raise ValueError(f'{type(self).__name__} does not support pruning')
+
+        super().set_pruning(threshold, interval)
+
+    def _iterate(self):
+        values = np.zeros(self.game.player_count)
+        node_count = 0
+
+        for i in range(self.batch_size):
+            for player_index in range(self.game.player_count):
+                values[player_index] += self._sample(self.game.root, player_index)
+                node_count += self._traversed_node_count
+
+        self._traversed_node_count = node_count
+
+        return values / self.batch_size
+
+    def _choose(self, probabilities):
+        if self._uniform_index == self._uniforms.size:
+            self._uniforms = self._random.random(self.UNIFORM_BUFFER_SIZE)
+            self._uniform_index = 0
+
+        uniform = self._uniforms[self._uniform_index]
+        self._uniform_index += 1
+        cumulative_probabilities = probabilities.cumsum()
+
+        return int(np.searchsorted(cumulative_probabilities, uniform * cumulative_probabilities[-1], 'right'))
+
+    @abstractmethod
+    def _sample(self, node, player_index):
+        """Return the sampled value of the node to the player, sampling its subtree without recursion.
+
+        The number of visited nodes is kept in _traversed_node_count.
+        """
+        ...
+
+
+class ESMCCFRSolver(MCCFRSolver):
+    """ESMCCFRSolver is the class for external sampling Monte Carlo counterfactual regret minimization solvers.
+
+    Chance and opponent actions are sampled, while every action of the traversing player is explored.
+    """
+
+    def _sample(self, node, player_index):
+        frames = []
+        node_count = 0
+
+        while True:
+            node_count += 1
+
+            if node.is_terminal_node():
+                value = node.payoffs[player_index]
+            elif node.is_chance_node():
+                node = node.actions[self._choose(node.chances)].child
+
+                continue
+            elif node.is_player_node():
+                index = self._get_index(node)
+                strategy = self.data.get_strategy(index)
+
+                if node.player_index == player_index:
+                    frames.append(_Frame(node, index, strategy))
+
+                    node = frames[-1].children[0]
+                else:
+                    self.data.update(index, 1, 0)
+
+                    node = node.actions[self._choose(strategy)].child
+
+                continue
+            else:
+                raise ValueError('Unknown node type')
+
+            while frames:
+                frame = frames[-1]
+                frame.values[frame.child_index] = value
+                frame.child_index += 1
+
+                if frame.child_index < len(frame.children):
+                    break
+
+                frames.pop()
+                self.data.update(frame.index, 0, frame.values)
+
+                value = frame.values @ frame.strategy
+            else:
+                self._traversed_node_count = node_count
+
+                return value
+
+            node = frame.children[frame.child_index]
+
+
+class OSMCCFRSolver(MCCFRSolver):
+    """OSMCCFRSolver is the class for outcome sampling Monte Carlo counterfactual regret minimization solvers.
+
+    A single trajectory is sampled per player, exploring the traversing player's actions with probability epsilon,
+    and the sampled values are corrected by importance weights.
+    """
+
+    def __init__(self, game, batch_size=1, seed=None, epsilon=0.6, dtype=float, accumulator_dtype=None):
+        super().__init__(game, batch_size, seed, dtype, accumulator_dtype)
+
+        self.epsilon = epsilon
+
+    def _sample(self, node, player_index):
+        frames = []
+        own_reach = other_reach = sample_reach = 1
+        node_count = 1
+
+        while not node.is_terminal_node():
+            node_count += 1
+
+            if node.is_chance_node():
+                i = self._choose(node.chances)
+                other_reach *= node.chances[i]
+                sample_reach *= node.chances[i]
+            elif node.is_player_node():
+                index = self._get_index(node)
+                strategy = self.data.get_strategy(index)
+
+                if node.player_index == player_index:
+                    sample_strategy = self.epsilon / node.action_count + (1 - self.epsilon) * strategy
+                else:
+                    sample_strategy = strategy
+
+                i = self._choose(sample_strategy)
+
+                frames.append((node, index, strategy, sample_strategy, i, own_reach, other_reach, sample_reach))
+
+                if node.player_index == player_index:
+                    own_reach *= strategy[i]
+                else:
+                    other_reach *= strategy[i]
+
+                sample_reach *= sample_strategy[i]
+            else:
+                raise ValueError('Unknown node type')
+
+            node = node.actions[i].child
+
+        value = node.payoffs[player_index]
+
+        for node, index, strategy, sample_strategy, i, own_reach, other_reach, sample_reach in reversed(frames):
+            values = np.zeros(node.action_count)
+            values[i] = value / sample_strategy[i]
+
+            if node.player_index == player_index:
+                self.data.update(index, own_reach / sample_reach, other_reach / sample_reach * values)
+
+            value = values @ strategy
+
+        self._traversed_node_count = node_count
+
+        return value
+
+
+class _Frame:
+    __slots__ = 'node', 'index', 'strategy', 'values', 'children', 'child_index'
+
+    def __init__(self, node, index, strategy):
+        self.node = node
+        self.index = index
+        self.strategy = strategy
+        self.values = np.zeros(node.action_count)
+        self.children = tuple(node.children)
+        self.child_index = 0
@@ -0,0 +1,186 @@
+from multiprocessing import get_all_start_methods, get_context
+from os import cpu_count
+from weakref import finalize
+
+import numpy as np
+
+from nashresolve.solvers.cfr import CFRSolver
+
+_solver = None
+
+
+def _initialize(solver):
+    global _solver
+
+    _solver = solver
+
+
+def _work(args):
+    return _solver._work(*args)
+
+
+def _release(pool, memories):
+    pool.terminate()
+
+    for memory in memories.values():
+        memory.close()
+        memory.unlink()
+
+
+class ParallelCFRSolver(CFRSolver):
+    """ParallelCFRSolver is the class for vanilla counterfactual regret minimization solvers running on processes.
+
+    The subtrees below the chance nodes of the first chance_depth levels are split into one chunk per worker. Workers
+    read the current strategies and the regrets from and write their weights and counterfactuals to shared memory, which
+    are then reduced in chunk order. The iteration count and the pruning settings are sent to the workers on every
+    iteration. The results match those of CFRSolver up to floating-point error. The shared arrays of the store have its
+    dtype, given as in CFRSolver.
+
+    Shared memory requires Python 3.8 or later.
+    """
+
+    def __init__(self, game, worker_count=None, chance_depth=1, dtype=float, accumulator_dtype=None):
+        try:
+            from multiprocessing.shared_memory import SharedMemory
+        except ImportError:
+            raise ValueError('ParallelCFRSolver requires Python 3.8 or later for shared memory') from None
+
+        super().__init__(game, dtype, accumulator_dtype)
+
+        self.worker_count = cpu_count() if worker_count is None else worker_count
+        self.chance_depth = chance_depth
+
+        for node in game.player_nodes:
+            self.data.get_index(node)
+
+        self._frontier, self._frontier_node_count = self._get_frontier()
+        self._chunks = tuple(map(tuple, np.array_split(np.arange(len(self._frontier)), self.worker_count)))
+        self._shapes = {
+            'strategies': (self.data.slot_count,),
+            'regrets': (self.data.slot_count,),
+            'weights': (len(self._chunks), self.data.info_set_count),
+            'counterfactuals': (len(self._chunks), self.data.slot_count),
+            'values': (len(self._chunks), game.player_count),
+        }
+        self._dtypes = {
+            'strategies': self.data.dtype,
+            'regrets': self.data.dtype,
+            'weights': self.data.dtype,
+            'counterfactuals': self.data.dtype,
+            'values': np.dtype(float),
+        }
+        self._memories = {
+            name: SharedMemory(create=True, size=max(int(np.prod(shape)), 1) * self._dtypes[name].itemsize)
+            for name, shape in self._shapes.items()
+        }
+        self._arrays = {}
+
+        strategies = self._get_array('strategies')
+        strategies[:] = self.data.strategies
+        regrets = self._get_array('regrets')
+        regrets[:] = self.data.regrets
+        self.data.attach(strategies=strategies, regrets=regrets)
+
+        # Forked workers inherit the tree instead of unpickling it
+
+        context = get_context('fork' if 'fork' in get_all_start_methods() else None)
+        self._pool = context.Pool(self.worker_count, _initialize, (self,))
+        self._finalizer = finalize(self, _release, self._pool, self._memories)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_arrays'] = {}
+
+        state.pop('_pool', None)
+        state.pop('_finalizer', None)
+
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._finalizer.alive:
+            self.data.attach(strategies=self.data.strategies.copy(), regrets=self.data.regrets.copy())
+            self._arrays.clear()
+            self._finalizer()
+
+    def restore(self, arrays, iteration_count, share=False):
+        """Continue from the store arrays and the iteration count of a checkpoint, copying the strategies and the
+        regrets into the shared memory read by the workers.
+        """
+        super().restore(arrays, iteration_count, share)
+
+        if not self._finalizer.alive:
+            return
+
+        strategies = self._get_array('strategies')
+        strategies[:] = self.data.strategies
+        regrets = self._get_array('regrets')
+        regrets[:] = self.data.regrets
+        self.data.attach(strategies=strategies, regrets=regrets)
+
+    def _iterate(self):
+        return self._iterate_with_node_count()[0]
+
+    def _iterate_with_node_count(self):
+        node_counts = self._pool.map(
+            _work,
+            (
+                (chunk_index, self._iteration_count, self._pruning_threshold, self._pruning_interval)
+                for chunk_index in range(len(self._chunks))
+            ),
+        )
+
+        self.data.weights[:] = self._get_array('weights').sum(0)
+        self.data.counterfactuals[:] = self._get_array('counterfactuals').sum(0)
+
+        return self._get_array('values').sum(0), self._frontier_node_count + sum(node_counts)
+
+    def _get_frontier(self):
+        frontier = [(self.game.root, 1)]
+        node_count = 0
+
+        for i in range(self.chance_depth):
+            node_count += sum(node.is_chance_node() for node, nature_contribution in frontier)
+            frontier = [
+                (child, nature_contribution * chance)
+                for node, nature_contribution in frontier
+                for child, chance in (zip(node.children, node.chances) if node.is_chance_node() else ((node, 1),))
+            ]
+
+        return frontier, node_count
+
+    def _get_array(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = np.ndarray(self._shapes[name], self._dtypes[name], self._memories[name].buf)
+
+        return self._arrays[name]
+
+    def _work(self, chunk_index, iteration_count, pruning_threshold, pruning_interval):
+        self._iteration_count = iteration_count
+        self._pruning_threshold = pruning_threshold
+        self._pruning_interval = pruning_interval
+
+        self.data.attach(
+            strategies=self._get_array('strategies'),
+            weights=self._get_array('weights')[chunk_index],
+            counterfactuals=self._get_array('counterfactuals')[chunk_index],
+            regrets=self._get_array('regrets'),
+        )
+        self.data.clear()
+
+        values = np.zeros(self.game.player_count)
+        node_count = 0
+
+        for i in self._chunks[chunk_index]:
+            node, nature_contribution = self._frontier[i]
+            values += nature_contribution * self._traverse(node, nature_contribution, np.ones(self.game.player_count))
+            node_count += self._traversed_node_count
+
+        self._get_array('values')[chunk_index] = values
+
+        return node_count
@@ -0,0 +1,316 @@
+from itertools import combinations
+
+import numpy as np
+
+from nashresolve.factories.poker import PokerTreeFactory
+from nashresolve.solvers.cfr import CFRSolver
+
+
+class PublicTreeCFRSolver(CFRSolver):
+    """PublicTreeCFRSolver is the class for range-vectorized vanilla counterfactual regret minimization solvers of
+    two-player poker games.
+
+    The histories that only differ by the hole cards dealt are merged into the nodes of a public tree, which is
+    traversed once per iteration with a vector of reach probabilities over the private hands of each player. The values
+    of a public terminal node are the products of its payoff matrices, weighted by the chances of the pairs of hands,
+    with the reach vectors of the opponents. The results match those of CFRSolver. Pruning is not supported. The dtypes
+    of the store are given as in CFRSolver.
+
+    The payoffs of the terminal nodes after folds do not depend on the hands, so such public terminal nodes, reached
+    with the same chance by every pair of hands that share no card, are represented by a payoff per player and the
+    hands of each player that reach them. Their values are the sums of the reach probabilities of the opponent hands
+    that share no card with each hand, computed by inclusion-exclusion over the subsets of the cards of the hand, in
+    time and memory linear in the number of hands instead of quadratic.
+    """
+
+    TERMINAL = 0
+    CHANCE = 1
+    PLAYER = 2
+    FOLD = 3
+
+    def __init__(self, game, dtype=float, accumulator_dtype=None):
+        super().__init__(game, dtype, accumulator_dtype)
+
+        if game.player_count != 2:
+            raise ValueError('Public trees are only supported for two-player games')
+
+        self._hands = ()
+        self._types = []
+        self._children = []
+        self._player_indices = []
+        self._slots = []
+        self._member_counts = []
+        self._matrices = []
+        self._subsets = ()
+        self._subset_count = 0
+
+        self._create_public_tree()
+
+    @property
+    def hands(self):
+        return self._hands
+
+    @property
+    def public_node_count(self):
+        return len(self._types)
+
+    def set_pruning(self, threshold=None, interval=10):
+        if threshold is not None:
+            raise ValueError(f'{type(self).__name__} does not support pruning')
+
+        super().set_pruning(threshold, interval)
+
+    def _create_public_tree(self):
+        hand_indices = {}, {}
+        public_nodes = {}
+        paths = [(self.game.root, (), ('', ''), 1)]
+
+        while paths:
+            node, key, hands, chance = paths.pop()
+            hole_deals = tuple(map(PokerTreeFactory.get_hole_deal, node.labels)) if node.is_chance_node() else ()
+
+            if hole_deals and all(hole_deal is not None for hole_deal in hole_deals):
+                for action, (player_index, cards) in zip(node.actions, hole_deals):
+                    child_hands = tuple(hand + cards if i == player_index else hand for i, hand in enumerate(hands))
+
+                    paths.append((action.child, key + ((player_index,),), child_hands, chance * action.chance))
+
+                continue
+
+            if key not in public_nodes:
+                public_nodes[key] = {'node': node, 'child_keys': {}, 'terminals': [], 'members': {}}
+
+            public_node = public_nodes[key]
+            hand_pair = tuple(hand_indices[i].setdefault(hand, len(hand_indices[i])) for i, hand in enumerate(hands))
+
+            if node.is_terminal_node():
+                public_node['terminals'].append((hand_pair, chance, node.payoffs))
+            elif node.is_player_node():
+                hand = hand_pair[node.player_index]
+                public_node['members'][hand] = node, public_node['members'].get(hand, (None, 0))[1] + 1
+
+            for action in node.actions:
+                child_key = key + (action.label,)
+                public_node['child_keys'][child_key] = None
+
+                child_chance = chance * action.chance if node.is_chance_node() else chance
+
+                paths.append((action.child, child_key, hands, child_chance))
+
+        self._hands = tuple(map(tuple, hand_indices))
+        hand_counts = tuple(map(len, self._hands))
+        indices = {key: i for i, key in enumerate(public_nodes)}
+
+        self._create_subsets()
+
+        for public_node in public_nodes.values():
+            node = public_node['node']
+            fold = self._get_fold(public_node['terminals']) if node.is_terminal_node() else None
+
+            self._children.append([indices[child_key] for child_key in public_node['child_keys']])
+
+            if fold is not None:
+                self._types.append(self.FOLD)
+                self._player_indices.append(-1)
+                self._slots.append(None)
+                self._member_counts.append(None)
+                self._matrices.append(fold)
+            elif node.is_terminal_node():
+                matrices = np.zeros((2,) + hand_counts)
+
+                for hand_pair, chance, payoffs in public_node['terminals']:
+                    matrices[(slice(None),) + hand_pair] += chance * payoffs
+
+                self._types.append(self.TERMINAL)
+                self._player_indices.append(-1)
+                self._slots.append(None)
+                self._member_counts.append(None)
+                self._matrices.append((matrices[0], matrices[1].T))
+            elif node.is_chance_node():
+                self._types.append(self.CHANCE)
+                self._player_indices.append(-1)
+                self._slots.append(None)
+                self._member_counts.append(None)
+                self._matrices.append(None)
+            else:
+                slots = np.full((hand_counts[node.player_index], node.action_count), -1, np.int64)
+                member_counts = np.zeros(hand_counts[node.player_index])
+
+                for hand, (member, member_count) in public_node['members'].items():
+                    index = self._get_index(member)
+                    slots[hand] = self.data.offsets[index] + np.arange(node.action_count)
+                    member_counts[hand] = member_count
+
+                self._types.append(self.PLAYER)
+                self._player_indices.append(node.player_index)
+                self._slots.append(slots)
+                self._member_counts.append(member_counts)
+                self._matrices.append(None)
+
+    def _create_subsets(self):
+        subset_indices = {}
+        subsets = []
+
+        for hands in self.hands:
+            hand_subsets = []
+
+            for cards in map(self._get_cards, hands):
+                hand_subsets.append([subset for i in range(len(cards) + 1) for subset in combinations(cards, i)])
+
+            indices = np.zeros((len(hands), max(map(len, hand_subsets), default=1)), np.int64)
+            signs = np.zeros(indices.shape)
+
+            for i, cards_subsets in enumerate(hand_subsets):
+                for j, subset in enumerate(cards_subsets):
+                    indices[i, j] = subset_indices.setdefault(frozenset(subset), len(subset_indices))
+                    signs[i, j] = (-1) ** len(subset)
+
+            subsets.append((indices, signs))
+
+        self._subsets = tuple(subsets)
+        self._subset_count = len(subset_indices)
+
+    def _get_fold(self, terminals):
+        """Return the payoffs, weighted by the chance, and the masks of the hands of the terminal nodes if they are
+        reached with the same chance and payoffs by every pair of hands that share no card and reach the public node,
+        or None otherwise.
+        """
+        hand_pairs = [hand_pair for hand_pair, _, _ in terminals]
+        chances = np.array([chance for _, chance, _ in terminals])
+        payoffs = np.array([payoffs for _, _, payoffs in terminals])
+
+        if not np.allclose(chances, chances[0]) or not np.allclose(payoffs, payoffs[0]):
+            return None
+        elif len(set(hand_pairs)) != len(hand_pairs):
+            return None
+
+        for hand_pair in hand_pairs:
+            cards = tuple(self._get_cards(self.hands[i][hand]) for i, hand in enumerate(hand_pair))
+
+            if not set(cards[0]).isdisjoint(cards[1]):
+                return None
+
+        masks = np.zeros(len(self.hands[0])), np.zeros(len(self.hands[1]))
+
+        for hand_pair in hand_pairs:
+            masks[0][hand_pair[0]] = masks[1][hand_pair[1]] = 1
+
+        if round(self._get_compatible_reaches(1, masks[1]) @ masks[0]) != len(hand_pairs):
+            return None
+
+        return chances[0] * payoffs[0], masks
+
+    def _get_compatible_reaches(self, player_index, reaches):
+        """Return the sums of the reach probabilities of the hands of the player that share no card with each hand of
+        the opponent.
+        """
+        indices, signs = self._subsets[player_index]
+        sums = np.bincount(indices.ravel(), (reaches[:, None] * (signs != 0)).ravel(), self._subset_count)
+        other_indices, other_signs = self._subsets[1 - player_index]
+
+        return (other_signs * sums[other_indices]).sum(1)
+
+    @staticmethod
+    def _get_cards(hand):
+        return tuple(hand[i:i + 2] for i in range(0, len(hand), 2))
+
+    def _iterate(self):
+        values = self._traverse_public(0, tuple(np.ones(len(hands)) for hands in self.hands))
+
+        return np.array([player_values.sum() for player_values in values])
+
+    def _iterate_with_node_count(self):
+        return self._iterate(), self.public_node_count
+
+    def _traverse_public(self, i, reaches):
+        """Return the counterfactual values of each hand of each player at the public node, traversing its subtree with
+        an explicit stack of frames.
+        """
+        frames = []
+
+        while True:
+            node_type = self._types[i]
+
+            if node_type == self.TERMINAL:
+                matrix, transposed_matrix = self._matrices[i]
+                values = [matrix @ reaches[1], transposed_matrix @ reaches[0]]
+            elif node_type == self.FOLD:
+                payoffs, masks = self._matrices[i]
+                values = [
+                    payoffs[0] * masks[0] * self._get_compatible_reaches(1, masks[1] * reaches[1]),
+                    payoffs[1] * masks[1] * self._get_compatible_reaches(0, masks[0] * reaches[0]),
+                ]
+            elif node_type == self.CHANCE:
+                frames.append(_PublicFrame(i, reaches, None, [np.zeros(reaches[0].size), np.zeros(reaches[1].size)]))
+
+                values = None
+            else:
+                slots = self._slots[i]
+                valid = slots[:, 0] >= 0
+                strategy = np.where(valid[:, None], self.data.strategies[slots], 1 / slots.shape[1])
+                other_values = np.zeros(reaches[1 - self._player_indices[i]].size)
+
+                frames.append(_PublicFrame(i, reaches, strategy, [np.zeros(slots.shape), other_values]))
+
+                values = None
+
+            while values is not None and frames:
+                frame = frames[-1]
+
+                if frame.strategy is None:
+                    frame.values[0] += values[0]
+                    frame.values[1] += values[1]
+                else:
+                    player_index = self._player_indices[frame.index]
+                    frame.values[0][:, frame.child_index] = values[player_index]
+                    frame.values[1] += values[1 - player_index]
+
+                frame.child_index += 1
+
+                if frame.child_index < len(self._children[frame.index]):
+                    values = None
+                else:
+                    frames.pop()
+
+                    values = frame.values if frame.strategy is None else self._solve_public(frame)
+
+            if values is not None:
+                return values
+
+            frame = frames[-1]
+            i = self._children[frame.index][frame.child_index]
+            reaches = frame.reaches
+
+            if frame.strategy is not None:
+                player_index = self._player_indices[frame.index]
+                reaches = list(reaches)
+                reaches[player_index] = frame.reaches[player_index] * frame.strategy[:, frame.child_index]
+
+    def _solve_public(self, frame):
+        player_index = self._player_indices[frame.index]
+        slots = self._slots[frame.index]
+        valid = slots[:, 0] >= 0
+        own_values, other_values = frame.values
+
+        np.add.at(
+            self.data.weights,
+            self.data.segments[slots[valid, 0]],
+            (frame.reaches[player_index] * self._member_counts[frame.index])[valid],
+        )
+        np.add.at(self.data.counterfactuals, slots[valid], own_values[valid])
+
+        values = [other_values, other_values]
+        values[player_index] = (frame.strategy * own_values).sum(1)
+
+        return values
+
+
+class _PublicFrame:
+    __slots__ = 'index', 'reaches', 'strategy', 'values', 'child_index'
+
+    def __init__(self, index, reaches, strategy, values):
+        self.index = index
+        self.reaches = reaches
+        self.strategy = strategy
+        self.values = values
+        self.child_index = 0
@@ -0,0 +1,174 @@
+import numpy as np
+
+from nashresolve.layouts import FlatTree
+
+
+class BestResponse:
+    """BestResponse is the class for exact best responses against the average strategies of tree solvers.
+
+    The average strategy of each info set is queried once, reach probabilities are propagated once for all players,
+    and each player's best response value is computed in a single bottom-up pass in which an action is chosen per info
+    set by summing the counterfactual values of its member nodes.
+    """
+
+    def __init__(self, solver, tree=None):
+        self.__solver = solver
+        self.__tree = tree = FlatTree.from_game(solver.game) if tree is None else tree
+
+        probabilities = tree.chances.astype(float)
+        player_edges = np.flatnonzero(tree.slots >= 0)
+        probabilities[player_edges] = self._get_strategies()[tree.slots[player_edges]]
+        other_reaches = tree.get_reaches(probabilities)[1]
+
+        self.__expected_values = tree.get_values(probabilities)[0]
+        self.__actions = np.full(tree.info_set_count, -1, np.int64)
+        self.__values = np.array([
+            self._get_best_response_value(player_index, probabilities, other_reaches[:, player_index])
+            for player_index in range(tree.player_count)
+        ])
+
+    @property
+    def solver(self):
+        return self.__solver
+
+    @property
+    def tree(self):
+        return self.__tree
+
+    @property
+    def values(self):
+        return self.__values
+
+    @property
+    def expected_values(self):
+        return self.__expected_values
+
+    @property
+    def actions(self):
+        return self.__actions
+
+    @property
+    def nash_conv(self):
+        return float((self.values - self.expected_values).sum())
+
+    @property
+    def exploitability(self):
+        return self.nash_conv / self.tree.player_count
+
+    def _get_strategies(self):
+        indices = dict(map(reversed, enumerate(self.tree.info_sets.tolist())))
+        strategies = [None] * self.tree.info_set_count
+
+        for node in self.solver.game.player_nodes:
+            index = indices[node.info_set]
+
+            if strategies[index] is None:
+                strategies[index] = self.solver.get_probabilities(node)
+
+        return np.concatenate([np.zeros(0)] + strategies)
+
+    def _get_best_response_value(self, player_index, probabilities, other_reaches):
+        """Return the best response value of the player, computed level by level from the terminal nodes up.
+
+        The levels are those of _get_levels, so the actions of the info sets of the player are chosen once the values
+        below all their members are known.
+        """
+        tree = self.tree
+        parents = tree.parents
+        children = tree.children
+        levels = self._get_levels(player_index)
+        responding = tree.player_indices == player_index
+        responding_edges = responding[parents]
+        info_set_ids = tree.info_set_ids
+        info_set_offsets = tree.info_set_offsets
+        slots = info_set_offsets[info_set_ids[parents]] + tree.action_indices
+        action_values = np.zeros(info_set_offsets[-1])
+        values = np.zeros(tree.node_count)
+        values[tree.terminal_node_indices] = tree.payoffs[:, player_index]
+
+        node_order = np.argsort(levels, kind='stable')
+        edge_order = np.argsort(levels[parents], kind='stable')
+        node_level_offsets = np.searchsorted(levels[node_order], np.arange(levels.max(initial=0) + 2))
+        edge_level_offsets = np.searchsorted(levels[parents][edge_order], np.arange(levels.max(initial=0) + 2))
+
+        for level in range(1, levels.max(initial=0) + 1):
+            nodes = node_order[node_level_offsets[level]:node_level_offsets[level + 1]]
+            edges = edge_order[edge_level_offsets[level]:edge_level_offsets[level + 1]]
+            other_edges = edges[~responding_edges[edges]]
+            own_edges = edges[responding_edges[edges]]
+
+            np.add.at(values, parents[other_edges], probabilities[other_edges] * values[children[other_edges]])
+            np.add.at(
+                action_values,
+                slots[own_edges],
+                other_reaches[parents[own_edges]] * values[children[own_edges]],
+            )
+
+            own_nodes = nodes[responding[nodes]]
+            own_info_set_ids = np.unique(info_set_ids[own_nodes])
+
+            if own_info_set_ids.size:
+                self.__actions[own_info_set_ids] = self._get_argmaxes(action_values, info_set_offsets, own_info_set_ids)
+                values[own_nodes] = values[children[tree.offsets[own_nodes] + self.__actions[info_set_ids[own_nodes]]]]
+
+        return values[0]
+
+    def _get_levels(self, player_index):
+        """Return the level of each node, above those of its children and equal for the members of each info set of
+        the player.
+
+        The levels start from the heights of the nodes and are raised until the members of each info set are in the
+        same level, which is immediate for games whose info sets have members of equal heights.
+        """
+        tree = self.tree
+        parents = tree.parents
+        children = tree.children
+        responding = np.flatnonzero(tree.player_indices == player_index)
+        info_set_ids = tree.info_set_ids[responding]
+        levels = self._get_heights()
+
+        for _ in range(tree.node_count + 1):
+            next_levels = np.zeros(tree.node_count, np.int64)
+            info_set_levels = np.zeros(tree.info_set_count, np.int64)
+
+            np.maximum.at(next_levels, parents, levels[children] + 1)
+            np.maximum.at(info_set_levels, info_set_ids, next_levels[responding])
+
+            next_levels[responding] = info_set_levels[info_set_ids]
+
+            if np.array_equal(next_levels, levels):
+                return levels
+
+            levels = next_levels
+
+        raise ValueError('The player is in an info set more than once along a history')
+
+    def _get_heights(self):
+        """Return the length of the longest path from each node to a terminal node."""
+        tree = self.tree
+        level_offsets = tree.level_offsets
+        heights = np.zeros(tree.node_count, np.int64)
+
+        for start, stop in zip(level_offsets[-2::-1], level_offsets[:0:-1]):
+            nodes = start + np.flatnonzero(tree.action_counts[start:stop])
+
+            if nodes.size:
+                edges = slice(tree.offsets[start], tree.offsets[stop])
+                heights[nodes] = np.maximum.reduceat(
+                    heights[tree.children[edges]], tree.offsets[nodes] - tree.offsets[start],
+                ) + 1
+
+        return heights
+
+    @staticmethod
+    def _get_argmaxes(action_values, info_set_offsets, info_set_ids):
+        """Return the first action of the largest value of each info set."""
+        starts = info_set_offsets[info_set_ids]
+        action_counts = info_set_offsets[info_set_ids + 1] - starts
+        segment_offsets = np.cumsum(action_counts) - action_counts
+        slots = np.repeat(starts - segment_offsets, action_counts) + np.arange(action_counts.sum())
+        values = action_values[slots]
+        maxima = np.maximum.reduceat(values, segment_offsets)
+        indices = np.where(values == np.repeat(maxima, action_counts), np.arange(values.size), values.size)
+
+        return np.minimum.reduceat(indices, segment_offsets) - segment_offsets
@@ -0,0 +1,221 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event, Lock, Thread
+from time import perf_counter
+
+
+class SolveRunner:
+    """SolveRunner is the class for background drivers of tree solvers.
+
+    The solver is stepped on a worker thread until the time budget, the maximum iteration count or the target
+    exploitability is reached, whichever comes first, or until the runner is stopped. The exploitability is measured
+    every exploitability_interval iterations if a target is given, and recorded by the instrument if any, along with
+    the iteration count and the elapsed time. If a checkpointer is given, the state of the solver is captured every
+    checkpoint_interval seconds and written on another thread while the solver keeps solving, and once more when the
+    solving ends.
+
+    The steps and the snapshots are serialized by a lock, so the policies returned while solving are consistent with
+    the iteration count they are returned with.
+    """
+
+    def __init__(
+            self,
+            solver,
+            time_budget=None,
+            max_iteration_count=None,
+            target_exploitability=None,
+            exploitability_interval=100,
+            checkpointer=None,
+            checkpoint_interval=None,
+            instrument=None,
+    ):
+        if exploitability_interval < 1:
+            raise ValueError('The exploitability interval must be positive')
+
+        self.__solver = solver
+        self.__time_budget = time_budget
+        self.__max_iteration_count = max_iteration_count
+        self.__target_exploitability = target_exploitability
+        self.__exploitability_interval = exploitability_interval
+        self.__checkpointer = checkpointer
+        self.__checkpoint_interval = checkpoint_interval
+        self.__instrument = instrument
+
+        self.__exploitability = None
+        self.__stop_reason = None
+        self.__start_time = None
+        self.__end_time = None
+        self.__lock = Lock()
+        self.__stop_event = Event()
+        self.__future = Future()
+        self.__worker = None
+        self.__writes = None
+
+    @property
+    def solver(self):
+        return self.__solver
+
+    @property
+    def time_budget(self):
+        return self.__time_budget
+
+    @property
+    def max_iteration_count(self):
+        return self.__max_iteration_count
+
+    @property
+    def target_exploitability(self):
+        return self.__target_exploitability
+
+    @property
+    def exploitability_interval(self):
+        return self.__exploitability_interval
+
+    @property
+    def checkpointer(self):
+        return self.__checkpointer
+
+    @property
+    def checkpoint_interval(self):
+        return self.__checkpoint_interval
+
+    @property
+    def instrument(self):
+        return self.__instrument
+
+    @property
+    def iteration_count(self):
+        return self.solver.iteration_count
+
+    @property
+    def exploitability(self):
+        """Return the last measured exploitability, if any."""
+        return self.__exploitability
+
+    @property
+    def stop_reason(self):
+        """Return 'time', 'iteration', 'exploitability' or 'stop' once the solving ends."""
+        return self.__stop_reason
+
+    @property
+    def elapsed_time(self):
+        if self.__start_time is None:
+            return 0
+        elif self.__end_time is None:
+            return perf_counter() - self.__start_time
+        else:
+            return self.__end_time - self.__start_time
+
+    def is_running(self):
+        return self.__worker is not None and not self.__future.done()
+
+    def is_done(self):
+        return self.__future.done()
+
+    def start(self):
+        """Start solving on a worker thread, returning this runner."""
+        if self.__worker is not None:
+            raise ValueError('The runner is already started')
+
+        self.__start_time = perf_counter()
+        self.__worker = Thread(target=self._run, name=f'{type(self).__name__}-worker', daemon=True)
+        self.__worker.start()
+
+        return self
+
+    def stop(self):
+        """Ask the worker to stop after the current step."""
+        self.__stop_event.set()
+
+    def join(self, timeout=None):
+        """Wait for the solving to end, returning the solver or raising the error the worker raised."""
+        return self.__future.result(timeout)
+
+    def run(self):
+        """Start solving and wait for it to end, returning the solver."""
+        return self.start().join()
+
+    async def wait(self):
+        """Wait for the solving to end without blocking the event loop, returning the solver."""
+        return await asyncio.wrap_future(self.__future)
+
+    def get_policy(self):
+        """Return the average strategy of the solver as a policy, along with the iteration count it is taken at."""
+        with self.__lock:
+            return self.solver.get_policy(), self.solver.iteration_count
+
+    async def get_policy_async(self):
+        """Return the same as get_policy, taking the snapshot on the default executor of the running event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_policy)
+
+    def get_exploitability(self):
+        """Measure the exploitability of the average strategy of the solver."""
+        with self.__lock:
+            return self.solver.get_exploitability()
+
+    def _run(self):
+        try:
+            self.__stop_reason = self._solve()
+            self.__end_time = perf_counter()
+
+            if self.checkpointer is not None:
+                if self.__writes is not None:
+                    self.__writes.result()
+
+                self.checkpointer.save(self.solver)
+        except BaseException as exception:
+            self.__end_time = perf_counter()
+            self.__future.set_exception(exception)
+        else:
+            self.__future.set_result(self.solver)
+
+    def _solve(self):
+        checkpoint_time = self.__start_time
+
+        with ThreadPoolExecutor(1, f'{type(self).__name__}-writer') as executor:
+            while True:
+                if self.__stop_event.is_set():
+                    return 'stop'
+                elif self.max_iteration_count is not None and self.iteration_count >= self.max_iteration_count:
+                    return 'iteration'
+                elif self.time_budget is not None and self.elapsed_time >= self.time_budget:
+                    return 'time'
+
+                with self.__lock:
+                    self.solver.step()
+
+                    if self._is_target_reached():
+                        return 'exploitability'
+
+                    if self._is_checkpoint_due(checkpoint_time):
+                        checkpoint_time = perf_counter()
+                        self.__writes = executor.submit(self.checkpointer.write, self.checkpointer.capture(self.solver))
+
+    def _is_target_reached(self):
+        if self.target_exploitability is None or self.iteration_count % self.exploitability_interval:
+            return False
+
+        self.__exploitability = self.solver.get_exploitability()
+
+        if self.instrument is not None:
+            self.instrument.record({
+                'iteration_count': self.iteration_count,
+                'elapsed_time': self.elapsed_time,
+                'exploitability': self.__exploitability,
+            })
+
+        return self.__exploitability <= self.target_exploitability
+
+    def _is_checkpoint_due(self, checkpoint_time):
+        if self.checkpointer is None or self.checkpoint_interval is None:
+            return False
+        elif perf_counter() - checkpoint_time < self.checkpoint_interval:
+            return False
+        elif self.__writes is None:
+            return True
+        elif self.__writes.done():
+            self.__writes.result()
+
+            return True
+        else:
+            return False
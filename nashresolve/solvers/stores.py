@@ -0,0 +1,320 @@
+import numpy as np
+
+
+class RegretStore:
+    """RegretStore is the class for contiguous regret and strategy storages of info sets.
+
+    Each info set is mapped to an index and to a contiguous range of action slots. Per-slot values (regrets, strategy
+    sums, counterfactuals and current strategies) and per-info-set values (weights and weight sums) are kept in a few
+    large arrays which are collected and cleared as a whole. The values are stored with the given dtype, such as
+    np.float32 to halve the memory of large games, except for the strategy sums and weight sums, which are stored with
+    the accumulator dtype if given, as they grow with the iterations and lose the most precision.
+    """
+
+    def __init__(self, dtype=float, accumulator_dtype=None):
+        if accumulator_dtype is None:
+            accumulator_dtype = dtype
+
+        self._indices = {}
+        self._info_set_count = 0
+        self._slot_count = 0
+
+        self._player_indices = np.zeros(0, np.int32)
+        self._offsets = np.zeros(1, np.int64)
+        self._action_counts = np.zeros(0, np.int64)
+        self._weights = np.zeros(0, dtype)
+        self._weight_sums = np.zeros(0, accumulator_dtype)
+
+        self._segments = np.zeros(0, np.int64)
+        self._regrets = np.zeros(0, dtype)
+        self._strategy_sums = np.zeros(0, accumulator_dtype)
+        self._counterfactuals = np.zeros(0, dtype)
+        self._strategies = np.zeros(0, dtype)
+
+    @property
+    def dtype(self):
+        return self._regrets.dtype
+
+    @property
+    def accumulator_dtype(self):
+        return self._strategy_sums.dtype
+
+    @property
+    def indices(self):
+        return self._indices
+
+    @property
+    def info_set_count(self):
+        return self._info_set_count
+
+    @property
+    def slot_count(self):
+        return self._slot_count
+
+    @property
+    def player_indices(self):
+        return self._player_indices[:self._info_set_count]
+
+    @property
+    def offsets(self):
+        return self._offsets[:self._info_set_count + 1]
+
+    @property
+    def action_counts(self):
+        return self._action_counts[:self._info_set_count]
+
+    @property
+    def weights(self):
+        return self._weights[:self._info_set_count]
+
+    @property
+    def weight_sums(self):
+        return self._weight_sums[:self._info_set_count]
+
+    @property
+    def segments(self):
+        return self._segments[:self._slot_count]
+
+    @property
+    def regrets(self):
+        return self._regrets[:self._slot_count]
+
+    @property
+    def strategy_sums(self):
+        return self._strategy_sums[:self._slot_count]
+
+    @property
+    def counterfactuals(self):
+        return self._counterfactuals[:self._slot_count]
+
+    @property
+    def strategies(self):
+        return self._strategies[:self._slot_count]
+
+    @property
+    def arrays(self):
+        return {
+            'info_sets': np.array(tuple(self.indices)),
+            'player_indices': self.player_indices,
+            'offsets': self.offsets,
+            'action_counts': self.action_counts,
+            'segments': self.segments,
+            'regrets': self.regrets,
+            'strategy_sums': self.strategy_sums,
+            'weight_sums': self.weight_sums,
+            'strategies': self.strategies,
+        }
+
+    @property
+    def default_strategies(self):
+        return 1 / self.action_counts[self.segments]
+
+    @property
+    def average_strategies(self):
+        weight_sums = self.weight_sums[self.segments]
+
+        return np.where(
+            weight_sums > 0, self.strategy_sums / np.where(weight_sums > 0, weight_sums, 1), self.default_strategies,
+        )
+
+    def get_index(self, node):
+        if node.info_set not in self._indices:
+            self.extend((node.info_set,), (node.player_index,), (node.action_count,))
+
+        return self._indices[node.info_set]
+
+    def get_slots(self, index):
+        return slice(self._offsets[index], self._offsets[index + 1])
+
+    def get_strategy(self, index):
+        return self._strategies[self.get_slots(index)]
+
+    def get_average_strategy(self, index):
+        weight_sum = self._weight_sums[index]
+        slots = self.get_slots(index)
+
+        if weight_sum:
+            return self._strategy_sums[slots] / weight_sum
+        else:
+            return np.full(slots.stop - slots.start, 1 / (slots.stop - slots.start))
+
+    def get_probabilities(self, node):
+        if node.is_terminal_node():
+            return np.empty(0)
+        elif node.is_chance_node():
+            return node.chances
+        elif node.is_player_node():
+            return self.get_average_strategy(self.get_index(node))
+        else:
+            raise ValueError('Unknown node type')
+
+    def extend(self, info_sets, player_indices, action_counts):
+        action_counts = np.asarray(action_counts, np.int64)
+        info_set_count = self._info_set_count + action_counts.size
+        slot_count = self._slot_count + int(action_counts.sum())
+
+        self._reserve(info_set_count, slot_count)
+
+        for info_set in info_sets:
+            self._indices[info_set] = len(self._indices)
+
+        indices = slice(self._info_set_count, info_set_count)
+        slots = slice(self._slot_count, slot_count)
+
+        self._player_indices[indices] = player_indices
+        self._action_counts[indices] = action_counts
+        self._offsets[indices.start + 1:indices.stop + 1] = self._slot_count + np.cumsum(action_counts)
+        self._segments[slots] = np.repeat(np.arange(indices.start, indices.stop), action_counts)
+        self._strategies[slots] = 1 / action_counts.repeat(action_counts)
+
+        self._info_set_count = info_set_count
+        self._slot_count = slot_count
+
+    def has_layout(self, arrays):
+        """Return whether the info sets are registered in the order, and with the action counts, of the given arrays."""
+        return (
+            np.array_equal(arrays['info_sets'], np.array(tuple(self.indices)))
+            and np.array_equal(arrays['action_counts'], self.action_counts)
+        )
+
+    def restore(self, arrays):
+        """Use the given arrays, as returned by the arrays property, as the storages of this store.
+
+        The arrays are used as is, so memory maps are only paged in when accessed.
+        """
+        info_sets = arrays['info_sets'].tolist()
+
+        self._indices = dict(zip(info_sets, range(len(info_sets))))
+        self._info_set_count = len(info_sets)
+        self._slot_count = arrays['segments'].size
+
+        self._player_indices = arrays['player_indices']
+        self._offsets = arrays['offsets']
+        self._action_counts = arrays['action_counts']
+        self._weights = np.zeros(self._info_set_count, arrays['regrets'].dtype)
+        self._weight_sums = arrays['weight_sums']
+
+        self._segments = arrays['segments']
+        self._regrets = arrays['regrets']
+        self._strategy_sums = arrays['strategy_sums']
+        self._counterfactuals = np.zeros(self._slot_count, arrays['regrets'].dtype)
+        self._strategies = arrays['strategies']
+
+    def load(self, arrays):
+        """Copy the values of the given arrays, as returned by the arrays property, into the registered info sets.
+
+        The info sets must be the same but may have been registered in another order. The dtypes of the arrays are
+        kept.
+        """
+        data = RegretStore()
+        data.restore(arrays)
+
+        if self.indices.keys() != data.indices.keys():
+            raise ValueError('The info sets do not match')
+
+        self._weights = self._weights.astype(data.dtype, copy=False)
+        self._weight_sums = self._weight_sums.astype(data.accumulator_dtype, copy=False)
+        self._regrets = self._regrets.astype(data.dtype, copy=False)
+        self._strategy_sums = self._strategy_sums.astype(data.accumulator_dtype, copy=False)
+        self._counterfactuals = self._counterfactuals.astype(data.dtype, copy=False)
+        self._strategies = self._strategies.astype(data.dtype, copy=False)
+
+        indices = np.fromiter(map(data.indices.__getitem__, self.indices), np.int64, self.info_set_count)
+        slots = np.repeat(data.offsets[indices] - self.offsets[:-1], self.action_counts) + np.arange(self.slot_count)
+
+        self.weight_sums[:] = data.weight_sums[indices]
+        self.regrets[:] = data.regrets[slots]
+        self.strategy_sums[:] = data.strategy_sums[slots]
+        self.strategies[:] = data.strategies[slots]
+
+    def warm_start(self, data, indices, source_indices, scale=1):
+        """Copy the regrets, strategy sums and weight sums of the source info sets of the other store into the info
+        sets, multiplied by the scale, and match the current strategies to the regrets.
+
+        The info sets must have the same action counts as their source info sets.
+        """
+        action_counts = self.action_counts[indices]
+        starts = np.cumsum(action_counts) - action_counts
+        slots = np.repeat(self.offsets[indices] - starts, action_counts) + np.arange(action_counts.sum())
+        source_slots = np.repeat(data.offsets[source_indices] - starts, action_counts) + np.arange(action_counts.sum())
+
+        self.weight_sums[indices] = scale * data.weight_sums[source_indices]
+        self.regrets[slots] = scale * data.regrets[source_slots]
+        self.strategy_sums[slots] = scale * data.strategy_sums[source_slots]
+
+        self.match_regrets()
+
+    def attach(self, strategies=None, weights=None, counterfactuals=None, regrets=None):
+        """Store the current strategies, weights, counterfactuals or the regrets in the given arrays from now on.
+
+        The arrays, typically views of shared memory, must be sized for the registered info sets and are used as is, so
+        no info set may be registered after attaching.
+        """
+        if strategies is not None:
+            self._strategies = strategies
+
+        if weights is not None:
+            self._weights = weights
+
+        if counterfactuals is not None:
+            self._counterfactuals = counterfactuals
+
+        if regrets is not None:
+            self._regrets = regrets
+
+    def update(self, index, weight, counterfactuals):
+        self._weights[index] += weight
+        self._counterfactuals[self.get_slots(index)] += counterfactuals
+
+    def collect(self):
+        segments = self.segments
+        strategies = self.strategies
+        counterfactuals = self.counterfactuals
+        expected_counterfactuals = np.bincount(segments, counterfactuals * strategies, self._info_set_count)
+
+        self.strategy_sums[:] += self.weights[segments] * strategies
+        self.weight_sums[:] += self.weights
+        self.regrets[:] += counterfactuals - expected_counterfactuals[segments]
+
+    def discount(self, positive_regret_multiplier, negative_regret_multiplier, strategy_multiplier):
+        regrets = self.regrets
+        regrets *= np.where(regrets > 0, positive_regret_multiplier, negative_regret_multiplier)
+
+        self.strategy_sums[:] *= strategy_multiplier
+        self.weight_sums[:] *= strategy_multiplier
+
+    def clear(self):
+        self.weights.fill(0)
+        self.counterfactuals.fill(0)
+
+    def match_regrets(self):
+        pos_regrets = self.regrets.clip(0)
+        sums = np.bincount(self.segments, pos_regrets, self._info_set_count)[self.segments]
+
+        self.strategies[:] = np.where(sums > 0, pos_regrets / np.where(sums > 0, sums, 1), self.default_strategies)
+
+    def _reserve(self, info_set_count, slot_count):
+        if info_set_count > self._weights.size:
+            capacity = max(info_set_count, 2 * self._weights.size)
+
+            self._player_indices = self._resize(self._player_indices, capacity)
+            self._offsets = self._resize(self._offsets, capacity + 1)
+            self._action_counts = self._resize(self._action_counts, capacity)
+            self._weights = self._resize(self._weights, capacity)
+            self._weight_sums = self._resize(self._weight_sums, capacity)
+
+        if slot_count > self._regrets.size:
+            capacity = max(slot_count, 2 * self._regrets.size)
+
+            self._segments = self._resize(self._segments, capacity)
+            self._regrets = self._resize(self._regrets, capacity)
+            self._strategy_sums = self._resize(self._strategy_sums, capacity)
+            self._counterfactuals = self._resize(self._counterfactuals, capacity)
+            self._strategies = self._resize(self._strategies, capacity)
+
+    @staticmethod
+    def _resize(array, capacity):
+        resized_array = np.zeros(capacity, array.dtype)
+        resized_array[:array.size] = array
+
+        return resized_array
@@ -0,0 +1,81 @@
+import numpy as np
+
+from nashresolve.layouts import FlatTree
+from nashresolve.solvers.cfr import CFRSolver
+
+
+class VectorizedCFRSolver(CFRSolver):
+    """VectorizedCFRSolver is the class for level-synchronous vanilla counterfactual regret minimization solvers.
+
+    Each iteration propagates reach probabilities down and counterfactual values up the depth levels of the flattened
+    tree with whole-array operations. The results match those of CFRSolver. Pruning is not supported.
+
+    The regrets and the strategies are stored with the given dtype and the strategy sums with the accumulator dtype, as
+    in CFRSolver, which is also the dtype of the reach probabilities and the values, while the tree keeps the dtype of
+    the game.
+    """
+
+    def __init__(self, game, dtype=float, accumulator_dtype=None):
+        super().__init__(game, dtype, accumulator_dtype)
+
+        self._tree = tree = FlatTree.from_game(game)
+        info_sets = tree.info_sets.tolist()
+        info_set_node_indices = tree.info_set_node_indices
+        unregistered_info_set_ids = [i for i, info_set in enumerate(info_sets) if info_set not in self.data.indices]
+
+        self.data.extend(
+            [info_sets[i] for i in unregistered_info_set_ids],
+            tree.player_indices[info_set_node_indices[unregistered_info_set_ids]],
+            tree.action_counts[info_set_node_indices[unregistered_info_set_ids]],
+        )
+
+        # Map the info sets and slots of the tree to those of the store
+
+        self._info_set_indices = np.fromiter(map(self.data.indices.__getitem__, info_sets), np.int64, len(info_sets))
+        self._player_node_indices = tree.player_node_indices
+        self._parents = tree.parents
+        self._actors = tree.actors
+        self._player_edges = player_edges = np.flatnonzero(self._actors >= 0)
+        self._slots = np.full(tree.edge_count, -1, np.int64)
+
+        self._slots[player_edges] = (
+            self.data.offsets[self._info_set_indices[tree.info_set_ids[self._parents[player_edges]]]]
+            + tree.action_indices[player_edges]
+        )
+
+    def set_pruning(self, threshold=None, interval=10):
+        if threshold is not None:
+            raise ValueError(f'{type(self).__name__} does not support pruning')
+
+        super().set_pruning(threshold, interval)
+
+    def _iterate(self):
+        tree = self._tree
+        probabilities = tree.chances.astype(self.data.dtype)
+        probabilities[self._player_edges] = self.data.strategies[self._slots[self._player_edges]]
+
+        own_reaches, other_reaches = tree.get_reaches(probabilities, self._actors)
+        values = tree.get_values(probabilities)
+
+        # Batched regret and strategy sum updates
+
+        player_edges = self._player_edges
+        actors = self._actors[player_edges]
+        parents = self._parents[player_edges]
+        player_node_indices = self._player_node_indices
+
+        self.data.counterfactuals[:] = np.bincount(
+            self._slots[player_edges],
+            other_reaches[parents, actors] * values[tree.children[player_edges], actors],
+            self.data.slot_count,
+        )
+        self.data.weights[:] = np.bincount(
+            self._info_set_indices[tree.info_set_ids[player_node_indices]],
+            own_reaches[player_node_indices, tree.player_indices[player_node_indices]],
+            self.data.info_set_count,
+        )
+
+        return values[0]
+
+    def _iterate_with_node_count(self):
+        return self._iterate(), self.tree.node_count
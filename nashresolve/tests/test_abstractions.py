@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+from unittest import TestCase, main
+
+from nashresolve import ActionAbstraction
+
+
+class ActionAbstractionTestCase(TestCase):
+    def create_player(self, board_card_count=0):
+        player = SimpleNamespace(bet=2, check_call_amount=2, bet_raise_min_amount=6, bet_raise_max_amount=100)
+        other = SimpleNamespace(bet=4)
+        player.game = SimpleNamespace(pot=10, board=[None] * board_card_count, players=(player, other))
+
+        return player
+
+    def test_bet_raise_amounts(self):
+        player = self.create_player()
+
+        self.assertSequenceEqual(ActionAbstraction((0.5, 1)).get_bet_raise_amounts(player), (13, 22, 100))
+        self.assertSequenceEqual(ActionAbstraction((0.1, 1), all_in=False).get_bet_raise_amounts(player), (6, 22))
+        self.assertSequenceEqual(
+            ActionAbstraction((0.5, 1, 4), all_in_threshold=0.2, all_in=False).get_bet_raise_amounts(player), (13, 100),
+        )
+
+    def test_streets(self):
+        abstraction = ActionAbstraction({0: (1,), 3: (0.5,), 5: (2,)}, 2)
+
+        self.assertSequenceEqual(abstraction.get_bet_fractions(0), (1,))
+        self.assertSequenceEqual(abstraction.get_bet_fractions(4), (0.5,))
+        self.assertSequenceEqual(abstraction.get_bet_fractions(5), (2,))
+        self.assertSequenceEqual(
+            abstraction.get_bet_raise_amounts(self.create_player(3)), (13, 100),
+        )
+        self.assertTrue(abstraction.can_bet_raise(1))
+        self.assertFalse(abstraction.can_bet_raise(2))
+        self.assertTrue(ActionAbstraction().can_bet_raise(100))
+        self.assertRaises(ValueError, ActionAbstraction, {3: (1,)})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import FlatTree, KuhnPokerTreeFactory, RockPaperScissorsTreeFactory
+from nashresolve.solvers import BatchedCFRSolver, CFRSolver
+
+
+class BatchedCFRSolverTestCase(TestCase):
+    def create_games(self, game, count):
+        tree = FlatTree.from_game(game)
+        random_state = np.random.RandomState(0)
+        games = []
+
+        for i in range(count):
+            chances = random_state.uniform(0.5, 1, tree.edge_count) * (tree.chances > 0)
+            sums = np.bincount(tree.parents, chances, tree.node_count)[tree.parents]
+            chances = np.where(sums > 0, chances / np.where(sums > 0, sums, 1), 0)
+            payoffs = tree.payoffs * random_state.uniform(0.5, 2, (tree.payoffs.shape[0], 1))
+
+            games.append(FlatTree(**{**tree.arrays, 'chances': chances, 'payoffs': payoffs}).to_game())
+
+        return games
+
+    def verify(self, game, iteration_count):
+        games = self.create_games(game, 4)
+        solvers = tuple(map(CFRSolver, games))
+        batched_solver = BatchedCFRSolver(games)
+
+        self.assertEqual(batched_solver.batch_size, 4)
+
+        for i in range(iteration_count):
+            np.testing.assert_allclose(
+                batched_solver.step(), np.array([solver.step() for solver in solvers]), atol=1e-9,
+            )
+
+        self.assertEqual(batched_solver.iteration_count, iteration_count)
+
+        for solver, policy in zip(solvers, batched_solver.get_policies()):
+            for node in solver.game.player_nodes:
+                np.testing.assert_allclose(
+                    policy.get_probabilities(solver.game.get_info_set_key(node.info_set)),
+                    solver.get_probabilities(node),
+                    atol=1e-9,
+                )
+
+    def test_rock_paper_scissors(self):
+        self.verify(RockPaperScissorsTreeFactory().build(), 100)
+
+    def test_kuhn(self):
+        self.verify(KuhnPokerTreeFactory().build(), 100)
+
+    def test_topologies(self):
+        games = KuhnPokerTreeFactory().build(), RockPaperScissorsTreeFactory().build()
+
+        self.assertRaises(ValueError, BatchedCFRSolver, games)
+        self.assertRaises(ValueError, BatchedCFRSolver, ())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import json
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve.benchmarks import compare, run
+
+
+class BenchmarkTestCase(TestCase):
+    def test_run(self):
+        results = run(('kuhn',), ('cfr', 'es-mccfr'), 0.1, 10)
+
+        self.assertEqual(json.loads(json.dumps(results)), results)
+        self.assertEqual(len(results['builds']), 1)
+        self.assertEqual(results['builds'][0]['node_count'], 58)
+        self.assertEqual(results['builds'][0]['info_set_count'], 12)
+        self.assertGreater(results['builds'][0]['peak_memory'], 0)
+        self.assertEqual(len(results['solves']), 2)
+
+        for solve in results['solves']:
+            self.assertLessEqual(solve['iteration_count'], 10)
+            self.assertEqual(solve['exploitabilities'][0]['iteration_count'], 1)
+            self.assertEqual(solve['exploitabilities'][-1]['iteration_count'], solve['iteration_count'])
+
+        results = run(('kuhn',), ('cfr', 'cfr-float32'), 0.1, 10, dtype=np.float32)
+
+        self.assertEqual(results['builds'][0]['dtype'], 'float32')
+        self.assertLess(results['solves'][1]['store_nbytes'], results['solves'][0]['store_nbytes'])
+
+        comparisons = compare(results, results)
+
+        self.assertTrue(comparisons)
+
+        for comparison in comparisons:
+            self.assertAlmostEqual(comparison['ratio'], 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import Checkpointer, FlatTree, KuhnPokerTreeFactory, RockPaperScissorsTreeFactory
+from nashresolve.checkpoints import dump, load
+from nashresolve.solvers import CFRSolver, DCFRSolver, ParallelCFRSolver, VectorizedCFRSolver
+
+
+class CheckpointTestCase(TestCase):
+    def test_arrays(self):
+        arrays = {
+            'floats': np.linspace(0, 1, 7),
+            'integers': np.arange(12, dtype=np.int32).reshape(3, 4),
+            'strings': np.array(('a', 'bc', 'def')),
+            'empty': np.zeros(0),
+        }
+
+        with TemporaryDirectory() as directory:
+            file_name = path.join(directory, 'arrays.nrc')
+
+            dump(file_name, arrays, {'key': 'value'})
+
+            for mmap_mode in ('r', None):
+                metadata, loaded_arrays = load(file_name, mmap_mode)
+
+                self.assertEqual(metadata, {'key': 'value'})
+                self.assertEqual(loaded_arrays.keys(), arrays.keys())
+
+                for name, array in arrays.items():
+                    self.assertEqual(loaded_arrays[name].dtype, array.dtype)
+                    np.testing.assert_array_equal(loaded_arrays[name], array)
+
+            self.assertRaises(ValueError, dump, file_name, {'objects': np.array((None,))})
+
+    def test_solvers(self):
+        game = KuhnPokerTreeFactory().build()
+
+        for solver_type in (CFRSolver, DCFRSolver, VectorizedCFRSolver):
+            solver = solver_type(game)
+
+            with TemporaryDirectory() as directory:
+                checkpointer = Checkpointer(directory)
+
+                self.assertFalse(checkpointer.exists())
+
+                for i in range(10):
+                    solver.step()
+
+                checkpointer.save(solver)
+
+                self.assertTrue(checkpointer.exists())
+                self.assertEqual(checkpointer.load_tree().node_count, 58)
+
+                restored_solver = checkpointer.load_solver(game)
+
+                self.assertIsInstance(restored_solver, solver_type)
+                self.assertIsInstance(restored_solver.data.regrets, np.memmap)
+                self.assertEqual(restored_solver.iteration_count, 10)
+
+                for i in range(10):
+                    np.testing.assert_allclose(solver.step(), restored_solver.step(), atol=1e-9)
+
+                checkpointer.save(restored_solver)
+                restored_solver = checkpointer.load_solver()
+
+                self.assertEqual(restored_solver.iteration_count, 20)
+                self.assertEqual(restored_solver.game.info_set_table.keys, game.info_set_table.keys)
+                np.testing.assert_array_equal(restored_solver.get_policy().info_sets, solver.get_policy().info_sets)
+
+                for node in restored_solver.game.player_nodes:
+                    np.testing.assert_allclose(
+                        solver.data.get_average_strategy(solver.data.indices[node.info_set]),
+                        restored_solver.get_probabilities(node),
+                        atol=1e-9,
+                    )
+
+    def test_dtype(self):
+        game = KuhnPokerTreeFactory().build()
+        solver = CFRSolver(game, np.float32, np.float64)
+        solver.step()
+
+        with TemporaryDirectory() as directory:
+            checkpointer = Checkpointer(directory)
+            checkpointer.save(solver)
+
+            for restored_solver in checkpointer.load_solver(), checkpointer.load_solver(game):
+                self.assertEqual(restored_solver.data.dtype, np.float32)
+                self.assertEqual(restored_solver.data.accumulator_dtype, np.float64)
+                np.testing.assert_array_equal(restored_solver.data.regrets, solver.data.regrets)
+
+    def test_parallel(self):
+        game = KuhnPokerTreeFactory().build()
+        solver = CFRSolver(game, np.float32)
+
+        for i in range(10):
+            solver.step()
+
+        with ParallelCFRSolver(game, 2, dtype=np.float32) as parallel_solver:
+            for i in range(10):
+                parallel_solver.step()
+
+            with TemporaryDirectory() as directory:
+                checkpointer = Checkpointer(directory)
+                checkpointer.save(parallel_solver)
+
+                with checkpointer.load_solver(game) as restored_solver:
+                    self.assertIsInstance(restored_solver, ParallelCFRSolver)
+                    self.assertEqual(restored_solver.data.dtype, np.float32)
+
+                    for i in range(20):
+                        np.testing.assert_allclose(solver.step(), restored_solver.step(), atol=1e-5)
+
+        np.testing.assert_allclose(solver.data.average_strategies, restored_solver.data.average_strategies, 0, 1e-5)
+
+    def test_games(self):
+        game = KuhnPokerTreeFactory().build()
+        other_game = RockPaperScissorsTreeFactory().build()
+
+        with TemporaryDirectory() as directory:
+            checkpointer = Checkpointer(directory)
+            checkpointer.save(CFRSolver(game))
+            checkpointer.save(CFRSolver(other_game))
+
+            self.assertEqual(checkpointer.load_tree().node_count, other_game.node_count)
+            self.assertEqual(checkpointer.load_solver().game.info_set_count, other_game.info_set_count)
+            self.assertRaises(ValueError, checkpointer.load_solver, game)
+
+        tree = FlatTree.from_game(game)
+        scaled_game = FlatTree(**{**tree.arrays, 'payoffs': 10 * tree.payoffs}).to_game()
+
+        with TemporaryDirectory() as directory:
+            checkpointer = Checkpointer(directory)
+            checkpointer.save(CFRSolver(game))
+            checkpointer.save(CFRSolver(scaled_game))
+
+            self.assertEqual(checkpointer.load_tree().payoffs.max(), 20)
+            self.assertEqual(max(node.payoffs.max() for node in checkpointer.load_solver().game.terminal_nodes), 20)
+            self.assertRaises(ValueError, checkpointer.load_solver, game)
+            self.assertIsInstance(checkpointer.load_solver(scaled_game), CFRSolver)
+
+    def test_order(self):
+        game = KuhnPokerTreeFactory().build()
+        solver = CFRSolver(game)
+
+        for i in range(10):
+            solver.step()
+
+        vectorized_solver = VectorizedCFRSolver(game)
+        vectorized_solver.restore(solver.data.arrays, solver.iteration_count)
+
+        for i in range(10):
+            np.testing.assert_allclose(solver.step(), vectorized_solver.step(), atol=1e-9)
+
+        for node in game.player_nodes:
+            np.testing.assert_allclose(
+                solver.get_probabilities(node), vectorized_solver.get_probabilities(node), atol=1e-9,
+            )
+
+
+if __name__ == '__main__':
+    main()
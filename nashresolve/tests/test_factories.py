@@ -1,8 +1,95 @@
+import sys
 from collections import defaultdict
+from copy import deepcopy
 from functools import partial
 from unittest import TestCase, main
 
-from nashresolve import KuhnPokerTreeFactory, RockPaperScissorsTreeFactory, TerminalNode, TicTacToeTreeFactory
+import numpy as np
+from pokerface import NoLimit
+
+from nashresolve import (
+    Action, ActionAbstraction, FlatTree, KuhnPokerTreeFactory, LeducPokerTreeFactory, RockPaperScissorsTreeFactory,
+    TerminalNode, TicTacToeTreeFactory, TreeFactory,
+)
+from nashresolve.solvers import CFRSolver, ESMCCFRSolver, OSMCCFRSolver, PublicTreeCFRSolver
+
+
+class ChainPlayer:
+    def __init__(self, game):
+        self.game = game
+        self.index = game.depth % 2
+
+    def is_nature(self):
+        return False
+
+    def is_player(self):
+        return True
+
+
+class ChainGame:
+    def __init__(self, depth=0, stopped=False):
+        self.depth = depth
+        self.stopped = stopped
+        self.players = None, None
+
+
+class ChainTreeFactory(TreeFactory):
+    def __init__(self, depth):
+        self.depth = depth
+
+    def _create_game(self):
+        return ChainGame()
+
+    def _create_actions(self, player):
+        game = player.game
+
+        yield Action(self._create_node(ChainGame(game.depth, True)), 'Stop')
+        yield Action(self._create_node(ChainGame(game.depth + 1)), 'Continue')
+
+    def _create_chance_actions(self, nature):
+        raise ValueError('The nature has no action in chain games')
+
+    def _get_actor(self, game):
+        return None if game.stopped or game.depth == self.depth else ChainPlayer(game)
+
+    def _get_payoffs(self, game):
+        if not game.stopped:
+            return 0, 0
+        elif game.depth % 2:
+            return 1, -1
+        else:
+            return -1, 1
+
+    def _get_info_set(self, player):
+        return player.game.depth
+
+
+def get_poker_states(factory, game):
+    """Yield the player nodes of the poker game built by the factory along with their states."""
+    nodes = [(game.root, factory._create_game())]
+
+    while nodes:
+        node, state = nodes.pop()
+
+        while state.stage is not None and state.stage.is_showdown_stage():
+            state.parse('s')
+
+        if node.is_player_node():
+            yield node, state
+
+        for label, child in zip(node.labels, node.children):
+            if label == 'Fold':
+                command = 'f'
+            elif label.startswith('Check/call'):
+                command = 'cc'
+            elif label.startswith('Bet/raise'):
+                command = f'br {label.split()[-1]}'
+            elif factory.get_hole_deal(label) is not None:
+                command = f'dh {factory.get_hole_deal(label)[1]}'
+            else:
+                command = f'db {label.split()[-1]}'
+
+            nodes.append((child, deepcopy(state).parse(command)))
 
 
 class FactoryTestCase(TestCase):
@@ -37,10 +124,11 @@ class FactoryTestCase(TestCase):
         game = TicTacToeTreeFactory().build()
 
         self.assertEqual(game.player_count, 2)
-        self.assertEqual(len(tuple(game.nodes)), 549946)
-        self.assertEqual(len(tuple(game.terminal_nodes)), 255168)
+        self.assertEqual(len(tuple(game.nodes)), 5478)
+        self.assertEqual(len(tuple(game.terminal_nodes)), 958)
         self.assertEqual(len(tuple(game.chance_nodes)), 0)
-        self.assertEqual(len(tuple(game.player_nodes)), 294778)
+        self.assertEqual(len(tuple(game.player_nodes)), 4520)
+        self.assertEqual(len(tuple(game.root.descendants)), 549946)
         self.assertEqual(len(set(game.info_sets)), 4520)
         self.assertTrue(game.is_zero_sum())
 
@@ -49,6 +137,11 @@ class FactoryTestCase(TestCase):
             {(0, 0), (-1, 1), (1, -1)},
         )
 
+        other_game = TicTacToeTreeFactory().build()
+
+        self.assertIsNot(game.root, other_game.root)
+        self.assertEqual(len(tuple(other_game.nodes)), 5478)
+
     def test_kuhn(self):
         game = KuhnPokerTreeFactory().build()
 
@@ -65,6 +158,197 @@ class FactoryTestCase(TestCase):
             {(-1, 1), (1, -1), (2, -2), (-2, 2)},
         )
 
+    def test_leduc(self):
+        factory = LeducPokerTreeFactory('JQ', starting_stacks=(5, 5))
+        game = factory.build()
+
+        self.assertEqual(game.player_count, 2)
+        self.assertEqual(len(factory.suit_permutations), 2)
+        self.assertSetEqual({len(node.chances) for node in game.chance_nodes}, {4, 3, 2})
+        self.assertIn((0, 0), set(map(tuple, map(TerminalNode.payoffs.fget, game.terminal_nodes))))
+        self.assertTrue(game.is_zero_sum())
+
+        for node, state in get_poker_states(factory, game):
+            self.assertEqual(game.get_info_set_key(node.info_set), factory.get_info_set(state))
+
+        self.assertRaises(ValueError, LeducPokerTreeFactory, round_count=0)
+        self.assertRaises(ValueError, LeducPokerTreeFactory, 'J', 's')
+
+    def test_info_set_table(self):
+        game = KuhnPokerTreeFactory().build()
+        table = game.info_set_table
+
+        self.assertEqual(len(table), 12)
+        self.assertSetEqual(set(game.info_sets), set(range(12)))
+
+        for node in game.player_nodes:
+            key = game.get_info_set_key(node.info_set)
+
+            self.assertIsInstance(key, str)
+            self.assertIn(key, table)
+            self.assertEqual(table.get_id(key), node.info_set)
+
+        self.assertRaises(ValueError, table.get_id, 'unknown')
+
+    def test_suit_isomorphism(self):
+        game = KuhnPokerTreeFactory().build()
+        factory = KuhnPokerTreeFactory(True)
+        isomorphic_game = factory.build()
+
+        self.assertTrue(factory.suit_isomorphism)
+        self.assertIn({suit: suit for suit in factory.suit_permutations[0]}, factory.suit_permutations)
+        self.assertEqual(len(tuple(isomorphic_game.nodes)), len(tuple(game.nodes)))
+        self.assertSetEqual(set(isomorphic_game.info_sets), set(game.info_sets))
+        self.assertAlmostEqual(sum(isomorphic_game.root.chances), 1)
+
+        factory = LeducPokerTreeFactory('JQ', starting_stacks=(5, 5))
+        isomorphic_factory = LeducPokerTreeFactory('JQ', starting_stacks=(5, 5), suit_isomorphism=True)
+        game = factory.build()
+        isomorphic_game = isomorphic_factory.build()
+
+        self.assertLess(isomorphic_game.node_count, game.node_count)
+        self.assertLess(isomorphic_game.info_set_count, game.info_set_count)
+        np.testing.assert_allclose(isomorphic_game.root.chances, (0.5, 0.5))
+
+        for node in isomorphic_game.chance_nodes:
+            self.assertAlmostEqual(sum(node.chances), 1)
+
+        solver = CFRSolver(game)
+        isomorphic_solver = CFRSolver(isomorphic_game)
+
+        for i in range(20):
+            solver.step()
+            isomorphic_solver.step()
+
+        policy = solver.get_policy()
+        isomorphic_policy = isomorphic_solver.get_policy()
+
+        for node, state in get_poker_states(factory, game):
+            np.testing.assert_allclose(
+                policy.get_probabilities(game.get_info_set_key(node.info_set)),
+                isomorphic_policy.get_probabilities(isomorphic_factory.get_info_set(state)),
+                atol=1e-9,
+            )
+
+    def test_action_abstraction(self):
+        game = KuhnPokerTreeFactory().build()
+        abstract_game = KuhnPokerTreeFactory(action_abstraction=ActionAbstraction((0.5, 1))).build()
+
+        self.assertEqual(abstract_game.node_count, game.node_count)
+        self.assertEqual(abstract_game.info_set_count, game.info_set_count)
+
+        factory = KuhnPokerTreeFactory(action_abstraction=ActionAbstraction(max_raise_count=0))
+        game = factory.build()
+
+        self.assertEqual(game.node_count, 22)
+        self.assertEqual(game.info_set_count, 6)
+        self.assertTrue(all('Bet/raise' not in label for node in game.nodes for label in node.labels))
+
+        factory = LeducPokerTreeFactory(
+            'JQ',
+            starting_stacks=(20, 20),
+            limit_type=NoLimit,
+            action_abstraction=ActionAbstraction((1, 2), max_raise_count=2),
+        )
+        game = factory.build()
+        nodes = [(game.root, 0, 0)]
+        bet_raise_counts = defaultdict(set)
+
+        while nodes:
+            node, street, raise_count = nodes.pop()
+            bet_raise_count = sum(label.startswith('Bet/raise') for label in node.labels)
+
+            if node.is_player_node():
+                bet_raise_counts[street, raise_count].add(bet_raise_count)
+
+            for label, child in zip(node.labels, node.children):
+                if label.startswith('Deal board'):
+                    nodes.append((child, street + 1, 0))
+                elif label.startswith('Bet/raise'):
+                    nodes.append((child, street, raise_count + 1))
+                else:
+                    nodes.append((child, street, raise_count))
+
+        self.assertSetEqual(set(bet_raise_counts), {(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2)})
+        self.assertEqual(max(bet_raise_counts[0, 0]), 3)
+        self.assertGreater(max(bet_raise_counts[1, 1]), 1)
+        self.assertSetEqual(bet_raise_counts[0, 2] | bet_raise_counts[1, 2], {0})
+        self.assertEqual(factory.build_lazily().node_count, game.node_count)
+
+    def test_dtype(self):
+        factory = KuhnPokerTreeFactory()
+
+        for game in factory.build(np.float32), factory.build_lazily(dtype=np.float32):
+            self.assertTrue(all(node.payoffs.dtype == np.float32 for node in game.terminal_nodes))
+            self.assertTrue(all(node.chances.dtype == np.float32 for node in game.chance_nodes))
+
+        game = factory.build()
+
+        self.assertEqual(game.root.chances.dtype, np.float64)
+        self.assertEqual(next(game.terminal_nodes).payoffs.dtype, np.float64)
+
+    def test_snapshots(self):
+        for factory_type, kwargs in (KuhnPokerTreeFactory, {}), (LeducPokerTreeFactory, {'starting_stacks': (5, 5)}):
+            class DeepCopyingTreeFactory(factory_type):
+                def _take_snapshot(self, game):
+                    return game
+
+            tree = FlatTree.from_game(factory_type(**kwargs).build())
+            deep_copied_tree = FlatTree.from_game(DeepCopyingTreeFactory(**kwargs).build())
+
+            for name, array in tree.arrays.items():
+                np.testing.assert_array_equal(array, deep_copied_tree.arrays[name], name)
+
+    def test_estimate_size(self):
+        for factory in (
+                KuhnPokerTreeFactory(),
+                KuhnPokerTreeFactory(action_abstraction=ActionAbstraction(max_raise_count=0)),
+                RockPaperScissorsTreeFactory(3),
+        ):
+            game = factory.build()
+            size = factory.estimate_size(100, 0)
+
+            self.assertAlmostEqual(size['node_count'], game.node_count, delta=0.05 * game.node_count)
+            self.assertAlmostEqual(size['info_set_count'], game.info_set_count, delta=0.05 * game.info_set_count)
+            self.assertAlmostEqual(size['edge_count'], size['node_count'] - 1)
+            self.assertAlmostEqual(
+                size['node_count'],
+                size['terminal_node_count'] + size['chance_node_count'] + size['player_node_count'],
+            )
+
+        factory = LeducPokerTreeFactory('JQ', starting_stacks=(5, 5))
+        game = factory.build()
+        size = factory.estimate_size(1000, 0)
+        node_count = len(tuple(factory.build_lazily(game.node_count).nodes))
+
+        self.assertAlmostEqual(size['node_count'], node_count, delta=0.05 * node_count)
+        self.assertGreater(size['info_set_count'], game.info_set_count)
+        self.assertLess(size['info_set_count'], size['player_node_count'])
+        self.assertEqual(TicTacToeTreeFactory().estimate_size(10, 0)['chance_node_count'], 0)
+
+    def test_deep_tree(self):
+        depth = 3 * sys.getrecursionlimit()
+        game = ChainTreeFactory(depth).build()
+
+        self.assertEqual(game.player_count, 2)
+        self.assertEqual(len(tuple(game.root.descendants)), 2 * depth + 1)
+        self.assertEqual(len(tuple(game.nodes)), 2 * depth + 1)
+        self.assertEqual(len(set(game.info_sets)), depth)
+
+        solver = CFRSolver(game)
+
+        for i in range(3):
+            solver.step()
+
+        self.assertAlmostEqual(sum(solver.get_expected_values(game.root)), 0)
+        self.assertGreaterEqual(solver.get_exploitability(), 0)
+        self.assertEqual(len(tuple(ChainTreeFactory(depth).build_lazily(16).nodes)), 2 * depth + 1)
+
+        for solver in ESMCCFRSolver(game, seed=0), OSMCCFRSolver(game, seed=0), PublicTreeCFRSolver(game):
+            solver.step()
+
+            self.assertGreaterEqual(solver.get_exploitability(), 0)
+
 
 if __name__ == '__main__':
     main()
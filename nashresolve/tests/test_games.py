@@ -0,0 +1,90 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import KuhnPokerTreeFactory, LazyTreeGame, RockPaperScissorsTreeFactory, TicTacToeTreeFactory
+from nashresolve.solvers import CFRSolver
+
+
+class TreeGameTestCase(TestCase):
+    def test_indexes(self):
+        for factory in KuhnPokerTreeFactory(), TicTacToeTreeFactory():
+            game = factory.build()
+
+            self.assertEqual(game.node_count, len(set(map(id, game.nodes))))
+            self.assertEqual(
+                game.node_count,
+                len(tuple(game.terminal_nodes)) + len(tuple(game.chance_nodes)) + len(tuple(game.player_nodes)),
+            )
+            self.assertEqual(game.info_set_count, len(set(game.info_sets)))
+            self.assertEqual(
+                sum(len(game.get_info_set_nodes(info_set)) for info_set in set(game.info_sets)),
+                len(tuple(game.player_nodes)),
+            )
+            self.assertRaises(ValueError, game.get_info_set_nodes, -1)
+
+            for info_set in set(game.info_sets):
+                for node in game.get_info_set_nodes(info_set):
+                    self.assertEqual(node.info_set, info_set)
+
+            self.assertEqual(game.get_depth(game.root), 0)
+            self.assertEqual(game.get_parents(game.root), ())
+
+            for node in game.nodes:
+                for child in node.children:
+                    self.assertTrue(any(parent is node for parent in game.get_parents(child)))
+                    self.assertLessEqual(game.get_depth(child), game.get_depth(node) + 1)
+
+                if node is not game.root:
+                    self.assertEqual(
+                        game.get_depth(node), min(map(game.get_depth, game.get_parents(node))) + 1,
+                    )
+
+            self.assertRaises(ValueError, game.get_depth, KuhnPokerTreeFactory().build().root)
+
+    def test_kuhn(self):
+        game = KuhnPokerTreeFactory().build()
+
+        self.assertEqual(game.node_count, 58)
+        self.assertEqual(game.info_set_count, 12)
+        self.assertEqual(max(map(game.get_depth, game.terminal_nodes)), 5)
+        self.assertTrue(game.is_zero_sum())
+
+
+class LazyTreeGameTestCase(TestCase):
+    def verify(self, factory, capacity):
+        game = factory.build()
+        lazy_game = factory.build_lazily(capacity)
+
+        self.assertIsInstance(lazy_game, LazyTreeGame)
+        self.assertEqual(lazy_game.player_count, game.player_count)
+        self.assertEqual(len(tuple(lazy_game.nodes)), len(tuple(game.root.descendants)))
+        self.assertSetEqual(set(lazy_game.info_sets), set(map(game.get_info_set_key, game.info_sets)))
+        self.assertLessEqual(lazy_game.root.cache.size, capacity)
+        self.assertEqual(lazy_game.info_set_count, game.info_set_count)
+        self.assertEqual(lazy_game.is_zero_sum(), game.is_zero_sum())
+        self.assertRaises(ValueError, lazy_game.get_depth, lazy_game.root)
+
+        solver = CFRSolver(game)
+        lazy_solver = CFRSolver(lazy_game)
+
+        for i in range(10):
+            np.testing.assert_allclose(solver.step(), lazy_solver.step())
+
+        self.assertLessEqual(lazy_game.root.cache.size, capacity)
+
+        policy = solver.get_policy()
+        lazy_policy = lazy_solver.get_policy()
+
+        for info_set in policy.info_sets.tolist():
+            np.testing.assert_allclose(policy.get_probabilities(info_set), lazy_policy.get_probabilities(info_set))
+
+    def test_rock_paper_scissors(self):
+        self.verify(RockPaperScissorsTreeFactory(3), 4)
+
+    def test_kuhn(self):
+        self.verify(KuhnPokerTreeFactory(), 8)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import json
+from io import StringIO
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import KuhnPokerTreeFactory
+from nashresolve.solvers import CFRSolver, ESMCCFRSolver, Instrument, JSONLinesWriter, VectorizedCFRSolver
+
+
+class InstrumentTestCase(TestCase):
+    def test_cfr(self):
+        game = KuhnPokerTreeFactory().build()
+        solver = CFRSolver(game)
+        instrumented_solver = CFRSolver(game)
+        file = StringIO()
+        instrument = Instrument((JSONLinesWriter(file),), True, 5)
+
+        instrumented_solver.add_instrument(instrument)
+
+        for i in range(10):
+            np.testing.assert_allclose(solver.step(), instrumented_solver.step())
+
+        self.assertEqual(len(instrument.records), 5)
+        self.assertEqual(list(map(json.loads, file.getvalue().splitlines()))[5:], list(instrument.records))
+
+        for i, metrics in enumerate(instrument.records, 6):
+            self.assertEqual(metrics['iteration_count'], i)
+            self.assertEqual(metrics['node_count'], 58)
+            self.assertLessEqual(metrics['info_set_count'], 12)
+            self.assertGreaterEqual(metrics['traversal_time'], 0)
+            self.assertGreaterEqual(metrics['collect_time'], 0)
+            self.assertIsNotNone(metrics['peak_memory'])
+
+        self.assertAlmostEqual(instrument.records[-1]['positive_regret_sum'], solver.data.regrets.clip(0).sum())
+
+        instrumented_solver.remove_instrument(instrument)
+        instrumented_solver.step()
+
+        self.assertEqual(len(instrument.records), 5)
+        self.assertFalse(instrumented_solver.instruments)
+
+    def test_node_counts(self):
+        game = KuhnPokerTreeFactory().build()
+
+        for solver, node_count in (VectorizedCFRSolver(game), 58), (ESMCCFRSolver(game, seed=0), None):
+            instrument = Instrument()
+            solver.add_instrument(instrument)
+            solver.step()
+
+            metrics, = instrument.records
+
+            self.assertIsNone(metrics['peak_memory'])
+
+            if node_count is None:
+                self.assertGreater(metrics['node_count'], 0)
+            else:
+                self.assertEqual(metrics['node_count'], node_count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import FlatTree, KuhnPokerTreeFactory, RockPaperScissorsTreeFactory, TicTacToeTreeFactory
+from nashresolve.layouts import get_object_nbytes
+
+
+class FlatTreeTestCase(TestCase):
+    def verify(self, game, node_count, edge_count, info_set_count):
+        tree = FlatTree.from_game(game)
+
+        self.assertEqual(tree.node_count, node_count)
+        self.assertEqual(tree.edge_count, edge_count)
+        self.assertEqual(tree.info_set_count, info_set_count)
+        self.assertEqual(tree.player_count, game.player_count)
+        self.assertEqual(tree.payoffs.shape[0], len(tuple(tree.terminal_node_indices)))
+        self.assertTrue((tree.depths[tree.children] > tree.depths[tree.parents]).all())
+        self.assertTrue((tree.action_counts[tree.terminal_node_indices] == 0).all())
+        self.assertTrue((tree.info_set_ids[tree.player_node_indices] >= 0).all())
+
+        for i in tree.chance_node_indices:
+            self.assertAlmostEqual(tree.chances[tree.offsets[i]:tree.offsets[i + 1]].sum(), 1)
+
+        self.assertLess(tree.nbytes, get_object_nbytes(game))
+
+        if game.info_set_table is not None:
+            self.assertEqual(tree.to_game().info_set_table.keys, game.info_set_table.keys)
+
+        other_tree = FlatTree.from_game(tree.to_game())
+
+        for name, array in tree.arrays.items():
+            np.testing.assert_array_equal(array, other_tree.arrays[name], name)
+
+        return tree
+
+    def test_rock_paper_scissors(self):
+        for player_count in range(2, 6):
+            node_count = sum(map(pow, (3,) * (player_count + 1), range(player_count + 1)))
+
+            self.verify(RockPaperScissorsTreeFactory(player_count).build(), node_count, node_count - 1, player_count)
+
+    def test_tic_tac_toe(self):
+        game = TicTacToeTreeFactory().build()
+        tree = self.verify(game, 5478, 16167, 4520)
+
+        self.assertEqual(len(tuple(tree.to_game().nodes)), len(tuple(game.nodes)))
+
+    def test_kuhn(self):
+        tree = self.verify(KuhnPokerTreeFactory().build(), 58, 57, 12)
+
+        self.assertEqual(tree.depth, 6)
+        self.assertEqual(len(tree.terminal_node_indices), 30)
+        self.assertEqual(len(tree.chance_node_indices), 4)
+        self.assertEqual(len(tree.player_node_indices), 24)
+
+    def test_dtype(self):
+        tree = FlatTree.from_game(KuhnPokerTreeFactory().build(np.float32))
+
+        self.assertEqual(tree.chances.dtype, np.float32)
+        self.assertEqual(tree.payoffs.dtype, np.float32)
+        self.assertEqual(FlatTree.from_game(tree.to_game()).chances.dtype, np.float32)
+        self.assertEqual(tree.get_values(tree.chances).dtype, np.float32)
+        self.assertEqual(FlatTree.from_game(KuhnPokerTreeFactory().build()).payoffs.dtype, np.float64)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import KuhnPokerTreeFactory, RockPaperScissorsTreeFactory
+from nashresolve.solvers import ESMCCFRSolver, OSMCCFRSolver
+
+
+class MCCFRSolverTestCase(TestCase):
+    KUHN_POKER_GAME = KuhnPokerTreeFactory().build()
+    ROCK_PAPER_SCISSORS_GAME = RockPaperScissorsTreeFactory().build()
+
+    def test_seed(self):
+        for solver_type in ESMCCFRSolver, OSMCCFRSolver:
+            solvers = solver_type(self.KUHN_POKER_GAME, 10, 0), solver_type(self.KUHN_POKER_GAME, 10, 0)
+
+            for i in range(10):
+                np.testing.assert_array_equal(solvers[0].step(), solvers[1].step())
+
+            for node in self.KUHN_POKER_GAME.player_nodes:
+                np.testing.assert_array_equal(solvers[0].get_probabilities(node), solvers[1].get_probabilities(node))
+
+    def test_kuhn_poker(self):
+        for solver_type in ESMCCFRSolver, OSMCCFRSolver:
+            solver = solver_type(self.KUHN_POKER_GAME, 100, 0)
+
+            for i in range(100):
+                solver.step()
+
+            self.assertLess(solver.get_exploitability(), 0.05)
+
+    def test_rock_paper_scissors(self):
+        for solver_type in ESMCCFRSolver, OSMCCFRSolver:
+            solver = solver_type(self.ROCK_PAPER_SCISSORS_GAME, 100, 0)
+
+            for i in range(100):
+                solver.step()
+
+            self.assertLess(solver.get_exploitability(), 0.1)
+
+    def test_dtype(self):
+        for solver_type in ESMCCFRSolver, OSMCCFRSolver:
+            solver = solver_type(self.KUHN_POKER_GAME, 100, 0, dtype=np.float32, accumulator_dtype=np.float64)
+
+            for i in range(100):
+                solver.step()
+
+            self.assertEqual(solver.data.regrets.dtype, np.float32)
+            self.assertEqual(solver.data.strategy_sums.dtype, np.float64)
+            self.assertLess(solver.get_exploitability(), 0.05)
+
+
+if __name__ == '__main__':
+    main()
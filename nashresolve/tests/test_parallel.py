@@ -0,0 +1,79 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import KuhnPokerTreeFactory, RockPaperScissorsTreeFactory
+from nashresolve.solvers import CFRSolver, Instrument, ParallelCFRSolver
+
+
+class ParallelCFRSolverTestCase(TestCase):
+    def verify(self, game, worker_count, chance_depth, iteration_count):
+        solver = CFRSolver(game)
+
+        with ParallelCFRSolver(game, worker_count, chance_depth) as parallel_solver:
+            for i in range(iteration_count):
+                np.testing.assert_allclose(solver.step(), parallel_solver.step(), atol=1e-9)
+
+        for node in game.player_nodes:
+            np.testing.assert_allclose(
+                solver.get_probabilities(node), parallel_solver.get_probabilities(node), atol=1e-9,
+            )
+
+    def test_rock_paper_scissors(self):
+        self.verify(RockPaperScissorsTreeFactory().build(), 2, 1, 10)
+
+    def test_kuhn(self):
+        game = KuhnPokerTreeFactory().build()
+
+        self.verify(game, 1, 1, 10)
+        self.verify(game, 2, 1, 10)
+        self.verify(game, 4, 2, 10)
+
+    def test_dtype(self):
+        game = KuhnPokerTreeFactory().build()
+        solver = CFRSolver(game, np.float32)
+
+        with ParallelCFRSolver(game, 2, dtype=np.float32) as parallel_solver:
+            for i in range(10):
+                np.testing.assert_allclose(solver.step(), parallel_solver.step(), atol=1e-5)
+
+            self.assertEqual(parallel_solver.data.strategies.dtype, np.float32)
+            self.assertEqual(parallel_solver.data.regrets.dtype, np.float32)
+
+        np.testing.assert_allclose(solver.data.average_strategies, parallel_solver.data.average_strategies, 0, 1e-5)
+
+    def test_state(self):
+        game = KuhnPokerTreeFactory().build()
+        solver = CFRSolver(game)
+        instrument = Instrument()
+        parallel_instrument = Instrument()
+
+        for i in range(5):
+            solver.step()
+
+        with ParallelCFRSolver(game, 2) as parallel_solver:
+            parallel_solver.restore(solver.data.arrays, solver.iteration_count)
+
+            for solver_ in solver, parallel_solver:
+                solver_.set_pruning(-1, 3)
+
+            solver.add_instrument(instrument)
+            parallel_solver.add_instrument(parallel_instrument)
+
+            for i in range(30):
+                np.testing.assert_allclose(solver.step(), parallel_solver.step(), atol=1e-9)
+
+        node_counts = [record['node_count'] for record in instrument.records]
+
+        self.assertEqual([record['node_count'] for record in parallel_instrument.records], node_counts)
+        self.assertEqual(max(node_counts), game.node_count)
+        self.assertLess(min(node_counts), game.node_count)
+
+        for node in game.player_nodes:
+            np.testing.assert_allclose(
+                solver.get_probabilities(node), parallel_solver.get_probabilities(node), atol=1e-9,
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import KuhnPokerTreeFactory, Policy
+from nashresolve.solvers import CFRSolver
+
+
+class PolicyTestCase(TestCase):
+    def test_kuhn(self):
+        game = KuhnPokerTreeFactory().build()
+        solver = CFRSolver(game)
+
+        for i in range(100):
+            solver.step()
+
+        policy = solver.get_policy()
+
+        self.assertEqual(len(policy), 12)
+
+        with TemporaryDirectory() as directory:
+            file_name = path.join(directory, 'policy.nrc')
+
+            policy.dump(file_name)
+
+            for policy in (policy, Policy.load(file_name)):
+                info_sets = []
+
+                for node in game.player_nodes:
+                    info_set = game.get_info_set_key(node.info_set)
+
+                    np.testing.assert_allclose(policy.get_probabilities(info_set), solver.get_probabilities(node))
+                    self.assertIn(info_set, policy)
+
+                    info_sets.append(info_set)
+
+                probabilities = policy.get_batch_probabilities(info_sets)
+
+                self.assertEqual(probabilities.shape, (len(info_sets), 2))
+                np.testing.assert_allclose(probabilities.sum(1), 1)
+                np.testing.assert_allclose(probabilities[0], solver.get_probabilities(next(game.player_nodes)))
+                self.assertNotIn('unknown', policy)
+                self.assertRaises(ValueError, policy.get_probabilities, 'unknown')
+
+
+if __name__ == '__main__':
+    main()
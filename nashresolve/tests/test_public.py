@@ -0,0 +1,60 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import KuhnPokerTreeFactory, LeducPokerTreeFactory, PokerTreeFactory, RockPaperScissorsTreeFactory
+from nashresolve.solvers import CFRSolver, PublicTreeCFRSolver
+
+
+class PublicTreeCFRSolverTestCase(TestCase):
+    def verify(self, game, iteration_count):
+        solver = CFRSolver(game)
+        public_solver = PublicTreeCFRSolver(game)
+
+        for i in range(iteration_count):
+            np.testing.assert_allclose(solver.step(), public_solver.step(), atol=1e-9)
+
+        for node in game.player_nodes:
+            np.testing.assert_allclose(solver.get_probabilities(node), public_solver.get_probabilities(node), atol=1e-9)
+
+        return public_solver
+
+    def test_kuhn(self):
+        public_solver = self.verify(KuhnPokerTreeFactory().build(), 100)
+
+        self.assertSetEqual(set(map(len, public_solver.hands)), {3})
+        self.assertEqual(public_solver.public_node_count, 9)
+
+        self.verify(KuhnPokerTreeFactory(True).build(), 100)
+
+    def test_leduc(self):
+        public_solver = self.verify(LeducPokerTreeFactory('JQ', starting_stacks=(5, 5)).build(), 50)
+
+        self.assertSetEqual(set(map(len, public_solver.hands)), {4})
+
+        self.verify(LeducPokerTreeFactory('JQK', round_count=3, starting_stacks=(5, 5)).build(), 10)
+        self.verify(LeducPokerTreeFactory('JQ', starting_stacks=(5, 5), suit_isomorphism=True).build(), 20)
+
+    def test_dtype(self):
+        game = KuhnPokerTreeFactory().build()
+        solver = CFRSolver(game, np.float32, np.float64)
+        public_solver = PublicTreeCFRSolver(game, np.float32, np.float64)
+
+        for i in range(100):
+            np.testing.assert_allclose(solver.step(), public_solver.step(), atol=1e-4)
+
+        self.assertEqual(public_solver.data.regrets.dtype, np.float32)
+        self.assertEqual(public_solver.data.strategy_sums.dtype, np.float64)
+        np.testing.assert_allclose(solver.data.average_strategies, public_solver.data.average_strategies, 0, 1e-4)
+
+    def test_hole_deals(self):
+        self.assertEqual(PokerTreeFactory.get_hole_deal('Deal 1 AsKh'), (1, 'AsKh'))
+        self.assertIsNone(PokerTreeFactory.get_hole_deal('Deal board 2c'))
+        self.assertIsNone(PokerTreeFactory.get_hole_deal('Check/call 0'))
+
+    def test_player_count(self):
+        self.assertRaises(ValueError, PublicTreeCFRSolver, RockPaperScissorsTreeFactory(3).build())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+from itertools import permutations
+from unittest import TestCase, main
+
+import numpy as np
+from pokerface import KuhnPoker
+
+from nashresolve import BlueprintEvaluator, KuhnPokerTreeFactory, SubgameResolver
+from nashresolve.solvers import DCFRSolver
+
+
+class SubgameResolverTestCase(TestCase):
+    def setUp(self):
+        self.factory = KuhnPokerTreeFactory()
+        self.game = self.factory.build()
+        solver = DCFRSolver(self.game)
+
+        for i in range(300):
+            solver.step()
+
+        self.blueprint = solver.get_policy()
+        self.expected_values = solver.get_expected_values(self.game.root)
+
+    def test_blueprint_evaluator(self):
+        evaluator = BlueprintEvaluator(self.factory, self.blueprint)
+
+        np.testing.assert_allclose(evaluator(self.factory._create_game()), self.expected_values)
+
+    def test_subgames(self):
+        states = (1, self.factory._create_game()),
+        game = self.factory.build_subgame(states)
+
+        self.assertEqual(game.node_count, self.game.node_count + 1)
+        self.assertEqual(game.info_set_count, self.game.info_set_count)
+
+        resolver = SubgameResolver(self.factory, 0, blueprint=self.blueprint)
+        game = resolver.build(states)
+
+        self.assertEqual(game.node_count, 2)
+        np.testing.assert_allclose(next(game.terminal_nodes).payoffs, self.expected_values)
+
+        self.assertRaises(ValueError, self.factory.build_subgame, ())
+        self.assertRaises(ValueError, self.factory.build_subgame, states, 1)
+        self.assertRaises(ValueError, SubgameResolver, self.factory, 1)
+
+    def test_resolve(self):
+        states = (1, self.factory._create_game()),
+        resolver = SubgameResolver(self.factory, 3, blueprint=self.blueprint)
+        solver = resolver.resolve(states, max_iteration_count=300)
+
+        self.assertEqual(solver.iteration_count, 300)
+        self.assertLess(solver.game.node_count, self.game.node_count)
+        np.testing.assert_allclose(solver.get_expected_values(solver.game.root), self.expected_values, atol=0.01)
+        self.assertLess(solver.get_exploitability(), 0.001)
+        self.assertEqual(resolver.resolve(states, 0).iteration_count, 1)
+
+    def test_public_state(self):
+        states = []
+
+        for cards in permutations(('Js', 'Qs', 'Ks'), 2):
+            state = KuhnPoker()
+
+            for card in cards:
+                state.parse(f'dh {card}')
+
+            probability = self.blueprint.get_probabilities(self.factory.get_info_set(state))[0] / 6
+            states.append((probability, state.parse('cc')))
+
+        total = sum(probability for probability, state in states)
+        states = tuple((probability / total, state) for probability, state in states)
+        evaluator = BlueprintEvaluator(self.factory, self.blueprint)
+        resolver = SubgameResolver(self.factory, 1, evaluator)
+        solver = resolver.resolve(states, max_iteration_count=300)
+
+        self.assertEqual(len(solver.game.root.chances), 6)
+        self.assertGreater(evaluator.size, 0)
+        np.testing.assert_allclose(
+            solver.get_expected_values(solver.game.root),
+            sum(probability * evaluator(state) for probability, state in states),
+            atol=0.05,
+        )
+
+        policy = solver.get_policy()
+
+        for probability, state in states:
+            key = self.factory.get_info_set(state)
+            probabilities = self.blueprint.get_probabilities(key)
+
+            if probabilities.max() > 0.95:
+                self.assertEqual(policy.get_probabilities(key).argmax(), probabilities.argmax())
+
+        size = evaluator.size
+        resolver.build(states)
+
+        self.assertEqual(evaluator.size, size)
+
+        evaluator = BlueprintEvaluator(self.factory, self.blueprint, 1)
+        SubgameResolver(self.factory, 1, evaluator).build(states)
+
+        self.assertEqual(evaluator.size, 1)
+
+
+if __name__ == '__main__':
+    main()
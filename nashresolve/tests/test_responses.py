@@ -0,0 +1,65 @@
+from unittest import TestCase, main
+
+from nashresolve import (
+    Action, ChanceAction, ChanceNode, KuhnPokerTreeFactory, PlayerNode, RockPaperScissorsTreeFactory, TerminalNode,
+    TreeGame,
+)
+from nashresolve.solvers import BestResponse, CFRPSolver, CFRSolver, DCFRSolver, VectorizedCFRSolver
+
+
+class BestResponseTestCase(TestCase):
+    KUHN_POKER_GAME = KuhnPokerTreeFactory().build()
+
+    def test_uniform(self):
+        best_response = BestResponse(CFRSolver(self.KUHN_POKER_GAME))
+
+        self.assertAlmostEqual(best_response.values[0], 1 / 2)
+        self.assertAlmostEqual(best_response.values[1], 5 / 12)
+        self.assertAlmostEqual(best_response.expected_values[0], 1 / 8)
+        self.assertAlmostEqual(best_response.nash_conv, 11 / 12)
+        self.assertAlmostEqual(best_response.exploitability, 11 / 24)
+        self.assertTrue((best_response.actions >= 0).all())
+
+        self.assertAlmostEqual(CFRSolver(RockPaperScissorsTreeFactory().build()).get_exploitability(), 0)
+
+    def test_info_set_depths(self):
+        shallow_node = PlayerNode(
+            0, 'x', (Action(TerminalNode((1, -1)), 'L'), Action(TerminalNode((0, 0)), 'R')),
+        )
+        deep_node = PlayerNode(
+            0, 'x', (Action(TerminalNode((-1, 1)), 'L'), Action(TerminalNode((2, -2)), 'R')),
+        )
+        game = TreeGame(
+            ChanceNode((
+                ChanceAction(0.5, shallow_node, 'A'),
+                ChanceAction(0.5, PlayerNode(1, 'y', (Action(deep_node, 'C'),)), 'B'),
+            )),
+        )
+        solver = CFRSolver(game)
+        best_response = solver.get_best_response()
+
+        self.assertIs(best_response.tree, solver.tree)
+        self.assertAlmostEqual(best_response.values[0], 1)
+        self.assertAlmostEqual(best_response.values[1], -1 / 2)
+        self.assertAlmostEqual(best_response.expected_values[0], 1 / 2)
+        self.assertAlmostEqual(best_response.nash_conv, 1 / 2)
+        self.assertEqual(best_response.actions[solver.tree.info_sets.tolist().index('x')], 1)
+
+    def test_convergence(self):
+        for solver_type in CFRSolver, CFRPSolver, DCFRSolver, VectorizedCFRSolver:
+            solver = solver_type(self.KUHN_POKER_GAME)
+            exploitabilities = []
+
+            for i in range(10):
+                for j in range(100):
+                    solver.step()
+
+                exploitabilities.append(solver.get_exploitability())
+
+            self.assertLess(exploitabilities[-1], 0.01)
+            self.assertLess(exploitabilities[-1], exploitabilities[0])
+            self.assertGreaterEqual(min(exploitabilities), 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import asyncio
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import Checkpointer, KuhnPokerTreeFactory
+from nashresolve.solvers import CFRSolver, Instrument, SolveRunner
+
+
+class SolveRunnerTestCase(TestCase):
+    GAME = KuhnPokerTreeFactory().build()
+
+    def test_targets(self):
+        runner = SolveRunner(CFRSolver(self.GAME), max_iteration_count=50)
+
+        self.assertIs(runner.run(), runner.solver)
+        self.assertEqual(runner.iteration_count, 50)
+        self.assertEqual(runner.stop_reason, 'iteration')
+        self.assertRaises(ValueError, runner.start)
+
+        instrument = Instrument()
+        runner = SolveRunner(
+            CFRSolver(self.GAME), target_exploitability=0.05, exploitability_interval=10, instrument=instrument,
+        )
+        runner.run()
+
+        self.assertEqual(runner.stop_reason, 'exploitability')
+        self.assertLessEqual(runner.exploitability, 0.05)
+        self.assertAlmostEqual(runner.exploitability, runner.solver.get_exploitability())
+        self.assertEqual(instrument.records[-1]['iteration_count'], runner.iteration_count)
+        self.assertEqual(len(instrument.records), runner.iteration_count // 10)
+
+        runner = SolveRunner(CFRSolver(self.GAME), time_budget=0.2)
+        runner.run()
+
+        self.assertEqual(runner.stop_reason, 'time')
+        self.assertGreaterEqual(runner.elapsed_time, 0.2)
+        self.assertGreater(runner.iteration_count, 0)
+
+        runner = SolveRunner(CFRSolver(self.GAME)).start()
+
+        self.assertTrue(runner.is_running())
+
+        policy, iteration_count = runner.get_policy()
+        runner.stop()
+        runner.join()
+
+        self.assertFalse(runner.is_running())
+        self.assertEqual(runner.stop_reason, 'stop')
+        self.assertGreaterEqual(runner.iteration_count, iteration_count)
+        self.assertEqual(policy.info_set_count, 12)
+
+    def test_checkpoints(self):
+        with TemporaryDirectory() as directory:
+            checkpointer = Checkpointer(directory)
+            runner = SolveRunner(
+                CFRSolver(self.GAME), max_iteration_count=300, checkpointer=checkpointer, checkpoint_interval=0,
+            )
+            solver = runner.run()
+            loaded_solver = checkpointer.load_solver()
+
+            self.assertEqual(loaded_solver.iteration_count, 300)
+            np.testing.assert_allclose(loaded_solver.data.average_strategies, solver.data.average_strategies)
+
+    def test_asyncio(self):
+        async def solve(runner):
+            runner.start()
+            policy, iteration_count = await runner.get_policy_async()
+
+            self.assertEqual(policy.info_set_count, 12)
+            self.assertLessEqual(iteration_count, 100)
+
+            return await runner.wait()
+
+        runner = SolveRunner(CFRSolver(self.GAME), max_iteration_count=100)
+
+        self.assertIs(asyncio.run(solve(runner)), runner.solver)
+        self.assertEqual(runner.iteration_count, 100)
+
+    def test_errors(self):
+        runner = SolveRunner(CFRSolver(self.GAME), max_iteration_count=1, checkpointer=Checkpointer('\0'))
+
+        self.assertRaises(ValueError, runner.run)
+        self.assertRaises(ValueError, SolveRunner, CFRSolver(self.GAME), exploitability_interval=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,12 @@
-from typing import cast
 from unittest import TestCase, main
 
-from nashresolve.contrib.poker import KuhnPokerTreeFactory
-from nashresolve.contrib.rockpaperscissors import RockPaperScissorsTreeFactory
-from nashresolve.contrib.tictactoe import TicTacToeTreeFactory
+import numpy as np
 
-from nashresolve.solvers import CFRPSolver, CFRSolver, DCFRSolver
-from nashresolve.trees import ChanceNode, PlayerNode, TerminalNode
+from nashresolve import KuhnPokerTreeFactory, LeducPokerTreeFactory, RockPaperScissorsTreeFactory, TicTacToeTreeFactory
+from nashresolve.solvers import (
+    CFRPSolver, CFRSolver, DCFRSolver, ESMCCFRSolver, Instrument, OSMCCFRSolver, PublicTreeCFRSolver,
+    VectorizedCFRSolver,
+)
 
 
 class TreeSolverTestCase(TestCase):
@@ -14,10 +14,10 @@ class TreeSolverTestCase(TestCase):
         self.verify_node(solver.game.root, solver)
 
     def verify_node(self, node, solver):
-        if isinstance(node, ChanceNode):
-            self.assertAlmostEqual(sum(node.probabilities), 1)
-        elif isinstance(node, PlayerNode):
-            self.assertAlmostEqual(sum(solver.query(node.info_set)), 1)
+        if node.is_chance_node():
+            self.assertAlmostEqual(sum(node.chances), 1)
+        elif node.is_player_node():
+            self.assertAlmostEqual(sum(solver.get_probabilities(node)), 1)
 
         for child in node.children:
             self.verify_node(child, solver)
@@ -49,32 +49,119 @@ class TreeSolverTestCase(TestCase):
 
         self.verify_kuhn_poker(solver, 3)
 
+    def test_kuhn_poker_cfr_float32(self):
+        solver = CFRSolver(self.KUHN_POKER_GAME)
+
+        for i in range(self.KUHN_POKER_ITER_COUNT):
+            solver.step()
+
+        for game, accumulator_dtype in (
+                (self.KUHN_POKER_GAME, None),
+                (KuhnPokerTreeFactory().build(np.float32), None),
+                (KuhnPokerTreeFactory().build(np.float32), np.float64),
+        ):
+            float32_solver = CFRSolver(game, np.float32, accumulator_dtype)
+
+            for i in range(self.KUHN_POKER_ITER_COUNT):
+                float32_solver.step()
+
+            self.assertEqual(float32_solver.data.regrets.dtype, np.float32)
+            self.assertAlmostEqual(float32_solver.get_exploitability(), solver.get_exploitability(), 5)
+            np.testing.assert_allclose(float32_solver.data.average_strategies, solver.data.average_strategies, 0, 1e-5)
+
+    def test_kuhn_poker_cfr_pruning(self):
+        solver = CFRSolver(self.KUHN_POKER_GAME)
+        solver.set_pruning(-10)
+        instrument = Instrument()
+        solver.add_instrument(instrument)
+
+        for i in range(self.KUHN_POKER_ITER_COUNT):
+            solver.step()
+
+        node_counts = [record['node_count'] for record in instrument.records]
+
+        self.verify_kuhn_poker(solver, 1)
+        self.assertLess(solver.get_exploitability(), 0.05)
+        self.assertEqual(max(node_counts), self.KUHN_POKER_GAME.node_count)
+        self.assertLess(sum(node_counts), self.KUHN_POKER_ITER_COUNT * self.KUHN_POKER_GAME.node_count)
+        self.assertRaises(ValueError, solver.set_pruning, 1)
+        self.assertRaises(ValueError, solver.set_pruning, -1, 0)
+
+        for solver in (
+                CFRPSolver(self.KUHN_POKER_GAME),
+                VectorizedCFRSolver(self.KUHN_POKER_GAME),
+                ESMCCFRSolver(self.KUHN_POKER_GAME),
+                OSMCCFRSolver(self.KUHN_POKER_GAME),
+                PublicTreeCFRSolver(self.KUHN_POKER_GAME),
+        ):
+            self.assertRaises(ValueError, solver.set_pruning, -10)
+
+            solver.set_pruning()
+
+            self.assertIsNone(solver.pruning_threshold)
+
+    def test_leduc_poker_cfr_pruning(self):
+        game = LeducPokerTreeFactory('JQ', starting_stacks=(5, 5)).build()
+        solver = CFRSolver(game)
+        pruning_solver = CFRSolver(game)
+        pruning_solver.set_pruning(-1)
+        instrument = Instrument()
+        pruning_solver.add_instrument(instrument)
+
+        for i in range(100):
+            solver.step()
+            pruning_solver.step()
+
+        self.assertLess(sum(record['node_count'] for record in instrument.records), 0.9 * 100 * game.node_count)
+        self.assertLess(pruning_solver.get_exploitability(), 1.1 * solver.get_exploitability())
+
+    def test_kuhn_poker_cfr_warm_start(self):
+        source = CFRSolver(self.KUHN_POKER_GAME)
+
+        for i in range(self.KUHN_POKER_ITER_COUNT):
+            source.step()
+
+        solver = CFRSolver(self.KUHN_POKER_GAME)
+        solver.warm_start(source)
+
+        self.assertAlmostEqual(solver.get_exploitability(), source.get_exploitability())
+
+        for i in range(self.KUHN_POKER_ITER_COUNT):
+            solver.step()
+
+        self.verify_kuhn_poker(solver, 1)
+
+        solver = CFRSolver(self.ROCK_PAPER_SCISSORS_GAME)
+        solver.warm_start(source)
+
+        self.assertFalse(solver.data.regrets.any())
+        self.assertFalse(solver.data.weight_sums.any())
+
     def verify_kuhn_poker(self, solver, places):
         self.verify(solver)
 
+        def get_node(*indices):
+            node = solver.game.root
+
+            for index in indices:
+                node = node.actions[index].child
+
+            return node
+
         # Check obvious strategy
 
-        self.assertAlmostEqual(solver.query(
-            cast(PlayerNode, solver.game.root.children[1].children[0]).info_set)[0], 1, places)
-        self.assertAlmostEqual(solver.query(
-            cast(PlayerNode, solver.game.root.children[1].children[0].children[1]).info_set)[0], 1, places)
-        self.assertAlmostEqual(solver.query(
-            cast(PlayerNode, solver.game.root.children[0].children[0].children[0]).info_set)[0], 1, places)
+        self.assertAlmostEqual(solver.get_probabilities(get_node(1, 0))[0], 1, places)
+        self.assertAlmostEqual(solver.get_probabilities(get_node(1, 0, 1))[0], 1, places)
+        self.assertAlmostEqual(solver.get_probabilities(get_node(0, 0, 0))[0], 1, places)
 
         # Check mixed strategy
 
-        self.assertNotAlmostEqual(solver.query(
-            cast(PlayerNode, solver.game.root.children[2].children[1]).info_set)[0], 0, places)
-        self.assertNotAlmostEqual(solver.query(
-            cast(PlayerNode, solver.game.root.children[2].children[1]).info_set)[0], 1, places)
-        self.assertNotAlmostEqual(solver.query(
-            cast(PlayerNode, solver.game.root.children[2].children[1].children[1]).info_set)[0], 0, places)
-        self.assertNotAlmostEqual(solver.query(
-            cast(PlayerNode, solver.game.root.children[2].children[1].children[1]).info_set)[1], 0, places)
-        self.assertNotAlmostEqual(solver.query(
-            cast(PlayerNode, solver.game.root.children[0].children[0]).info_set)[0], 0, places)
-        self.assertNotAlmostEqual(solver.query(
-            cast(PlayerNode, solver.game.root.children[0].children[0]).info_set)[1], 0, places)
+        self.assertNotAlmostEqual(solver.get_probabilities(get_node(2, 1))[0], 0, places)
+        self.assertNotAlmostEqual(solver.get_probabilities(get_node(2, 1))[0], 1, places)
+        self.assertNotAlmostEqual(solver.get_probabilities(get_node(2, 1, 1))[0], 0, places)
+        self.assertNotAlmostEqual(solver.get_probabilities(get_node(2, 1, 1))[1], 0, places)
+        self.assertNotAlmostEqual(solver.get_probabilities(get_node(0, 0))[0], 0, places)
+        self.assertNotAlmostEqual(solver.get_probabilities(get_node(0, 0))[1], 0, places)
 
     Tic_Tac_Toe_ITER_COUNT = 5
     Tic_Tac_Toe_GAME = TicTacToeTreeFactory().build()
@@ -106,7 +193,7 @@ class TreeSolverTestCase(TestCase):
     def verify_tic_tac_toe(self, solver):
         self.verify(solver)
 
-        query = solver.query(cast(PlayerNode, self.Tic_Tac_Toe_GAME.root).info_set)
+        query = solver.get_probabilities(self.Tic_Tac_Toe_GAME.root)
 
         # Check symmetry
 
@@ -126,12 +213,11 @@ class TreeSolverTestCase(TestCase):
         node = self.Tic_Tac_Toe_GAME.root
         count = 0
 
-        while not isinstance(node, TerminalNode):
-            node = cast(PlayerNode, node)
-            self.assertEqual(len(node.children), 9 - count)
+        while not node.is_terminal_node():
+            self.assertEqual(node.action_count, 9 - count)
 
-            strategy = solver.query(node.info_set)
-            node = node.children[max(range(len(node.children)), key=strategy.__getitem__)]
+            strategy = solver.get_probabilities(node)
+            node = node.actions[strategy.argmax()].child
             count += 1
         else:
             self.assertAlmostEqual(node.payoffs[0], 0)
@@ -147,8 +233,8 @@ class TreeSolverTestCase(TestCase):
         for i in range(self.ROCK_PAPER_SCISSORS_ITER_COUNT):
             solver.step()
 
-        for info_set in self.ROCK_PAPER_SCISSORS_GAME.info_sets:
-            for value in solver.query(info_set):
+        for node in self.ROCK_PAPER_SCISSORS_GAME.player_nodes:
+            for value in solver.get_probabilities(node):
                 self.assertAlmostEqual(value, 1 / 3)
 
     def test_rock_paper_scissors_cfrp(self):
@@ -157,8 +243,8 @@ class TreeSolverTestCase(TestCase):
         for i in range(self.ROCK_PAPER_SCISSORS_ITER_COUNT):
             solver.step()
 
-        for info_set in self.ROCK_PAPER_SCISSORS_GAME.info_sets:
-            for value in solver.query(info_set):
+        for node in self.ROCK_PAPER_SCISSORS_GAME.player_nodes:
+            for value in solver.get_probabilities(node):
                 self.assertAlmostEqual(value, 1 / 3)
 
     def test_rock_paper_scissors_dcfr(self):
@@ -170,8 +256,8 @@ class TreeSolverTestCase(TestCase):
     def verify_rock_paper_scissors(self, solver):
         self.verify(solver)
 
-        for info_set in self.ROCK_PAPER_SCISSORS_GAME.info_sets:
-            for value in solver.query(info_set):
+        for node in self.ROCK_PAPER_SCISSORS_GAME.player_nodes:
+            for value in solver.get_probabilities(node):
                 self.assertAlmostEqual(value, 1 / 3)
 
 
@@ -0,0 +1,94 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import Action, PlayerNode, TerminalNode
+from nashresolve.solvers import RegretStore
+
+
+class RegretStoreTestCase(TestCase):
+    def test_growth(self):
+        store = RegretStore()
+        nodes = [PlayerNode(i % 2, f'info set {i}', ()) for i in range(100)]
+
+        for i, node in enumerate(nodes):
+            self.assertEqual(store.get_index(node), i)
+
+        self.assertEqual(store.info_set_count, 100)
+        self.assertEqual(store.slot_count, 0)
+        np.testing.assert_array_equal(store.player_indices, np.arange(100) % 2)
+
+    def test_collect(self):
+        store = RegretStore()
+        terminal_node = TerminalNode((0, 0))
+        first_index = store.get_index(PlayerNode(0, 'first', (Action(terminal_node, 'a'), Action(terminal_node, 'b'))))
+        second_index = store.get_index(
+            PlayerNode(1, 'second', tuple(Action(terminal_node, label) for label in 'abc')),
+        )
+
+        np.testing.assert_allclose(store.get_strategy(first_index), (1 / 2, 1 / 2))
+        np.testing.assert_allclose(store.get_strategy(second_index), (1 / 3, 1 / 3, 1 / 3))
+
+        store.update(first_index, 1, (2, 0))
+        store.update(second_index, 0.5, (0, 3, 0))
+        store.update(second_index, 0.5, (0, 0, 3))
+        store.collect()
+        store.clear()
+        store.match_regrets()
+
+        np.testing.assert_allclose(store.regrets, (1, -1, -2, 1, 1))
+        np.testing.assert_allclose(store.strategies, (1, 0, 0, 1 / 2, 1 / 2))
+        np.testing.assert_allclose(store.average_strategies, (1 / 2, 1 / 2, 1 / 3, 1 / 3, 1 / 3))
+        self.assertFalse(store.weights.any())
+        self.assertFalse(store.counterfactuals.any())
+
+    def test_dtype(self):
+        store = RegretStore(np.float32, np.float64)
+        terminal_node = TerminalNode((0, 0))
+        index = store.get_index(PlayerNode(0, 'first', (Action(terminal_node, 'a'), Action(terminal_node, 'b'))))
+
+        store.update(index, 1, (2, 0))
+        store.collect()
+        store.clear()
+        store.match_regrets()
+
+        self.assertEqual(store.dtype, np.float32)
+        self.assertEqual(store.accumulator_dtype, np.float64)
+
+        for name in 'weights', 'regrets', 'counterfactuals', 'strategies':
+            self.assertEqual(getattr(store, name).dtype, np.float32)
+
+        for name in 'weight_sums', 'strategy_sums':
+            self.assertEqual(getattr(store, name).dtype, np.float64)
+
+        np.testing.assert_allclose(store.regrets, (1, -1))
+        np.testing.assert_allclose(store.strategies, (1, 0))
+
+        restored_store = RegretStore()
+        restored_store.restore(store.arrays)
+
+        self.assertEqual(restored_store.dtype, np.float32)
+        self.assertEqual(restored_store.weights.dtype, np.float32)
+        self.assertEqual(RegretStore(np.float32).accumulator_dtype, np.float32)
+
+    def test_warm_start(self):
+        terminal_node = TerminalNode((0, 0))
+        source = RegretStore()
+        source.extend(('a', 'b'), (0, 1), (2, 3))
+        source.regrets[:] = -1, 1, 1, 2, -3
+        source.strategy_sums[:] = 1, 2, 3, 4, 5
+        source.weight_sums[:] = 3, 12
+
+        store = RegretStore()
+        index = store.get_index(PlayerNode(1, 'b', tuple(Action(terminal_node, label) for label in 'abc')))
+        store.get_index(PlayerNode(0, 'c', (Action(terminal_node, 'a'),)))
+        store.warm_start(source, np.array([index]), np.array([1]), 0.5)
+
+        np.testing.assert_allclose(store.regrets, (0.5, 1, -1.5, 0))
+        np.testing.assert_allclose(store.strategy_sums, (1.5, 2, 2.5, 0))
+        np.testing.assert_allclose(store.weight_sums, (6, 0))
+        np.testing.assert_allclose(store.strategies, (1 / 3, 2 / 3, 0, 1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from nashresolve import KuhnPokerTreeFactory, RockPaperScissorsTreeFactory
+from nashresolve.solvers import CFRSolver, VectorizedCFRSolver
+
+
+class VectorizedCFRSolverTestCase(TestCase):
+    def verify(self, game, iteration_count):
+        solver = CFRSolver(game)
+        vectorized_solver = VectorizedCFRSolver(game)
+
+        for i in range(iteration_count):
+            np.testing.assert_allclose(solver.step(), vectorized_solver.step(), atol=1e-9)
+
+        self.assertEqual(solver.iteration_count, vectorized_solver.iteration_count)
+
+        for node in game.player_nodes:
+            np.testing.assert_allclose(
+                solver.get_probabilities(node), vectorized_solver.get_probabilities(node), atol=1e-9,
+            )
+
+        np.testing.assert_allclose(
+            solver.get_expected_values(game.root), vectorized_solver.get_expected_values(game.root), atol=1e-9,
+        )
+
+    def test_rock_paper_scissors(self):
+        self.verify(RockPaperScissorsTreeFactory().build(), 100)
+
+    def test_kuhn(self):
+        self.verify(KuhnPokerTreeFactory().build(), 100)
+
+    def test_dtype(self):
+        game = KuhnPokerTreeFactory().build(np.float32)
+        solver = CFRSolver(game, np.float32, np.float64)
+        vectorized_solver = VectorizedCFRSolver(game, np.float32, np.float64)
+
+        for i in range(100):
+            np.testing.assert_allclose(solver.step(), vectorized_solver.step(), atol=1e-5)
+
+        self.assertEqual(vectorized_solver.tree.chances.dtype, np.float32)
+        self.assertEqual(vectorized_solver.data.dtype, np.float32)
+        self.assertEqual(vectorized_solver.data.accumulator_dtype, np.float64)
+        np.testing.assert_allclose(solver.data.average_strategies, vectorized_solver.data.average_strategies, 0, 1e-5)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 from abc import ABC
-from itertools import chain
+from collections import OrderedDict
 
 import numpy as np
 
@@ -51,8 +51,13 @@ class Node(ABC):
 
     @property
     def descendants(self):
-        yield self
-        yield from chain.from_iterable(map(Node.descendants.fget, self.children))
+        nodes = [self]
+
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(reversed(tuple(node.children)))
+
+            yield node
 
     def is_terminal_node(self):
         return isinstance(self, TerminalNode)
@@ -65,10 +70,10 @@ class Node(ABC):
 
 
 class TerminalNode(Node):
-    def __init__(self, payoffs):
+    def __init__(self, payoffs, dtype=float):
         super().__init__(())
 
-        self.__payoffs = np.fromiter(payoffs, float)
+        self.__payoffs = np.fromiter(payoffs, dtype)
 
     @property
     def payoffs(self):
@@ -76,10 +81,12 @@ class TerminalNode(Node):
 
 
 class ChanceNode(Node):
-    def __init__(self, actions):
+    def __init__(self, actions, dtype=float):
+        actions = tuple(actions)
+
         super().__init__(actions)
 
-        self.__chances = np.fromiter(map(ChanceAction.chance.fget, self.actions), float)
+        self.__chances = np.fromiter(map(ChanceAction.chance.fget, actions), dtype)
 
     @property
     def chances(self):
@@ -100,3 +107,71 @@ class PlayerNode(Node):
     @property
     def info_set(self):
         return self.__info_set
+
+
+class ActionCache:
+    """ActionCache is the class for least recently used caches of the actions of lazy nodes.
+
+    At most capacity nodes are expanded at a time. The actions of the least recently used node are evicted first and
+    are created again the next time they are accessed.
+    """
+
+    def __init__(self, capacity):
+        self.__capacity = capacity
+        self.__actions = OrderedDict()
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @property
+    def size(self):
+        return len(self.__actions)
+
+    def get_actions(self, node, expand):
+        if node in self.__actions:
+            self.__actions.move_to_end(node)
+        else:
+            self.__actions[node] = tuple(expand())
+
+            if len(self.__actions) > self.capacity:
+                self.__actions.popitem(False)
+
+        return self.__actions[node]
+
+
+class LazyChanceNode(ChanceNode):
+    def __init__(self, expand, cache, dtype=float):
+        super().__init__((), dtype)
+
+        self.__expand = expand
+        self.__cache = cache
+        self.__dtype = dtype
+
+    @property
+    def cache(self):
+        return self.__cache
+
+    @property
+    def actions(self):
+        return self.__cache.get_actions(self, self.__expand)
+
+    @property
+    def chances(self):
+        return np.fromiter(map(ChanceAction.chance.fget, self.actions), self.__dtype)
+
+
+class LazyPlayerNode(PlayerNode):
+    def __init__(self, player_index, info_set, expand, cache):
+        super().__init__(player_index, info_set, ())
+
+        self.__expand = expand
+        self.__cache = cache
+
+    @property
+    def cache(self):
+        return self.__cache
+
+    @property
+    def actions(self):
+        return self.__cache.get_actions(self, self.__expand)